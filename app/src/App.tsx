@@ -20,7 +20,7 @@ export default function App() {
           >
             PolicyEngine
           </a>
-          . Results use mock data and will be updated with real benchmark runs.
+          . Results are generated from the latest benchmark run.
         </p>
       </footer>
     </div>
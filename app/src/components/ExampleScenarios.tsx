@@ -1,9 +1,15 @@
-import { EXAMPLE_SCENARIOS } from "../data";
+import { useEffect, useState } from "react";
+import { loadExampleChunk, loadManifest } from "../data";
+import type { ExampleScenario } from "../data";
+import { useData } from "../useData";
 
 const MODEL_DISPLAY: Record<string, string> = {
   "gpt-5.2": "GPT-5.2",
   "claude-sonnet": "Claude Sonnet",
+  "claude-sonnet-4.5": "Claude Sonnet 4.5",
+  "claude-sonnet-4.6": "Claude Sonnet 4.6",
   "claude-opus": "Claude Opus",
+  "gemini-3-pro": "Gemini 3 Pro",
 };
 
 function formatDollars(value: number): string {
@@ -17,6 +23,30 @@ function errorPct(prediction: number, truth: number): string {
 }
 
 export default function ExampleScenarios() {
+  const manifest = useData(loadManifest);
+  const [chunks, setChunks] = useState(1);
+  const [examples, setExamples] = useState<ExampleScenario[]>([]);
+
+  // Example chunks are fetched only as the reader asks for more.
+  useEffect(() => {
+    if (!manifest) return;
+    const count = Math.min(chunks, manifest.example_chunks);
+    let cancelled = false;
+    Promise.all(
+      Array.from({ length: count }, (_, i) => loadExampleChunk(i)),
+    ).then(
+      (loaded) => {
+        if (!cancelled) setExamples(loaded.flat());
+      },
+      (error) => console.error(error),
+    );
+    return () => {
+      cancelled = true;
+    };
+  }, [manifest, chunks]);
+
+  const hasMore = manifest !== null && chunks < manifest.example_chunks;
+
   return (
     <section className="py-12 px-6">
       <div className="max-w-6xl mx-auto">
@@ -29,7 +59,7 @@ export default function ExampleScenarios() {
         </p>
 
         <div className="grid grid-cols-1 lg:grid-cols-2 gap-6">
-          {EXAMPLE_SCENARIOS.map((scenario) => (
+          {examples.map((scenario) => (
             <div
               key={scenario.scenario_id}
               className="bg-white rounded-xl shadow-sm border border-gray-200 overflow-hidden"
@@ -88,6 +118,17 @@ export default function ExampleScenarios() {
             </div>
           ))}
         </div>
+
+        {hasMore && (
+          <div className="text-center mt-8">
+            <button
+              onClick={() => setChunks(chunks + 1)}
+              className="px-4 py-2 rounded-full text-sm font-medium bg-white text-gray-600 border border-gray-300 hover:bg-gray-100 transition-colors"
+            >
+              Show more examples
+            </button>
+          </div>
+        )}
       </div>
     </section>
   );
@@ -1,8 +1,5 @@
-import {
-  getOverallNoToolsAccuracy,
-  getOverallWithToolsAccuracy,
-  getOverallNoToolsMAE,
-} from "../data";
+import { loadSummary } from "../data";
+import { useData } from "../useData";
 
 function StatCard({
   label,
@@ -41,9 +38,12 @@ function StatCard({
 }
 
 export default function Hero() {
-  const noToolsAcc = getOverallNoToolsAccuracy();
-  const withToolsAcc = getOverallWithToolsAccuracy();
-  const noToolsMAE = getOverallNoToolsMAE();
+  const overall = useData(loadSummary)?.overall;
+  const noToolsAcc = overall ? `${overall.pct_within_10_no_tools}%` : "…";
+  const withToolsAcc = overall ? `${overall.pct_within_10_with_tools}%` : "…";
+  const noToolsMAE = overall
+    ? `$${overall.mae_no_tools.toLocaleString()}`
+    : "…";
 
   return (
     <section className="bg-pe-dark text-white py-16 px-6">
@@ -58,19 +58,19 @@ export default function Hero() {
         <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-4 gap-4 mt-10">
           <StatCard
             label="Accuracy without tools"
-            value={`${noToolsAcc}%`}
+            value={noToolsAcc}
             sublabel="within 10% of correct answer"
             accent="red"
           />
           <StatCard
             label="Accuracy with tools"
-            value={`${withToolsAcc}%`}
+            value={withToolsAcc}
             sublabel="within 10% of correct answer"
             accent="green"
           />
           <StatCard
             label="Avg. MAE without tools"
-            value={`$${noToolsMAE.toLocaleString()}`}
+            value={noToolsMAE}
             sublabel="mean absolute error"
             accent="red"
           />
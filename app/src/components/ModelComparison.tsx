@@ -1,4 +1,5 @@
-import { MODEL_STATS } from "../data";
+import { loadSummary } from "../data";
+import { useData } from "../useData";
 
 function accuracyColor(pct: number): string {
   if (pct >= 95) return "bg-green-100 text-green-800";
@@ -17,10 +18,15 @@ function maeColor(mae: number): string {
 const MODEL_DISPLAY: Record<string, string> = {
   "gpt-5.2": "GPT-5.2",
   "claude-sonnet": "Claude Sonnet",
+  "claude-sonnet-4.5": "Claude Sonnet 4.5",
+  "claude-sonnet-4.6": "Claude Sonnet 4.6",
   "claude-opus": "Claude Opus",
+  "gemini-3-pro": "Gemini 3 Pro",
 };
 
 export default function ModelComparison() {
+  const modelStats = useData(loadSummary)?.model_stats ?? [];
+
   return (
     <section className="py-12 px-6">
       <div className="max-w-6xl mx-auto">
@@ -62,7 +68,7 @@ export default function ModelComparison() {
               </tr>
             </thead>
             <tbody>
-              {MODEL_STATS.map((row) => (
+              {modelStats.map((row) => (
                 <tr
                   key={row.model}
                   className="border-b border-gray-100 hover:bg-gray-50"
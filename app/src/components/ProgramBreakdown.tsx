@@ -1,9 +1,15 @@
 import { useState } from "react";
-import { PROGRAM_STATS, MODELS, PROGRAM_LABELS } from "../data";
+import { loadManifest, loadProgramStats, PROGRAM_LABELS } from "../data";
+import { useData } from "../useData";
 
 type Metric = "pct_within_10" | "mae";
 
-function cellColor(value: number, metric: Metric, withTools: boolean): string {
+function cellColor(
+  value: number | null,
+  metric: Metric,
+  withTools: boolean,
+): string {
+  if (value === null) return "bg-gray-100 text-gray-500";
   if (withTools) return "bg-green-100 text-green-800";
   if (metric === "pct_within_10") {
     if (value >= 80) return "bg-green-100 text-green-800";
@@ -19,7 +25,8 @@ function cellColor(value: number, metric: Metric, withTools: boolean): string {
   return "bg-red-100 text-red-800";
 }
 
-function formatValue(value: number, metric: Metric): string {
+function formatValue(value: number | null, metric: Metric): string {
+  if (value === null) return "—";
   if (metric === "pct_within_10") return `${value}%`;
   if (value === 0) return "$0";
   if (value < 1) return value.toFixed(2);
@@ -29,21 +36,26 @@ function formatValue(value: number, metric: Metric): string {
 const MODEL_DISPLAY: Record<string, string> = {
   "gpt-5.2": "GPT-5.2",
   "claude-sonnet": "Sonnet",
+  "claude-sonnet-4.5": "Sonnet 4.5",
+  "claude-sonnet-4.6": "Sonnet 4.6",
   "claude-opus": "Opus",
+  "gemini-3-pro": "Gemini 3 Pro",
 };
 
 export default function ProgramBreakdown() {
   const [metric, setMetric] = useState<Metric>("pct_within_10");
   const [showWithTools, setShowWithTools] = useState(false);
 
-  // Get unique programs in order
-  const programs = [...new Set(PROGRAM_STATS.map((p) => p.program))];
+  const manifest = useData(loadManifest);
+  const programStats = useData(loadProgramStats) ?? [];
+  const programs = manifest?.programs ?? [];
+  const models = manifest?.models ?? [];
 
-  function getValue(program: string, model: string): number {
-    const row = PROGRAM_STATS.find(
+  function getValue(program: string, model: string): number | null {
+    const row = programStats.find(
       (p) => p.program === program && p.model === model,
     );
-    if (!row) return 0;
+    if (!row) return null;
     if (metric === "pct_within_10") {
       return showWithTools
         ? row.pct_within_10_with_tools
@@ -122,7 +134,7 @@ export default function ProgramBreakdown() {
                 <th className="text-left p-3 font-semibold text-gray-700">
                   Program
                 </th>
-                {MODELS.map((model) => (
+                {models.map((model) => (
                   <th
                     key={model}
                     className="p-3 font-semibold text-gray-700 text-center"
@@ -141,7 +153,7 @@ export default function ProgramBreakdown() {
                   <td className="p-3 font-medium text-gray-900">
                     {PROGRAM_LABELS[program] ?? program}
                   </td>
-                  {MODELS.map((model) => {
+                  {models.map((model) => {
                     const val = getValue(program, model);
                     return (
                       <td key={model} className="p-3 text-center">
@@ -0,0 +1,21 @@
+import { useEffect, useState } from "react";
+
+// Resolve a data loader from data.ts; null until it has loaded.
+export function useData<T>(load: () => Promise<T>): T | null {
+  const [data, setData] = useState<T | null>(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    load().then(
+      (result) => {
+        if (!cancelled) setData(result);
+      },
+      (error) => console.error(error),
+    );
+    return () => {
+      cancelled = true;
+    };
+  }, [load]);
+
+  return data;
+}
@@ -0,0 +1,104 @@
+"""Benchmark vectorized compute_metrics against the per-group reference loop.
+
+Usage:
+    python benchmarks/bench_compute_metrics.py [--rows 1000000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from policybench.analysis import (
+    accuracy,
+    compute_metrics,
+    mean_absolute_error,
+    mean_absolute_percentage_error,
+    within_tolerance,
+)
+from policybench.config import BINARY_PROGRAMS, MODELS, PROGRAMS, RATE_PROGRAMS
+
+
+def reference_compute_metrics(
+    ground_truth: pd.DataFrame,
+    predictions: pd.DataFrame,
+) -> pd.DataFrame:
+    """The original loop-over-groups implementation of compute_metrics."""
+    merged = predictions.merge(ground_truth, on=["scenario_id", "variable"])
+    merged = merged.dropna(subset=["prediction"])
+
+    rows = []
+    for (model, variable), group in merged.groupby(["model", "variable"]):
+        y_true = group["value"].values
+        y_pred = group["prediction"].values
+        row = {"model": model, "variable": variable, "n": len(group)}
+        row["mae"] = mean_absolute_error(y_true, y_pred)
+        if variable in BINARY_PROGRAMS:
+            row["mape"] = float("nan")
+            row["accuracy"] = accuracy(y_true, y_pred)
+            row["within_10pct"] = float("nan")
+        elif variable in RATE_PROGRAMS:
+            row["mape"] = float("nan")
+            row["accuracy"] = float("nan")
+            row["within_10pct"] = within_tolerance(y_true, y_pred)
+        else:
+            row["mape"] = mean_absolute_percentage_error(y_true, y_pred)
+            row["accuracy"] = float("nan")
+            row["within_10pct"] = within_tolerance(y_true, y_pred)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def synthetic_results(n_rows: int, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Build ground truth and predictions with roughly n_rows predictions."""
+    rng = np.random.default_rng(seed)
+    models = list(MODELS)
+    n_scenarios = max(1, n_rows // (len(models) * len(PROGRAMS)))
+    scenario_ids = [f"scenario_{i:06d}" for i in range(n_scenarios)]
+
+    gt_values = rng.choice([0.0, 1.0, 250.0, 4_000.0, 65_000.0], size=n_scenarios)
+    ground_truth = pd.DataFrame(
+        {
+            "scenario_id": np.repeat(scenario_ids, len(PROGRAMS)),
+            "variable": np.tile(PROGRAMS, n_scenarios),
+            "value": np.repeat(gt_values, len(PROGRAMS)),
+        }
+    )
+
+    predictions = pd.concat(
+        [ground_truth.assign(model=model) for model in models], ignore_index=True
+    )
+    noise = rng.normal(1.0, 0.2, size=len(predictions))
+    predictions["prediction"] = predictions["value"] * noise + rng.integers(
+        -2, 3, size=len(predictions)
+    )
+    predictions.loc[rng.random(len(predictions)) < 0.01, "prediction"] = np.nan
+    predictions = predictions.drop(columns="value")
+    return ground_truth, predictions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    ground_truth, predictions = synthetic_results(args.rows)
+    print(f"Rows: {len(predictions):,}")
+
+    start = time.perf_counter()
+    expected = reference_compute_metrics(ground_truth, predictions)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = compute_metrics(ground_truth, predictions)
+    vectorized_time = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(actual, expected)
+    print(f"Reference loop: {loop_time:.2f}s")
+    print(f"Vectorized:     {vectorized_time:.2f}s")
+    print(f"Speedup:        {loop_time / vectorized_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
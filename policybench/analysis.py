@@ -1,9 +1,15 @@
 """Metrics and analysis for PolicyBench results."""
 
+from dataclasses import dataclass
+
 import numpy as np
 import pandas as pd
 
 from policybench.config import BINARY_PROGRAMS, RATE_PROGRAMS
+from policybench.profiling import span
+
+# Metrics reported per (model, variable) by compute_metrics
+METRICS = ["mae", "mape", "accuracy", "within_10pct"]
 
 
 def mean_absolute_error(y_true: np.ndarray, y_pred: np.ndarray) -> float:
@@ -55,58 +61,168 @@ def within_tolerance(
     return float(np.mean(correct))
 
 
+@dataclass
+class ScoredPredictions:
+    """Per-row metric terms for predictions joined to ground truth.
+
+    Rows are predictions that matched a ground-truth value and are not
+    missing. Each row belongs to a (model, variable) group, encoded as
+    ``model_code * len(variables) + variable_code``, and to a scenario.
+    ``terms[:, k]`` holds the row's contribution to ``METRICS[k]`` and
+    ``mask[:, k]`` whether the row counts towards that metric at all.
+    """
+
+    models: pd.Index
+    variables: pd.Index
+    scenarios: pd.Index
+    group: np.ndarray
+    scenario: np.ndarray
+    terms: np.ndarray
+    mask: np.ndarray
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.models) * len(self.variables)
+
+    def groups(self) -> pd.DataFrame:
+        """The (model, variable) key for every group code."""
+        return pd.DataFrame(
+            {
+                "model": self.models.repeat(len(self.variables)),
+                "variable": np.tile(self.variables, len(self.models)),
+            }
+        )
+
+    def totals(self, index: np.ndarray, size: int) -> tuple[np.ndarray, np.ndarray]:
+        """Sum metric terms and counts into ``size`` bins given by ``index``.
+
+        Returns:
+            (totals, counts), each of shape (size, len(METRICS))
+        """
+        totals = np.empty((size, len(METRICS)))
+        counts = np.empty((size, len(METRICS)))
+        for k in range(len(METRICS)):
+            mask = self.mask[:, k]
+            totals[:, k] = np.bincount(index[mask], self.terms[mask, k], minlength=size)
+            counts[:, k] = np.bincount(index[mask], minlength=size)
+        return totals, counts
+
+
+def score_predictions(
+    ground_truth: pd.DataFrame,
+    predictions: pd.DataFrame,
+) -> ScoredPredictions:
+    """Join predictions to ground truth and compute per-row metric terms.
+
+    Keys are encoded as integer codes and ground truth is looked up in a
+    dense (scenario, variable) table, so no string join is performed.
+    Ground truth is expected to hold one row per (scenario_id, variable).
+    """
+    scenario_index = pd.Index(ground_truth["scenario_id"].unique())
+    variable_index = pd.Index(ground_truth["variable"].unique()).sort_values()
+    gt_scenario = scenario_index.get_indexer(ground_truth["scenario_id"])
+    gt_variable = variable_index.get_indexer(ground_truth["variable"])
+    gt_table = np.full((len(scenario_index), len(variable_index)), np.nan)
+    gt_present = np.zeros(gt_table.shape, dtype=bool)
+    gt_table[gt_scenario, gt_variable] = ground_truth["value"].to_numpy(dtype=float)
+    gt_present[gt_scenario, gt_variable] = True
+
+    scenario_codes = scenario_index.get_indexer(predictions["scenario_id"])
+    variable_codes = variable_index.get_indexer(predictions["variable"])
+    model_codes, models = pd.factorize(predictions["model"], sort=True)
+    y_pred = predictions["prediction"].to_numpy(dtype=float)
+
+    # Inner join on (scenario_id, variable), dropping missing predictions
+    keep = (scenario_codes >= 0) & (variable_codes >= 0) & ~np.isnan(y_pred)
+    keep[keep] = gt_present[scenario_codes[keep], variable_codes[keep]]
+    scenario_codes = scenario_codes[keep]
+    variable_codes = variable_codes[keep]
+    return score_arrays(
+        models=pd.Index(models, dtype=predictions["model"].dtype),
+        variables=variable_index.astype(predictions["variable"].dtype),
+        scenarios=scenario_index,
+        model_codes=model_codes[keep],
+        scenario_codes=scenario_codes,
+        variable_codes=variable_codes,
+        y_pred=y_pred[keep],
+        y_true=gt_table[scenario_codes, variable_codes],
+    )
+
+
+def score_arrays(
+    models: pd.Index,
+    variables: pd.Index,
+    scenarios: pd.Index,
+    model_codes: np.ndarray,
+    scenario_codes: np.ndarray,
+    variable_codes: np.ndarray,
+    y_pred: np.ndarray,
+    y_true: np.ndarray,
+) -> ScoredPredictions:
+    """Per-row metric terms for predictions already matched to ground truth.
+
+    Rows are given by their integer codes into models, scenarios and
+    variables, with no missing prediction or ground-truth value.
+    """
+    is_binary = np.isin(variables, BINARY_PROGRAMS)[variable_codes]
+    is_rate = np.isin(variables, RATE_PROGRAMS)[variable_codes]
+    is_dollar = ~(is_binary | is_rate)
+    nonzero = y_true != 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rel_error = np.abs((y_true - y_pred) / y_true)
+    within = np.where(nonzero, rel_error <= 0.10, np.abs(y_pred) <= 1.0)
+    correct = np.round(y_true) == np.round(y_pred)
+
+    # Columns follow METRICS: mae, mape, accuracy, within_10pct
+    terms = np.column_stack([np.abs(y_true - y_pred), rel_error, correct, within])
+    mask = np.column_stack(
+        [np.ones(len(y_true), dtype=bool), is_dollar & nonzero, is_binary, ~is_binary]
+    )
+    return ScoredPredictions(
+        models=models,
+        variables=variables,
+        scenarios=scenarios,
+        group=model_codes * len(variables) + variable_codes,
+        scenario=scenario_codes,
+        terms=terms.astype(float),
+        mask=mask,
+    )
+
+
+@span("analysis.compute_metrics")
 def compute_metrics(
     ground_truth: pd.DataFrame,
     predictions: pd.DataFrame,
 ) -> pd.DataFrame:
     """Compute metrics by model and variable.
 
+    Every metric is vectorized: rows are scored once by score_predictions
+    and all (model, variable) groups are reduced at once with bincount.
+
     Args:
         ground_truth: DataFrame with columns [scenario_id, variable, value]
         predictions: DataFrame with columns [model, scenario_id, variable, prediction]
 
     Returns:
-        DataFrame with columns [model, variable, mae, mape, accuracy_10pct, n]
+        DataFrame with columns [model, variable, n, mae, mape, accuracy,
+        within_10pct], one row per (model, variable) sorted by both keys.
     """
-    merged = predictions.merge(
-        ground_truth,
-        on=["scenario_id", "variable"],
-        how="inner",
-    )
-
-    # Drop rows where prediction is missing
-    merged = merged.dropna(subset=["prediction"])
+    return summarize_scores(score_predictions(ground_truth, predictions))
 
-    rows = []
-    for (model, variable), group in merged.groupby(["model", "variable"]):
-        y_true = group["value"].values
-        y_pred = group["prediction"].values
 
-        row = {
-            "model": model,
-            "variable": variable,
-            "n": len(group),
-        }
+def summarize_scores(scored: ScoredPredictions) -> pd.DataFrame:
+    """compute_metrics output for predictions already scored."""
+    n = np.bincount(scored.group, minlength=scored.n_groups)
+    totals, counts = scored.totals(scored.group, scored.n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(counts > 0, totals / counts, np.nan)
 
-        if variable in BINARY_PROGRAMS:
-            row["mae"] = mean_absolute_error(y_true, y_pred)
-            row["mape"] = float("nan")
-            row["accuracy"] = accuracy(y_true, y_pred)
-            row["within_10pct"] = float("nan")
-        elif variable in RATE_PROGRAMS:
-            row["mae"] = mean_absolute_error(y_true, y_pred)
-            row["mape"] = float("nan")
-            row["accuracy"] = float("nan")
-            row["within_10pct"] = within_tolerance(y_true, y_pred, tolerance=0.10)
-        else:
-            row["mae"] = mean_absolute_error(y_true, y_pred)
-            row["mape"] = mean_absolute_percentage_error(y_true, y_pred)
-            row["accuracy"] = float("nan")
-            row["within_10pct"] = within_tolerance(y_true, y_pred, tolerance=0.10)
-
-        rows.append(row)
-
-    return pd.DataFrame(rows)
+    metrics = scored.groups()
+    metrics["n"] = n
+    for k, metric in enumerate(METRICS):
+        metrics[metric] = values[:, k]
+    return metrics[n > 0].reset_index(drop=True)
 
 
 def summary_by_model(metrics: pd.DataFrame) -> pd.DataFrame:
@@ -0,0 +1,417 @@
+"""No-tools evaluation through provider batch APIs.
+
+Batch jobs cost half as much as one-shot calls and latency does not
+matter without tools. ``run_batch_eval`` writes one job file per provider
+in the provider's own format (OpenAI Batch JSONL of chat completions, or
+an Anthropic Message Batch), submits it, polls until it ends and ingests
+the results into the no-tools predictions schema. OpenAI takes a single
+model per input file, so its jobs are split by model as well. Models of providers
+without a supported batch API go through ``run_no_tools_eval`` as usual.
+
+Runs resume: submitted jobs are recorded in a state file before polling,
+and downloaded results are kept next to it, so rerunning after an
+interruption polls the jobs already submitted instead of paying again. A
+job is matched by a digest of its requests, which include the prompts,
+so changing scenarios, models or prompts submits a new one. Only
+succeeded results are kept; rerunning after a job failed, expired or was
+cancelled submits just the requests still without an answer.
+
+Endpoints come from OPENAI_BASE_URL (with /v1, as in the OpenAI SDK) and
+ANTHROPIC_BASE_URL (without it, as in the Anthropic SDK), so the whole
+flow runs offline against ``policybench.batch_server``.
+"""
+
+import hashlib
+import json
+import os
+import time
+import urllib.request
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from policybench.config import BATCH_POLL_INTERVAL, MODELS, PROGRAMS
+from policybench.eval_no_tools import extract_number, run_no_tools_eval
+from policybench.events import emit
+from policybench.prompts import make_no_tools_prompt
+from policybench.scenarios import Scenario
+from policybench.scheduler import PROVIDER_CONCURRENCY, make_tasks, provider_of
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+BATCH_DIR = "results/batches"
+
+# Anthropic requires max_tokens; generous for a one-number answer
+MAX_TOKENS = 4096
+
+HTTP_TIMEOUT = 120
+
+
+def _http(method: str, url: str, headers: dict, body: bytes | None = None) -> bytes:
+    request = urllib.request.Request(url, data=body, method=method, headers=headers)
+    with urllib.request.urlopen(request, timeout=HTTP_TIMEOUT) as response:
+        return response.read()
+
+
+def _jsonl(data: bytes) -> Iterator[dict]:
+    for line in data.decode().splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+
+def _multipart(fields: dict[str, str], filename: str, content: bytes):
+    """A multipart/form-data body with fields and one "file" part."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"'
+            f"\r\n\r\n{value}\r\n".encode()
+        )
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; '
+        f'filename="{filename}"\r\nContent-Type: application/jsonl\r\n\r\n'.encode()
+        + content
+        + f"\r\n--{boundary}--\r\n".encode()
+    )
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class OpenAIBatches:
+    """OpenAI Batch API: an uploaded JSONL file of chat completion requests."""
+
+    provider = "openai"
+    one_model_per_job = True
+
+    def __init__(self, base_url: str | None = None, api_key: str | None = None):
+        self.base_url = (
+            base_url or os.environ.get("OPENAI_BASE_URL") or "https://api.openai.com/v1"
+        ).rstrip("/")
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
+
+    def _headers(self, content_type: str | None = "application/json") -> dict:
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        if content_type:
+            headers["Content-Type"] = content_type
+        return headers
+
+    def _json(self, method: str, path: str, payload: dict | None = None) -> dict:
+        body = json.dumps(payload).encode() if payload is not None else None
+        return json.loads(_http(method, self.base_url + path, self._headers(), body))
+
+    def request(self, custom_id: str, model: str, messages: list[dict]) -> dict:
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {"model": model, "messages": messages},
+        }
+
+    def submit(self, requests: list[dict]) -> str:
+        content = "".join(json.dumps(r) + "\n" for r in requests).encode()
+        body, content_type = _multipart({"purpose": "batch"}, "batch.jsonl", content)
+        upload = json.loads(
+            _http("POST", self.base_url + "/files", self._headers(content_type), body)
+        )
+        batch = self._json(
+            "POST",
+            "/batches",
+            {
+                "input_file_id": upload["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+            },
+        )
+        return batch["id"]
+
+    def poll(self, batch_id: str) -> tuple[bool, dict]:
+        """(whether the job has ended, its status)."""
+        batch = self._json("GET", f"/batches/{batch_id}")
+        ended = batch["status"] in ("completed", "failed", "expired", "cancelled")
+        return ended, batch
+
+    def download(self, status: dict) -> bytes:
+        """Result lines of an ended job, failed requests included."""
+        data = b""
+        for key in ("output_file_id", "error_file_id"):
+            if status.get(key):
+                url = f"{self.base_url}/files/{status[key]}/content"
+                data += _http("GET", url, self._headers(None))
+        return data
+
+    def parse(self, line: dict) -> tuple[str, str | None, str | None]:
+        """(custom_id, response text, error) of one result line."""
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            error = line.get("error") or response.get("body", {}).get("error")
+            return line["custom_id"], None, json.dumps(error)
+        content = response["body"]["choices"][0]["message"]["content"]
+        return line["custom_id"], content, None
+
+
+class AnthropicBatches:
+    """Anthropic Message Batches API: requests posted inline."""
+
+    provider = "anthropic"
+    one_model_per_job = False
+
+    def __init__(self, base_url: str | None = None, api_key: str | None = None):
+        self.base_url = (
+            base_url
+            or os.environ.get("ANTHROPIC_BASE_URL")
+            or "https://api.anthropic.com"
+        ).rstrip("/")
+        self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY", "")
+
+    def _headers(self) -> dict:
+        return {
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01",
+            "Content-Type": "application/json",
+        }
+
+    def request(self, custom_id: str, model: str, messages: list[dict]) -> dict:
+        return {
+            "custom_id": custom_id,
+            "params": {"model": model, "max_tokens": MAX_TOKENS, "messages": messages},
+        }
+
+    def submit(self, requests: list[dict]) -> str:
+        url = self.base_url + "/v1/messages/batches"
+        body = json.dumps({"requests": requests}).encode()
+        return json.loads(_http("POST", url, self._headers(), body))["id"]
+
+    def poll(self, batch_id: str) -> tuple[bool, dict]:
+        """(whether the job has ended, its status)."""
+        url = f"{self.base_url}/v1/messages/batches/{batch_id}"
+        batch = json.loads(_http("GET", url, self._headers()))
+        return batch["processing_status"] == "ended", batch
+
+    def download(self, status: dict) -> bytes:
+        """Result lines of an ended job, failed requests included."""
+        return _http("GET", status["results_url"], self._headers())
+
+    def parse(self, line: dict) -> tuple[str, str | None, str | None]:
+        """(custom_id, response text, error) of one result line."""
+        result = line["result"]
+        if result["type"] != "succeeded":
+            return line["custom_id"], None, json.dumps(result)
+        text = "".join(
+            block.get("text", "")
+            for block in result["message"]["content"]
+            if block.get("type") == "text"
+        )
+        return line["custom_id"], text, None
+
+
+BATCH_APIS = {"openai": OpenAIBatches, "anthropic": AnthropicBatches}
+
+
+def custom_id(model_id: str, prompt: str) -> str:
+    """Request id, valid for both APIs (at most 64 of [A-Za-z0-9_-])."""
+    payload = json.dumps([model_id, prompt]).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _load_state(path: Path) -> dict:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _save_state(state: dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state, indent=2))
+    os.replace(tmp, path)
+
+
+class _Job:
+    """A group's requests, found by a digest of their ids.
+
+    Results that succeeded are appended to the group's results file; each
+    run submits only the requests without one, so requests of a job that
+    failed, expired or was cancelled are sent again on the next run, and
+    the ones already answered are not paid for twice.
+    """
+
+    def __init__(self, client, requests: list[dict], batch_dir: Path):
+        self.client = client
+        self.requests = requests
+        self.state_path = batch_dir / "state.json"
+        ids = sorted(r["custom_id"] for r in requests)
+        digest = hashlib.blake2b(
+            json.dumps([client.provider, ids]).encode(), digest_size=8
+        ).hexdigest()
+        self.key = f"{client.provider}-{digest}"
+        self.requests_path = batch_dir / f"{self.key}.requests.jsonl"
+        self.results_path = batch_dir / f"{self.key}.results.jsonl"
+        self.batch_id: str | None = None
+        self.pending: list[dict] = []
+
+    def _succeeded(self) -> dict[str, dict]:
+        if not self.results_path.exists():
+            return {}
+        return {
+            line["custom_id"]: line for line in _jsonl(self.results_path.read_bytes())
+        }
+
+    def submit(self):
+        """Submit the requests without a result, unless already submitted."""
+        state = _load_state(self.state_path)
+        if self.key in state:
+            self.batch_id = state[self.key]["batch_id"]
+            submitted = set(state[self.key]["custom_ids"])
+            self.pending = [r for r in self.requests if r["custom_id"] in submitted]
+            print(f"  Resuming {self.client.provider} batch {self.batch_id}")
+            return
+        succeeded = self._succeeded()
+        self.pending = [r for r in self.requests if r["custom_id"] not in succeeded]
+        if not self.pending:
+            return
+        self.requests_path.write_text(
+            "".join(json.dumps(r) + "\n" for r in self.pending)
+        )
+        self.batch_id = self.client.submit(self.pending)
+        state[self.key] = {
+            "provider": self.client.provider,
+            "batch_id": self.batch_id,
+            "custom_ids": [r["custom_id"] for r in self.pending],
+        }
+        _save_state(state, self.state_path)
+        print(
+            f"  Submitted {self.client.provider} batch {self.batch_id} "
+            f"({len(self.pending)}/{len(self.requests)} requests)"
+        )
+        self._emit("submitted")
+
+    def results(self, poll_interval: float) -> list[dict]:
+        """Succeeded result lines, polling until a submitted job ends."""
+        if self.batch_id is not None:
+            while True:
+                ended, status = self.client.poll(self.batch_id)
+                if ended:
+                    break
+                time.sleep(poll_interval)
+            lines = [
+                line
+                for line in _jsonl(self.client.download(status))
+                if self.client.parse(line)[2] is None
+            ]
+            with self.results_path.open("a") as f:
+                f.writelines(json.dumps(line) + "\n" for line in lines)
+            # The job is over whatever its status; requests it did not
+            # answer are pending again on the next run
+            state = _load_state(self.state_path)
+            state.pop(self.key, None)
+            _save_state(state, self.state_path)
+            self._emit("ended")
+            self.batch_id = None
+        return list(self._succeeded().values())
+
+    def _emit(self, status: str):
+        emit(
+            "batch",
+            provider=self.client.provider,
+            batch_id=self.batch_id,
+            status=status,
+            requests=len(self.pending),
+        )
+
+
+def run_batch_eval(
+    scenarios: list[Scenario],
+    models: dict[str, str] | None = None,
+    programs: list[str] | None = None,
+    output_path: str | None = None,
+    batch_dir: str | Path = BATCH_DIR,
+    poll_interval: float = BATCH_POLL_INTERVAL,
+    concurrency: int = PROVIDER_CONCURRENCY,
+) -> "pd.DataFrame":
+    """Run the no-tools evaluation through provider batch APIs.
+
+    OpenAI models get one job per model and Anthropic models one job in
+    all; all jobs are submitted before any is polled. Other models are evaluated with
+    run_no_tools_eval. Requests the provider failed or dropped get a null
+    prediction; the printed summary counts the ones that succeeded.
+
+    Returns DataFrame with columns:
+        model, scenario_id, variable, prediction, raw_response
+    """
+    import pandas as pd
+
+    if models is None:
+        models = MODELS
+    if programs is None:
+        programs = PROGRAMS
+    batch_dir = Path(batch_dir)
+    batch_dir.mkdir(parents=True, exist_ok=True)
+
+    tasks = make_tasks(models, scenarios, programs)
+    rows = {}
+    clients = {}
+    requests: dict[tuple[str, str | None], list[dict]] = {}
+    owners: dict[str, list[tuple]] = {}
+    direct = {}
+    for task in tasks:
+        provider = provider_of(task.model_id)
+        if provider not in BATCH_APIS:
+            direct[task.model_name] = task.model_id
+            continue
+        if provider not in clients:
+            clients[provider] = BATCH_APIS[provider]()
+        model = task.model_id.removeprefix(f"{provider}/")
+        prompt = make_no_tools_prompt(task.scenario, task.variable)
+        request_id = custom_id(model, prompt)
+        if request_id not in owners:
+            messages = [{"role": "user", "content": prompt}]
+            group = (provider, model if clients[provider].one_model_per_job else None)
+            requests.setdefault(group, []).append(
+                clients[provider].request(request_id, model, messages)
+            )
+        # Models listed twice under different names share a request
+        owners.setdefault(request_id, []).append(
+            (task.model_name, task.scenario.id, task.variable)
+        )
+
+    jobs = [_Job(clients[p], requests[p, m], batch_dir) for p, m in requests]
+    for job in jobs:
+        job.submit()
+    succeeded = 0
+    for job in jobs:
+        for line in job.results(poll_interval):
+            request_id, text, error = job.client.parse(line)
+            succeeded += error is None
+            for row_key in owners.get(request_id, []):
+                rows[row_key] = {
+                    "prediction": extract_number(text) if text else None,
+                    "raw_response": text,
+                }
+    batched = sum(len(job.requests) for job in jobs)
+    print(f"  Batch results: {succeeded}/{batched} requests succeeded")
+    if succeeded < batched:
+        print("  Rerun to resubmit the requests without a result")
+
+    if direct:
+        df = run_no_tools_eval(scenarios, direct, programs, concurrency=concurrency)
+        for record in df.to_dict("records"):
+            rows[(record["model"], record["scenario_id"], record["variable"])] = {
+                "prediction": record["prediction"],
+                "raw_response": record["raw_response"],
+            }
+
+    empty = {"prediction": None, "raw_response": None}
+    df = pd.DataFrame(
+        [
+            {
+                "model": task.model_name,
+                "scenario_id": task.scenario.id,
+                "variable": task.variable,
+                **rows.get((task.model_name, task.scenario.id, task.variable), empty),
+            }
+            for task in tasks
+        ]
+    )
+    if output_path:
+        df.to_csv(output_path, index=False)
+    return df
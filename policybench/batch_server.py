@@ -0,0 +1,283 @@
+"""Local stand-in for the OpenAI and Anthropic batch APIs.
+
+``BatchServer`` implements the endpoints ``policybench.batch`` uses, under
+/openai/v1 and /anthropic, and answers every request with ``responder``
+(by default the text "0"); a responder returning None fails the request,
+as a provider error would. A job reports in progress for its first
+``polls`` status checks, then ends, so clients exercise polling too.
+Nothing leaves the machine; point the clients at it with
+OPENAI_BASE_URL=http://HOST:PORT/openai/v1 and
+ANTHROPIC_BASE_URL=http://HOST:PORT/anthropic.
+"""
+
+import email.parser
+import itertools
+import json
+import threading
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _zero(model: str, messages: list[dict]) -> str:
+    return "0"
+
+
+def _jsonl(lines: list[dict]) -> bytes:
+    return "".join(json.dumps(line) + "\n" for line in lines).encode()
+
+
+class BatchServer:
+    """Stand-in batch API server on a background thread.
+
+    Args:
+        responder: Text answering (model, messages), or None to fail it
+        polls: Status checks a job stays in progress for
+        host: Interface to bind
+        port: Port to bind; 0 picks a free one
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[str, list[dict]], str | None] = _zero,
+        polls: int = 1,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.responder = responder
+        self.polls = polls
+        self.files: dict[str, bytes] = {}
+        self.batches: dict[str, dict] = {}
+        self.submitted: list[list[dict]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "BatchServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve in the foreground until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "BatchServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _new_id(self, prefix: str) -> str:
+        with self._lock:
+            return f"{prefix}_{next(self._ids)}"
+
+    def _batch(self, batch_id: str) -> dict | None:
+        """A job's status, counting the check; None if unknown."""
+        with self._lock:
+            batch = self.batches.get(batch_id)
+            if batch is not None:
+                batch["checks"] += 1
+            return batch
+
+    # OpenAI
+
+    def openai_upload(self, content_type: str, body: bytes) -> dict:
+        message = email.parser.BytesParser().parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body
+        )
+        for part in message.get_payload():
+            if part.get_param("name", header="content-disposition") == "file":
+                file_id = self._new_id("file")
+                self.files[file_id] = part.get_payload(decode=True)
+                return {"id": file_id, "object": "file", "purpose": "batch"}
+        raise ValueError("No file part")
+
+    def openai_create(self, payload: dict) -> dict:
+        content = self.files[payload["input_file_id"]].decode()
+        requests = [json.loads(line) for line in content.splitlines() if line.strip()]
+        self.submitted.append(requests)
+        output = []
+        for request in requests:
+            body = request["body"]
+            text = self.responder(body["model"], body["messages"])
+            if text is None:
+                output.append(
+                    {
+                        "custom_id": request["custom_id"],
+                        "response": {
+                            "status_code": 500,
+                            "body": {"error": {"code": "server_error"}},
+                        },
+                        "error": None,
+                    }
+                )
+                continue
+            completion = {
+                "object": "chat.completion",
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop",
+                    }
+                ],
+            }
+            output.append(
+                {
+                    "custom_id": request["custom_id"],
+                    "response": {"status_code": 200, "body": completion},
+                    "error": None,
+                }
+            )
+        output_file = self._new_id("file")
+        self.files[output_file] = _jsonl(output)
+        batch_id = self._new_id("batch")
+        self.batches[batch_id] = {
+            "id": batch_id,
+            "object": "batch",
+            "checks": 0,
+            "output_file_id": output_file,
+            "request_counts": {"total": len(requests), "completed": len(requests)},
+        }
+        return self.openai_status(batch_id, count=False)
+
+    def openai_status(self, batch_id: str, count: bool = True) -> dict | None:
+        batch = self._batch(batch_id) if count else self.batches.get(batch_id)
+        if batch is None:
+            return None
+        ended = batch["checks"] > self.polls
+        status = {k: v for k, v in batch.items() if k != "checks"}
+        status["status"] = "completed" if ended else "in_progress"
+        if not ended:
+            status["output_file_id"] = None
+        return status
+
+    # Anthropic
+
+    def anthropic_create(self, payload: dict) -> dict:
+        requests = payload["requests"]
+        self.submitted.append(requests)
+        results = []
+        for request in requests:
+            params = request["params"]
+            text = self.responder(params["model"], params["messages"])
+            if text is None:
+                results.append(
+                    {
+                        "custom_id": request["custom_id"],
+                        "result": {
+                            "type": "errored",
+                            "error": {"type": "api_error"},
+                        },
+                    }
+                )
+                continue
+            message = {
+                "type": "message",
+                "role": "assistant",
+                "model": params["model"],
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+            }
+            results.append(
+                {
+                    "custom_id": request["custom_id"],
+                    "result": {"type": "succeeded", "message": message},
+                }
+            )
+        batch_id = self._new_id("msgbatch")
+        self.files[batch_id] = _jsonl(results)
+        self.batches[batch_id] = {"id": batch_id, "type": "message_batch", "checks": 0}
+        return self.anthropic_status(batch_id, count=False)
+
+    def anthropic_status(self, batch_id: str, count: bool = True) -> dict | None:
+        batch = self._batch(batch_id) if count else self.batches.get(batch_id)
+        if batch is None:
+            return None
+        ended = batch["checks"] > self.polls
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "results_url": (
+                f"{self.url}/anthropic/v1/messages/batches/{batch_id}/results"
+                if ended
+                else None
+            ),
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _reply(self, payload):
+                if payload is None:
+                    self._send(404, b'{"error": "not found"}', "application/json")
+                elif isinstance(payload, bytes):
+                    self._send(200, payload, "application/jsonl")
+                else:
+                    self._send(200, json.dumps(payload).encode(), "application/json")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                if self.path == "/openai/v1/files":
+                    content_type = self.headers["Content-Type"]
+                    self._reply(server.openai_upload(content_type, body))
+                elif self.path == "/openai/v1/batches":
+                    self._reply(server.openai_create(json.loads(body)))
+                elif self.path == "/anthropic/v1/messages/batches":
+                    self._reply(server.anthropic_create(json.loads(body)))
+                else:
+                    self._reply(None)
+
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                match parts:
+                    case ["openai", "v1", "batches", batch_id]:
+                        self._reply(server.openai_status(batch_id))
+                    case ["openai", "v1", "files", file_id, "content"]:
+                        self._reply(server.files.get(file_id))
+                    case ["anthropic", "v1", "messages", "batches", batch_id]:
+                        self._reply(server.anthropic_status(batch_id))
+                    case [
+                        "anthropic",
+                        "v1",
+                        "messages",
+                        "batches",
+                        batch_id,
+                        "results",
+                    ]:
+                        self._reply(server.files.get(batch_id))
+                    case _:
+                        self._reply(None)
+
+        return Handler
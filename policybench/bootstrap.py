@@ -0,0 +1,262 @@
+"""Paired bootstrap confidence intervals for PolicyBench metrics.
+
+Scenarios are the resampling unit. Each replicate draws scenarios with
+replacement, and every condition is evaluated on the same draw, so
+differences between conditions are paired. A block of replicates is a
+(replicates x scenarios) weight matrix of draw counts, and every metric of
+every (model, variable) group is its ratio of matrix products with
+per-scenario metric totals. Blocks are spread across a process pool.
+"""
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from policybench.analysis import (
+    METRICS,
+    ScoredPredictions,
+    compare_conditions,
+    score_predictions,
+    summarize_scores,
+    summary_by_model,
+    summary_by_variable,
+)
+from policybench.config import BOOTSTRAP_REPLICATES, CONFIDENCE_LEVEL, SEED
+
+# Replicates per block; bounds the weight matrix held in memory at once
+BLOCK_SIZE = 500
+
+# Metrics carried into model/variable summaries, as in summary_by_model
+SUMMARY_METRICS = ["mae", "mape", "within_10pct"]
+
+_worker_totals: list[tuple[np.ndarray, np.ndarray]] = []
+
+
+@dataclass
+class BootstrapResult:
+    """Point estimates and bootstrap replicates for one condition.
+
+    ``replicates[b, i, k]`` is ``METRICS[k]`` for row ``i`` of ``metrics``
+    in replicate ``b``.
+    """
+
+    metrics: pd.DataFrame
+    replicates: np.ndarray
+
+
+def _set_worker_totals(totals: list[tuple[np.ndarray, np.ndarray]]):
+    global _worker_totals
+    _worker_totals = totals
+
+
+def _replicate_block(n_replicates: int, seed: np.random.SeedSequence) -> list:
+    """Evaluate one block of replicates for every condition."""
+    n_scenarios = _worker_totals[0][0].shape[0]
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(0, n_scenarios, size=(n_replicates, n_scenarios))
+    offsets = np.arange(n_replicates)[:, None] * n_scenarios
+    weights = np.bincount(
+        (draws + offsets).ravel(), minlength=n_replicates * n_scenarios
+    ).reshape(n_replicates, n_scenarios)
+
+    blocks = []
+    for totals, counts in _worker_totals:
+        numerator = weights @ totals
+        denominator = weights @ counts
+        with np.errstate(divide="ignore", invalid="ignore"):
+            blocks.append(np.where(denominator > 0, numerator / denominator, np.nan))
+    return blocks
+
+
+def bootstrap_conditions(
+    ground_truth: pd.DataFrame,
+    conditions: dict[str, pd.DataFrame],
+    n_replicates: int = BOOTSTRAP_REPLICATES,
+    seed: int = SEED,
+    n_jobs: int | None = None,
+) -> dict[str, BootstrapResult]:
+    """Bootstrap compute_metrics for several conditions with paired draws.
+
+    Args:
+        ground_truth: DataFrame with columns [scenario_id, variable, value]
+        conditions: Condition name -> predictions DataFrame
+        n_replicates: Number of bootstrap replicates
+        seed: Seed for the scenario draws; results do not depend on n_jobs
+        n_jobs: Worker processes (defaults to the CPU count; 1 runs inline)
+
+    Returns:
+        Condition name -> BootstrapResult
+    """
+    scored = {
+        name: score_predictions(ground_truth, predictions)
+        for name, predictions in conditions.items()
+    }
+    return bootstrap_scores(scored, n_replicates, seed, n_jobs)
+
+
+def bootstrap_scores(
+    conditions: dict[str, ScoredPredictions],
+    n_replicates: int = BOOTSTRAP_REPLICATES,
+    seed: int = SEED,
+    n_jobs: int | None = None,
+) -> dict[str, BootstrapResult]:
+    """bootstrap_conditions for conditions already scored.
+
+    Every condition must share one scenario index (as scoring against the
+    same ground truth, or tensors built from it, gives) for the draws to
+    be paired.
+    """
+    names = list(conditions)
+    metrics = {}
+    totals = []
+    for name in names:
+        scored = conditions[name]
+        n_scenarios = len(scored.scenarios)
+        cell = scored.scenario * scored.n_groups + scored.group
+        sums, counts = scored.totals(cell, n_scenarios * scored.n_groups)
+        observed = np.bincount(scored.group, minlength=scored.n_groups) > 0
+        shape = (n_scenarios, scored.n_groups, len(METRICS))
+        totals.append(
+            (
+                sums.reshape(shape)[:, observed].reshape(n_scenarios, -1),
+                counts.reshape(shape)[:, observed].reshape(n_scenarios, -1),
+            )
+        )
+        metrics[name] = summarize_scores(scored)
+
+    block_sizes = [BLOCK_SIZE] * (n_replicates // BLOCK_SIZE)
+    if n_replicates % BLOCK_SIZE:
+        block_sizes.append(n_replicates % BLOCK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(block_sizes))
+
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(block_sizes))
+    if n_jobs <= 1:
+        _set_worker_totals(totals)
+        blocks = list(map(_replicate_block, block_sizes, seeds))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_set_worker_totals,
+            initargs=(totals,),
+        ) as pool:
+            blocks = list(pool.map(_replicate_block, block_sizes, seeds))
+
+    results = {}
+    for i, name in enumerate(names):
+        replicates = np.concatenate([block[i] for block in blocks])
+        results[name] = BootstrapResult(
+            metrics=metrics[name],
+            replicates=replicates.reshape(
+                n_replicates, len(metrics[name]), len(METRICS)
+            ),
+        )
+    return results
+
+
+def bootstrap_metrics(
+    ground_truth: pd.DataFrame,
+    predictions: pd.DataFrame,
+    n_replicates: int = BOOTSTRAP_REPLICATES,
+    seed: int = SEED,
+    n_jobs: int | None = None,
+) -> BootstrapResult:
+    """Bootstrap compute_metrics for a single condition."""
+    return bootstrap_conditions(
+        ground_truth,
+        {"predictions": predictions},
+        n_replicates=n_replicates,
+        seed=seed,
+        n_jobs=n_jobs,
+    )["predictions"]
+
+
+def _percentiles(replicates: np.ndarray, confidence: float) -> np.ndarray:
+    """Lower and upper percentile bounds along the replicate axis."""
+    alpha = (1 - confidence) / 2
+    with warnings.catch_warnings():
+        # Groups with no valid replicate (e.g. MAPE of an all-zero variable)
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanquantile(replicates, [alpha, 1 - alpha], axis=0)
+
+
+def _summary_replicates(
+    result: BootstrapResult, by: str
+) -> tuple[pd.Index, np.ndarray]:
+    """Average group replicates over variables (by="model") or models."""
+    keys = pd.Index(sorted(result.metrics[by].unique()))
+    codes = keys.get_indexer(result.metrics[by])
+    columns = [METRICS.index(metric) for metric in SUMMARY_METRICS]
+    summary = np.empty((len(result.replicates), len(keys), len(columns)))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for i in range(len(keys)):
+            summary[:, i] = np.nanmean(
+                result.replicates[:, codes == i][:, :, columns], axis=1
+            )
+    return keys, summary
+
+
+def metric_intervals(
+    result: BootstrapResult,
+    confidence: float = CONFIDENCE_LEVEL,
+) -> pd.DataFrame:
+    """compute_metrics output with ``<metric>_low``/``<metric>_high`` bounds."""
+    bounds = _percentiles(result.replicates, confidence)
+    intervals = result.metrics.copy()
+    for k, metric in enumerate(METRICS):
+        intervals[f"{metric}_low"] = bounds[0, :, k]
+        intervals[f"{metric}_high"] = bounds[1, :, k]
+    return intervals
+
+
+def summary_intervals(
+    result: BootstrapResult,
+    by: str = "model",
+    confidence: float = CONFIDENCE_LEVEL,
+) -> pd.DataFrame:
+    """summary_by_model (or summary_by_variable) with bootstrap bounds."""
+    summarize = {"model": summary_by_model, "variable": summary_by_variable}[by]
+    summary = summarize(result.metrics)
+    keys, replicates = _summary_replicates(result, by)
+    bounds = _percentiles(replicates, confidence)
+    rows = keys.get_indexer(summary[by])
+    for k, metric in enumerate(SUMMARY_METRICS):
+        summary[f"mean_{metric}_low"] = bounds[0, rows, k]
+        summary[f"mean_{metric}_high"] = bounds[1, rows, k]
+    return summary
+
+
+def compare_conditions_intervals(
+    no_tools: BootstrapResult,
+    with_tools: BootstrapResult,
+    confidence: float = CONFIDENCE_LEVEL,
+) -> pd.DataFrame:
+    """compare_conditions with paired bootstrap bounds on the improvements.
+
+    Both results must come from the same bootstrap_conditions call so that
+    replicate b of each condition used the same scenario draw.
+    """
+    comparison = compare_conditions(no_tools.metrics, with_tools.metrics)
+    no_keys, no_reps = _summary_replicates(no_tools, "model")
+    with_keys, with_reps = _summary_replicates(with_tools, "model")
+    no_reps = no_reps[:, no_keys.get_indexer(comparison["model"])]
+    with_reps = with_reps[:, with_keys.get_indexer(comparison["model"])]
+
+    mae = SUMMARY_METRICS.index("mae")
+    within = SUMMARY_METRICS.index("within_10pct")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mae_reduction = 1 - with_reps[:, :, mae] / no_reps[:, :, mae]
+    accuracy_improvement = with_reps[:, :, within] - no_reps[:, :, within]
+
+    for name, replicates in [
+        ("mae_reduction", mae_reduction),
+        ("accuracy_improvement", accuracy_improvement),
+    ]:
+        bounds = _percentiles(replicates, confidence)
+        comparison[f"{name}_low"] = bounds[0]
+        comparison[f"{name}_high"] = bounds[1]
+    return comparison
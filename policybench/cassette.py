@@ -0,0 +1,154 @@
+"""Record LLM traffic to a cassette and replay it offline.
+
+``--record PATH`` writes every completion request that succeeds, tool-call
+turns included, to one gzip-compressed JSON-lines file: its request key
+(see ``policybench.llm.request_key``), model, arguments and response. The
+file is self-contained and portable, unlike the LiteLLM disk cache.
+
+``--replay PATH`` answers completions from the cassette without importing
+litellm or touching the network. A request missing from the cassette
+raises ``CassetteMiss``, which the runners never retry or swallow, so a
+change to prompts or parsing that alters requests fails the run at once.
+
+Recording into an existing cassette keeps its entries and appends new
+ones, so runs of the two conditions can share a cassette.
+"""
+
+import gzip
+import json
+import threading
+from pathlib import Path
+
+CASSETTE_PATH = "results/cassette.jsonl.gz"
+
+_cassette: "Cassette | None" = None
+
+
+class CassetteMiss(LookupError):
+    """A replayed request has no recording."""
+
+
+class Replayed:
+    """A recorded response with the attribute access of litellm's objects.
+
+    ``response.choices[0].message.tool_calls[0].function.name`` and
+    ``message.model_dump()`` work as on the live response; a missing
+    attribute raises AttributeError.
+    """
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getattr__(self, name: str):
+        try:
+            value = self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return _wrap(value)
+
+    def model_dump(self) -> dict:
+        return json.loads(json.dumps(self._data))
+
+    def __repr__(self) -> str:
+        return f"Replayed({self._data!r})"
+
+
+def _wrap(value):
+    if isinstance(value, dict):
+        return Replayed(value)
+    if isinstance(value, list):
+        return [_wrap(item) for item in value]
+    return value
+
+
+def _dump(response) -> dict:
+    """A live response as JSON-ready data.
+
+    Messages are dumped on their own, as the with-tools loop does when it
+    sends them back, so replayed follow-up requests have the same key.
+    """
+    data = response.model_dump()
+    for choice_data, choice in zip(data.get("choices", []), response.choices):
+        choice_data["message"] = choice.message.model_dump()
+    return json.loads(json.dumps(data, default=str))
+
+
+class Cassette:
+    """Recorded responses by request key.
+
+    Args:
+        path: Cassette file
+        mode: "record" to append new requests, "replay" to serve them
+    """
+
+    def __init__(self, path: str | Path, mode: str):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.responses: dict[str, dict] = {}
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._file = None
+        if self.path.exists():
+            with gzip.open(self.path, "rt") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.responses[entry["key"]] = entry["response"]
+        elif mode == "replay":
+            raise FileNotFoundError(f"No cassette at {self.path}")
+
+    def replay(self, key: str, request: dict) -> Replayed:
+        """The recorded response, or CassetteMiss."""
+        try:
+            return Replayed(self.responses[key])
+        except KeyError:
+            raise CassetteMiss(
+                f"Request {key} for {request.get('model')} is not in {self.path}; "
+                "record it again with --record"
+            ) from None
+
+    def record(self, key: str, request: dict, response):
+        """Append a live response unless the key is already recorded."""
+        with self._lock:
+            if key in self.responses:
+                return
+            data = _dump(response)
+            self.responses[key] = data
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = gzip.open(self.path, "at")
+            entry = {
+                "key": key,
+                "model": request.get("model"),
+                "request": request,
+                "response": data,
+            }
+            self._file.write(json.dumps(entry, default=str) + "\n")
+            self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def enable_cassette(path: str | Path, mode: str) -> Cassette:
+    """Record completions to, or replay them from, the cassette at path."""
+    global _cassette
+    disable_cassette()
+    _cassette = Cassette(path, mode)
+    return _cassette
+
+
+def disable_cassette():
+    """Stop recording or replaying, finishing the cassette file."""
+    global _cassette
+    if _cassette is not None:
+        _cassette.close()
+    _cassette = None
+
+
+def active_cassette() -> "Cassette | None":
+    return _cassette
@@ -2,40 +2,392 @@
 
 import argparse
 import sys
+from pathlib import Path
+
+from policybench.config import (
+    BATCH_POLL_INTERVAL,
+    GROUND_TRUTH_PATH,
+    MODELS,
+    NO_TOOLS_PATH,
+    STREAM_TOKEN_BUDGET,
+    TENSOR_DIR,
+    WITH_TOOLS_PATH,
+)
+from policybench.events import EVENT_LOG_PATH
+from policybench.hedge import BUDGET as HEDGE_BUDGET
+from policybench.hedge import PERCENTILE as HEDGE_PERCENTILE
+from policybench.profiling import PROFILE_DIR
+from policybench.scheduler import PROVIDER_CONCURRENCY
 
 
 def main():
     parser = argparse.ArgumentParser(description="PolicyBench benchmark runner")
+    profile_help = (
+        "Time named stages and sample stacks; writes folded flamegraph "
+        f"stacks and a span table to DIR (default {PROFILE_DIR})"
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const=PROFILE_DIR, metavar="DIR", help=profile_help
+    )
     subparsers = parser.add_subparsers(dest="command")
 
     # Ground truth
     gt_parser = subparsers.add_parser(
         "ground-truth", help="Generate ground truth from PolicyEngine-US"
     )
-    gt_parser.add_argument("-o", "--output", default="results/ground_truth.csv")
+    gt_parser.add_argument("-o", "--output", default=GROUND_TRUTH_PATH)
 
     # Eval no tools
     nt_parser = subparsers.add_parser("eval-no-tools", help="Run AI-alone evaluation")
-    nt_parser.add_argument("-o", "--output", default="results/no_tools/predictions.csv")
+    nt_parser.add_argument("-o", "--output", default=NO_TOOLS_PATH)
+    nt_parser.add_argument("--run", help="Also save predictions to the store")
+    nt_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream responses and stop reading once a line holds just a number",
+    )
+    nt_parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=STREAM_TOKEN_BUDGET,
+        help="With --stream, chunks to read before giving up (no prediction)",
+    )
+    nt_parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit OpenAI and Anthropic requests as provider batch jobs "
+        "(resumes jobs already submitted)",
+    )
+    nt_parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=BATCH_POLL_INTERVAL,
+        help="Seconds between batch status checks",
+    )
 
     # Eval with tools
     wt_parser = subparsers.add_parser(
         "eval-with-tools", help="Run AI-with-tools evaluation"
     )
-    wt_parser.add_argument(
-        "-o", "--output", default="results/with_tools/predictions.csv"
+    wt_parser.add_argument("-o", "--output", default=WITH_TOOLS_PATH)
+    wt_parser.add_argument("--run", help="Also save predictions to the store")
+
+    for eval_parser in (nt_parser, wt_parser):
+        eval_parser.add_argument(
+            "--live",
+            action="store_true",
+            help="Show running metrics against ground truth with each progress line",
+        )
+        eval_parser.add_argument("--ground-truth", default=GROUND_TRUTH_PATH)
+        eval_parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=PROVIDER_CONCURRENCY,
+            help="Initial requests in flight per provider; adapts to rate "
+            "limits and latency",
+        )
+
+    metrics_help = (
+        "Also write Prometheus metrics for node_exporter's textfile collector "
+        f"to PATH (events always go to {EVENT_LOG_PATH})"
+    )
+
+    # Full pipeline
+    run_parser = subparsers.add_parser(
+        "run", help="Run every out-of-date stage of the benchmark"
+    )
+    run_parser.add_argument(
+        "--force", action="store_true", help="Rerun stages even if up to date"
+    )
+    run_parser.add_argument(
+        "--dry-run", action="store_true", help="Show which stages would run"
+    )
+    run_parser.add_argument(
+        "--jobs", type=int, default=None, help="Stages to run concurrently"
+    )
+    for events_parser in (nt_parser, wt_parser, run_parser):
+        events_parser.add_argument("--metrics-file", metavar="PATH", help=metrics_help)
+        events_parser.add_argument(
+            "--hedge",
+            nargs="?",
+            type=_percentile,
+            const=HEDGE_PERCENTILE,
+            metavar="PERCENTILE",
+            help="Send a duplicate of any request slower than this latency "
+            f"percentile of its model (default {HEDGE_PERCENTILE}) and use the "
+            "first answer",
+        )
+        events_parser.add_argument(
+            "--hedge-budget",
+            type=_share,
+            default=HEDGE_BUDGET,
+            metavar="SHARE",
+            help="Largest share of requests that may be hedged",
+        )
+        cassette_group = events_parser.add_mutually_exclusive_group()
+        cassette_group.add_argument(
+            "--record",
+            metavar="CASSETTE",
+            help="Record every LLM request and response to a compressed cassette",
+        )
+        cassette_group.add_argument(
+            "--replay",
+            metavar="CASSETTE",
+            help="Answer LLM requests from a cassette, offline; fail on a miss",
+        )
+
+    # Cost and wall-time planner
+    plan_parser = subparsers.add_parser(
+        "plan", help="Estimate requests, tokens, cost and wall time of a run"
+    )
+    plan_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=PROVIDER_CONCURRENCY,
+        help="Requests in flight per provider",
+    )
+    plan_parser.add_argument(
+        "--scenarios", type=int, default=None, help="Number of scenarios"
+    )
+    plan_parser.add_argument(
+        "--models",
+        nargs="+",
+        choices=list(MODELS),
+        default=None,
+        help="Model names (default: all)",
     )
 
     # Analyze
-    subparsers.add_parser("analyze", help="Analyze results")
+    an_parser = subparsers.add_parser("analyze", help="Analyze results")
+    an_parser.add_argument(
+        "--bootstrap",
+        type=_count,
+        default=0,
+        metavar="N",
+        help="Report paired bootstrap confidence intervals from N replicates",
+    )
+    an_parser.add_argument(
+        "--jobs", type=int, default=None, help="Worker processes for bootstrap"
+    )
+    an_parser.add_argument("--run", help="Analyze a run from the store")
+    an_parser.add_argument(
+        "--tensor", metavar="DIR", help="Analyze prediction tensors saved in DIR"
+    )
+    an_parser.add_argument("--ground-truth", default=GROUND_TRUTH_PATH)
+
+    # Web app data
+    app_parser = subparsers.add_parser(
+        "export-app", help="Export precomputed JSON for the web app"
+    )
+    app_parser.add_argument("-o", "--output", default="app/public/data")
+    app_parser.add_argument("--run", help="Export a run from the store")
+    app_parser.add_argument(
+        "--tensor", metavar="DIR", help="Export prediction tensors saved in DIR"
+    )
+    app_parser.add_argument("--ground-truth", default=GROUND_TRUTH_PATH)
+
+    # Prediction tensors
+    tensor_parser = subparsers.add_parser(
+        "tensor", help="Save predictions as memory-mapped arrays"
+    )
+    tensor_parser.add_argument("-o", "--output", default=TENSOR_DIR)
+    tensor_parser.add_argument("--run", help="Convert a run from the store")
+    tensor_parser.add_argument("--ground-truth", default=GROUND_TRUTH_PATH)
+
+    # Run-over-run diff
+    diff_parser = subparsers.add_parser(
+        "diff", help="Compare two stored runs cell by cell"
+    )
+    diff_parser.add_argument("run_a", help="Baseline run")
+    diff_parser.add_argument("run_b", help="Run compared against the baseline")
+    diff_parser.add_argument(
+        "--metric",
+        default="within_10pct",
+        choices=["mae", "mape", "accuracy", "within_10pct"],
+        help="Metric to rank movers by",
+    )
+    diff_parser.add_argument(
+        "--top", type=int, default=10, help="Movers listed per dimension"
+    )
+    diff_parser.add_argument(
+        "--cells", metavar="CSV", help="Write every paired cell to CSV"
+    )
+    diff_parser.add_argument("--root", default="results/store")
+    diff_parser.add_argument("--ground-truth", default=GROUND_TRUTH_PATH)
+
+    # SQL over stored runs
+    q_parser = subparsers.add_parser("query", help="Run SQL over stored runs")
+    q_parser.add_argument(
+        "sql",
+        help="Query over the predictions, ground_truth, scenarios and results views",
+    )
+    q_parser.add_argument("--root", default="results/store")
+    q_parser.add_argument("--ground-truth", default=GROUND_TRUTH_PATH)
+    q_parser.add_argument("--csv", action="store_true", help="Print CSV output")
+
+    # Results store
+    store_parser = subparsers.add_parser("store", help="Manage the results store")
+    store_parser.add_argument("--root", default="results/store")
+    store_sub = store_parser.add_subparsers(dest="store_command", required=True)
+    store_sub.add_parser("list", help="List runs in the store")
+    for name, help_text in [
+        ("import", "Import a predictions CSV"),
+        ("export", "Export a run's predictions as CSV"),
+    ]:
+        io_parser = store_sub.add_parser(name, help=help_text)
+        io_parser.add_argument("csv")
+        io_parser.add_argument("--run", required=True)
+        io_parser.add_argument(
+            "--condition", required=True, choices=["no_tools", "with_tools"]
+        )
+
+    # Warm PolicyEngine daemon
+    engine_parser = subparsers.add_parser(
+        "engine", help="Keep PolicyEngine-US loaded for repeated runs"
+    )
+    engine_parser.add_argument(
+        "--socket",
+        help="Daemon socket (default $POLICYBENCH_ENGINE_SOCKET or "
+        ".policybench_engine.sock); runs find the daemon through that "
+        "variable, so export it when serving elsewhere",
+    )
+    engine_sub = engine_parser.add_subparsers(dest="engine_command", required=True)
+    engine_sub.add_parser("serve", help="Run the daemon in the foreground")
+    engine_sub.add_parser("status", help="Report whether the daemon is running")
+    engine_sub.add_parser("stop", help="Stop the running daemon")
+
+    # Stand-in batch API server
+    batch_server_parser = subparsers.add_parser(
+        "batch-server", help="Serve stand-in OpenAI and Anthropic batch APIs locally"
+    )
+    batch_server_parser.add_argument("--port", type=int, default=8765)
+
+    # Startup benchmark
+    bs_parser = subparsers.add_parser(
+        "bench-startup", help="Check per-subcommand import time against budgets"
+    )
+    bs_parser.add_argument(
+        "commands", nargs="*", help="Subcommands to check (default: all)"
+    )
+    bs_parser.add_argument("--repeat", type=int, default=3)
+
+    # Accept --profile after the subcommand too
+    for subparser in subparsers.choices.values():
+        subparser.add_argument(
+            "--profile",
+            nargs="?",
+            const=PROFILE_DIR,
+            default=argparse.SUPPRESS,
+            metavar="DIR",
+            help=profile_help,
+        )
 
     args = parser.parse_args()
 
+    if args.profile:
+        from policybench.profiling import Profiler
+
+        with Profiler(args.profile, name=args.command or "policybench"):
+            _run(args, parser)
+    else:
+        _run(args, parser)
+
+
+def _percentile(text: str) -> float:
+    """argparse type of a percentile, as a fraction strictly between 0 and 1."""
+    value = float(text)
+    if not 0 < value < 1:
+        raise argparse.ArgumentTypeError(
+            f"{text} is not between 0 and 1 (use 0.95 for p95)"
+        )
+    return value
+
+
+def _share(text: str) -> float:
+    """argparse type of a share from 0 to 1."""
+    value = float(text)
+    if not 0 <= value <= 1:
+        raise argparse.ArgumentTypeError(f"{text} is not from 0 to 1")
+    return value
+
+
+def _count(text: str) -> int:
+    """argparse type of a count: a non-negative integer."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{text} is not an integer") from None
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"{text} is negative")
+    return value
+
+
+def _enable_llm(args):
+    """Set up the disk cache, or the cassette given by --record/--replay,
+    and hedging if requested."""
+    if args.hedge is not None:
+        from policybench.hedge import enable_hedging
+
+        enable_hedging(args.hedge, args.hedge_budget)
+    if args.replay:
+        from policybench.cassette import enable_cassette
+
+        enable_cassette(args.replay, "replay")
+        return
+
     # Enable disk cache for all LLM calls
+    from policybench.cache import enable_cache
+
+    enable_cache()
+    if args.record:
+        import atexit
+
+        from policybench.cassette import disable_cassette, enable_cassette
+
+        cassette = enable_cassette(args.record, "record")
+        atexit.register(disable_cassette)
+        atexit.register(
+            lambda: print(f"Recorded {cassette.recorded} requests to {args.record}")
+        )
+
+
+def _read_conditions(args):
+    """No-tools and with-tools predictions of --run, or the default CSVs."""
+    import pandas as pd
+
+    if args.run:
+        from policybench.store import read_predictions
+
+        return (
+            read_predictions(runs=[args.run], conditions=["no_tools"]),
+            read_predictions(runs=[args.run], conditions=["with_tools"]),
+        )
+    return pd.read_csv(NO_TOOLS_PATH), pd.read_csv(WITH_TOOLS_PATH)
+
+
+def _run(args, parser):
+    """Execute the parsed subcommand."""
+    if args.command == "eval-no-tools" and args.batch:
+        # Batch requests bypass litellm, so cassettes, live metrics,
+        # streaming and hedging would silently do nothing
+        for flag in ("replay", "record", "live", "stream", "hedge"):
+            if getattr(args, flag) not in (None, False):
+                parser.error(f"--batch cannot be combined with --{flag}")
+
+    # Set up LLM access (cache or cassette) and the event log
+    live = None
     if args.command in ("eval-no-tools", "eval-with-tools"):
-        from policybench.cache import enable_cache
+        from policybench.events import enable_event_log
+
+        _enable_llm(args)
+        enable_event_log(metrics_path=args.metrics_file)
+
+        if args.live:
+            import pandas as pd
+
+            from policybench.streaming import StreamingMetrics
 
-        enable_cache()
+            live = StreamingMetrics(pd.read_csv(args.ground_truth))
 
     if args.command == "ground-truth":
         from policybench.ground_truth import calculate_ground_truth
@@ -51,34 +403,149 @@ def main():
         from policybench.scenarios import generate_scenarios
 
         scenarios = generate_scenarios()
-        df = run_no_tools_eval(scenarios)
+        if args.batch:
+            from policybench.batch import run_batch_eval
+
+            df = run_batch_eval(
+                scenarios,
+                poll_interval=args.poll_interval,
+                concurrency=args.concurrency,
+            )
+        else:
+            df = run_no_tools_eval(
+                scenarios,
+                live=live,
+                concurrency=args.concurrency,
+                stream=args.stream,
+                token_budget=args.token_budget,
+            )
         df.to_csv(args.output, index=False)
         print(f"No-tools predictions saved to {args.output}")
+        if args.run:
+            from policybench.store import write_predictions
+
+            write_predictions(df, args.run, "no_tools")
+            print(f"No-tools predictions stored as run {args.run}")
 
     elif args.command == "eval-with-tools":
         from policybench.eval_with_tools import run_with_tools_eval
         from policybench.scenarios import generate_scenarios
 
         scenarios = generate_scenarios()
-        df = run_with_tools_eval(scenarios)
+        shortcut = None
+        if Path(args.ground_truth).exists():
+            import pandas as pd
+
+            from policybench.shortcut import GroundTruthIndex
+
+            shortcut = GroundTruthIndex(scenarios, pd.read_csv(args.ground_truth))
+        df = run_with_tools_eval(
+            scenarios, live=live, concurrency=args.concurrency, shortcut=shortcut
+        )
         df.to_csv(args.output, index=False)
         print(f"With-tools predictions saved to {args.output}")
+        if args.run:
+            from policybench.store import write_predictions
 
-    elif args.command == "analyze":
-        import pandas as pd
+            write_predictions(df, args.run, "with_tools")
+            print(f"With-tools predictions stored as run {args.run}")
+
+    elif args.command == "run":
+        from policybench.pipeline import benchmark_stages, plan, run_pipeline
+        from policybench.scenarios import generate_scenarios
+
+        stages = benchmark_stages(generate_scenarios())
+        if args.dry_run:
+            for name, action in plan(stages, force=args.force).items():
+                print(f"{name}: {action}")
+            return
+
+        from policybench.events import enable_event_log
+
+        _enable_llm(args)
+        enable_event_log(metrics_path=args.metrics_file)
+        status = run_pipeline(stages, force=args.force, max_workers=args.jobs)
+        if any(result in ("failed", "blocked") for result in status.values()):
+            sys.exit(1)
+
+    elif args.command == "plan":
+        import os
+
+        from policybench.config import NUM_SCENARIOS
+        from policybench.planner import plan_costs, tiktoken_cache_dir
+        from policybench.scenarios import generate_scenarios
+
+        # Tokenize offline with the o200k_base encoding LiteLLM bundles
+        if tiktoken_cache_dir() is not None:
+            os.environ.setdefault("TIKTOKEN_CACHE_DIR", str(tiktoken_cache_dir()))
 
-        from policybench.analysis import (
-            compare_conditions,
-            compute_metrics,
+        models = MODELS
+        if args.models:
+            models = {name: MODELS[name] for name in args.models}
+        scenarios = generate_scenarios(n=args.scenarios or NUM_SCENARIOS)
+        df = plan_costs(scenarios, models, concurrency=args.concurrency)
+        print(df.to_string(index=False, float_format=lambda x: f"{x:,.2f}"))
+        totals = df.groupby("condition")[["requests", "cost_usd", "hours"]].sum()
+        # A model without a price makes its condition's cost unknown, not $0
+        totals["cost_usd"] = df.groupby("condition")["cost_usd"].agg(
+            lambda cost: cost.sum(skipna=False)
         )
+        by_provider = df.groupby(["condition", "provider"])["hours"].sum()
+        totals["wall_hours"] = by_provider.groupby("condition").max()
+        print(f"\n=== Totals at concurrency {args.concurrency} per provider ===")
+        print(totals.to_string(float_format=lambda x: f"{x:,.2f}"))
+        unpriced = sorted(df.loc[df["cost_usd"].isna(), "model"].unique())
+        if unpriced:
+            print(f"No price for {', '.join(unpriced)}; add them to MODEL_PRICES")
 
-        gt = pd.read_csv("results/ground_truth.csv")
-        no_tools = pd.read_csv("results/no_tools/predictions.csv")
-        with_tools = pd.read_csv("results/with_tools/predictions.csv")
+    elif args.command == "analyze":
+        if args.tensor:
+            from policybench.tensor import load_conditions
+
+            tensors = load_conditions(args.tensor)
+        else:
+            import pandas as pd
+
+            gt = pd.read_csv(args.ground_truth)
+            no_tools, with_tools = _read_conditions(args)
+            tensors = None
+
+        if args.bootstrap:
+            from policybench.bootstrap import (
+                bootstrap_conditions,
+                bootstrap_scores,
+                compare_conditions_intervals,
+                metric_intervals,
+            )
 
-        nt_metrics = compute_metrics(gt, no_tools)
-        wt_metrics = compute_metrics(gt, with_tools)
-        comparison = compare_conditions(nt_metrics, wt_metrics)
+            if tensors:
+                results = bootstrap_scores(
+                    {name: tensor.score() for name, tensor in tensors.items()},
+                    n_replicates=args.bootstrap,
+                    n_jobs=args.jobs,
+                )
+            else:
+                results = bootstrap_conditions(
+                    gt,
+                    {"no_tools": no_tools, "with_tools": with_tools},
+                    n_replicates=args.bootstrap,
+                    n_jobs=args.jobs,
+                )
+            nt_metrics = metric_intervals(results["no_tools"])
+            wt_metrics = metric_intervals(results["with_tools"])
+            comparison = compare_conditions_intervals(
+                results["no_tools"], results["with_tools"]
+            )
+        else:
+            from policybench.analysis import compare_conditions, compute_metrics
+
+            if tensors:
+                nt_metrics = tensors["no_tools"].metrics()
+                wt_metrics = tensors["with_tools"].metrics()
+            else:
+                nt_metrics = compute_metrics(gt, no_tools)
+                wt_metrics = compute_metrics(gt, with_tools)
+            comparison = compare_conditions(nt_metrics, wt_metrics)
 
         print("\n=== AI Alone Metrics ===")
         print(nt_metrics.to_string(index=False))
@@ -87,6 +554,138 @@ def main():
         print("\n=== Comparison ===")
         print(comparison.to_string(index=False))
 
+    elif args.command == "export-app":
+        from policybench.export_app import export_app_data, export_app_tensors
+        from policybench.scenarios import generate_scenarios
+
+        if args.tensor:
+            from policybench.tensor import load_conditions
+
+            tensors = load_conditions(args.tensor)
+            paths = export_app_tensors(
+                tensors["no_tools"],
+                tensors["with_tools"],
+                generate_scenarios(),
+                output_dir=args.output,
+            )
+        else:
+            import pandas as pd
+
+            gt = pd.read_csv(args.ground_truth)
+            no_tools, with_tools = _read_conditions(args)
+            paths = export_app_data(
+                gt, no_tools, with_tools, generate_scenarios(), output_dir=args.output
+            )
+        print(f"Wrote {len(paths)} app data files to {args.output}")
+
+    elif args.command == "tensor":
+        import pandas as pd
+
+        from policybench.tensor import PredictionTensor
+
+        gt = pd.read_csv(args.ground_truth)
+        conditions = dict(zip(["no_tools", "with_tools"], _read_conditions(args)))
+        models = sorted(
+            set().union(*(set(df["model"].astype(str)) for df in conditions.values()))
+        )
+        for name, predictions in conditions.items():
+            tensor = PredictionTensor.from_frames(gt, predictions, models)
+            tensor.save(Path(args.output) / name)
+            print(
+                f"{name}: {tensor.predictions.shape} "
+                f"(model, scenario, variable), {int(tensor.mask.sum()):,} predictions"
+            )
+        print(f"Saved tensors to {args.output}")
+
+    elif args.command == "diff":
+        import pandas as pd
+
+        from policybench.diff import DIMENSIONS, LOWER_IS_BETTER, diff_runs
+        from policybench.store import ANALYSIS_COLUMNS, read_predictions
+
+        columns = ["condition", *ANALYSIS_COLUMNS]
+        runs = [
+            read_predictions(args.root, columns=columns, runs=[run])
+            for run in (args.run_a, args.run_b)
+        ]
+        for run, df in zip((args.run_a, args.run_b), runs):
+            if df.empty:
+                parser.error(f"run {run!r} is not in {args.root}")
+        diff = diff_runs(
+            pd.read_csv(args.ground_truth), *runs, names=(args.run_a, args.run_b)
+        )
+
+        better = "lower" if args.metric in LOWER_IS_BETTER else "higher"
+        print(
+            f"{args.run_b} vs {args.run_a}: {len(diff.cells):,} paired cells; "
+            f"delta = {args.run_b} - {args.run_a}, {better} {args.metric} is better"
+        )
+        overall = diff.movers[diff.movers["dimension"] == "overall"]
+        print("\n=== Overall ===")
+        print(overall.drop(columns=["dimension", "group"]).to_string(index=False))
+        for dimension in DIMENSIONS:
+            movers = diff.top_movers(args.metric, dimension, args.top)
+            print(f"\n=== Biggest movers by {dimension.replace('_', ' ')} ===")
+            print(movers.drop(columns=["dimension", "metric"]).to_string(index=False))
+        if args.cells:
+            diff.cells.to_csv(args.cells, index=False)
+            print(f"\nWrote {len(diff.cells):,} cells to {args.cells}")
+
+    elif args.command == "query":
+        from policybench.query import query
+
+        df = query(args.sql, store_root=args.root, ground_truth_path=args.ground_truth)
+        if args.csv:
+            df.to_csv(sys.stdout, index=False)
+        else:
+            print(df.to_string(index=False))
+
+    elif args.command == "store":
+        from policybench import store
+
+        if args.store_command == "list":
+            print(store.list_runs(args.root).to_string(index=False))
+        elif args.store_command == "import":
+            paths = store.import_csv(args.csv, args.run, args.condition, args.root)
+            print(f"Imported {args.csv} into {len(paths)} partitions")
+        elif args.store_command == "export":
+            store.export_csv(args.csv, args.run, args.condition, args.root)
+            print(f"Exported run {args.run} ({args.condition}) to {args.csv}")
+
+    elif args.command == "engine":
+        from policybench import engine
+
+        args.socket = args.socket or engine.default_socket_path()
+        if args.engine_command == "serve":
+            engine.serve(args.socket)
+        elif args.engine_command == "status":
+            pid = engine.daemon_pid(args.socket)
+            if pid is None:
+                print(f"No PolicyEngine daemon on {args.socket}")
+                sys.exit(1)
+            print(f"PolicyEngine daemon running on {args.socket} (pid {pid})")
+        elif args.engine_command == "stop":
+            if engine.stop_daemon(args.socket):
+                print("PolicyEngine daemon stopped")
+            else:
+                print(f"No PolicyEngine daemon on {args.socket}")
+
+    elif args.command == "batch-server":
+        from policybench.batch_server import BatchServer
+
+        server = BatchServer(port=args.port)
+        print(f"export OPENAI_BASE_URL={server.url}/openai/v1")
+        print(f"export ANTHROPIC_BASE_URL={server.url}/anthropic")
+        server.serve_forever()
+
+    elif args.command == "bench-startup":
+        from policybench.startup import bench_startup, format_report
+
+        rows = bench_startup(args.commands or None, repeat=args.repeat)
+        print(format_report(rows))
+        if not all(row["ok"] for row in rows):
+            sys.exit(1)
+
     else:
         parser.print_help()
         sys.exit(1)
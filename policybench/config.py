@@ -15,6 +15,12 @@ MODELS = {
     "gemini-3-pro": "gemini/gemini-3-pro-preview",
 }
 
+# USD per million (input, output) tokens, for models missing from LiteLLM's
+# bundled price list
+MODEL_PRICES = {
+    "gemini/gemini-3-pro-preview": (2.00, 12.00),
+}
+
 # PolicyEngine-US variables to evaluate
 PROGRAMS = [
     # Federal tax
@@ -45,6 +51,13 @@ BINARY_PROGRAMS = ["is_medicaid_eligible", "free_school_meals"]
 # Rate variables — evaluated with absolute error, not percentage
 RATE_PROGRAMS = ["marginal_tax_rate"]
 
+# Seconds between status checks of submitted provider batch jobs
+BATCH_POLL_INTERVAL = 60.0
+
+# Streamed no-tools responses are closed after this many chunks (about a
+# token each) if no answer has been read by then, and get no prediction
+STREAM_TOKEN_BUDGET = 256
+
 # States to include in scenarios
 STATES = [
     "CA",
@@ -87,12 +100,32 @@ INCOME_LEVELS = [
     500_000,
 ]
 
+# Household income bands for slicing results: (label, lower bound inclusive)
+INCOME_BANDS = [
+    ("under_25k", 0),
+    ("25k_50k", 25_000),
+    ("50k_100k", 50_000),
+    ("100k_200k", 100_000),
+    ("200k_plus", 200_000),
+]
+
 # Number of children options
 NUM_CHILDREN_OPTIONS = [0, 1, 2, 3, 4]
 
 # Number of scenarios to generate
 NUM_SCENARIOS = 100
 
+# Default locations of benchmark outputs
+GROUND_TRUTH_PATH = "results/ground_truth.csv"
+NO_TOOLS_PATH = "results/no_tools/predictions.csv"
+WITH_TOOLS_PATH = "results/with_tools/predictions.csv"
+ANALYSIS_DIR = "results/analysis"
+TENSOR_DIR = "results/tensor"
+
+# Bootstrap replicates and confidence level for metric intervals
+BOOTSTRAP_REPLICATES = 10_000
+CONFIDENCE_LEVEL = 0.95
+
 # PolicyEngine tool definition for LiteLLM tool-calling
 PE_TOOL_DEFINITION = {
     "type": "function",
@@ -0,0 +1,257 @@
+"""Run-over-run regression diffs.
+
+``diff_runs`` compares two runs of the benchmark cell by cell, where a
+cell is a (condition, model, scenario, variable) answered in both runs.
+Each run's predictions become a PredictionTensor on shared axes, so cells
+line up by position rather than through a join on string keys.
+
+Every cell is scored as compute_metrics scores a row, and the paired
+deltas (run B minus run A) are averaged per group of a dimension: model,
+program, state and income band. Cells of one scenario are not
+independent, so a delta's standard error is clustered by scenario, and
+its p-value is the two-sided normal approximation. P-values are per
+group, without a correction for the number of groups compared.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from policybench.analysis import METRICS, score_arrays
+from policybench.scenarios import Scenario, generate_scenarios
+from policybench.tensor import PredictionTensor
+
+# Groupings of the movers table, in print order
+DIMENSIONS = ["model", "program", "state", "income_band"]
+
+# Significance level of the "significant" column
+ALPHA = 0.05
+
+# Metrics where a decrease is an improvement
+LOWER_IS_BETTER = {"mae", "mape"}
+
+_erfc = np.vectorize(math.erfc, otypes=[float])
+
+
+@dataclass
+class RunDiff:
+    """Paired comparison of two runs.
+
+    ``cells`` has one row per cell in both runs: condition, model,
+    scenario_id, variable, ground_truth, prediction_a and prediction_b.
+    ``movers`` has one row per (condition, dimension, group, metric), with
+    n cells, the metric in each run (a, b), delta = b - a, its standard
+    error se, p_value and significant; the "overall" dimension has the
+    single group "all".
+    """
+
+    run_a: str
+    run_b: str
+    cells: pd.DataFrame
+    movers: pd.DataFrame
+
+    def top_movers(
+        self, metric: str = "within_10pct", dimension: str = "state", n: int = 10
+    ) -> pd.DataFrame:
+        """The n groups whose metric moved most, largest absolute delta first."""
+        movers = self.movers[
+            (self.movers["metric"] == metric) & (self.movers["dimension"] == dimension)
+        ]
+        order = movers["delta"].abs().sort_values(ascending=False, kind="stable")
+        return movers.loc[order.index].groupby("condition", sort=False).head(n)
+
+
+def _group_deltas(
+    count: np.ndarray, sum_a: np.ndarray, sum_b: np.ndarray
+) -> dict[str, np.ndarray]:
+    """Mean terms per group and the scenario-clustered error of their delta.
+
+    Args:
+        count, sum_a, sum_b: Cells and each run's summed terms, shaped
+            (group, scenario)
+    """
+    n = count.sum(axis=1)
+    clusters = (count > 0).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = sum_a.sum(axis=1) / n
+        b = sum_b.sum(axis=1) / n
+        delta = b - a
+
+        # Cluster-robust variance of the mean: residuals summed per
+        # scenario, with the small-sample factor c / (c - 1)
+        residuals = sum_b - sum_a - delta[:, None] * count
+        se = np.sqrt((residuals**2).sum(axis=1) / n**2 * clusters / (clusters - 1))
+        z = np.abs(delta) / se
+    # With no spread, any nonzero delta is significant
+    p_value = np.where(se > 0, _erfc(z / math.sqrt(2)), np.where(delta == 0, 1.0, 0.0))
+    p_value = np.where(clusters > 1, p_value, np.nan)
+    return {
+        "n": n.astype(np.int64),
+        "a": a,
+        "b": b,
+        "delta": delta,
+        "se": se,
+        "p_value": p_value,
+    }
+
+
+def _by_label(codes: np.ndarray, n_groups: int, per_scenario: np.ndarray):
+    """Per-scenario sums placed in their group's row; -1 codes are dropped."""
+    grouped = np.zeros((*per_scenario.shape[:-1], n_groups, len(codes)))
+    known = np.flatnonzero(codes >= 0)
+    grouped[..., codes[known], known] = per_scenario[..., known]
+    return grouped
+
+
+def paired_movers(
+    tensor_a: PredictionTensor,
+    tensor_b: PredictionTensor,
+    manifest: pd.DataFrame,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Cells and movers of one condition, for tensors on the same axes.
+
+    Args:
+        tensor_a, tensor_b: The condition in each run
+        manifest: Scenario manifest indexed by scenario_id, with the
+            state and income_band columns
+
+    Returns:
+        (cells, movers) as in RunDiff, without the condition column
+    """
+    truth = tensor_a.ground_truth[None]
+    common = tensor_a.mask & tensor_b.mask & ~np.isnan(truth)
+    common &= ~np.isnan(tensor_a.predictions) & ~np.isnan(tensor_b.predictions)
+    m, s, v = np.nonzero(common)
+    y_true = tensor_a.ground_truth[s, v]
+    scored = [
+        score_arrays(
+            tensor.models,
+            tensor.variables,
+            tensor.scenarios,
+            m,
+            s,
+            v,
+            tensor.predictions[m, s, v].astype(float),
+            y_true,
+        )
+        for tensor in (tensor_a, tensor_b)
+    ]
+
+    cells = pd.DataFrame(
+        {
+            "model": pd.Categorical.from_codes(m, tensor_a.models),
+            "scenario_id": pd.Categorical.from_codes(s, tensor_a.scenarios),
+            "variable": pd.Categorical.from_codes(v, tensor_a.variables),
+            "ground_truth": y_true,
+            "prediction_a": tensor_a.predictions[m, s, v],
+            "prediction_b": tensor_b.predictions[m, s, v],
+        }
+    )
+
+    manifest = manifest.reindex(tensor_a.scenarios)
+    labels = {}
+    for column in ["state", "income_band"]:
+        codes, uniques = pd.factorize(manifest[column], sort=True)
+        labels[column] = (codes, pd.Index(uniques))
+
+    frames = []
+    for k, metric in enumerate(METRICS):
+        # Dense (model, scenario, variable) terms of the cells counting
+        # towards the metric, so each dimension is a sum over axes
+        keep = scored[0].mask[:, k]
+        cell = (m[keep], s[keep], v[keep])
+        count = np.zeros(common.shape)
+        count[cell] = 1
+        sums = np.zeros((2, *common.shape))
+        for i in range(2):
+            sums[i][cell] = scored[i].terms[keep, k]
+
+        per_scenario = count.sum(axis=(0, 2)), sums.sum(axis=(1, 3))
+        dimensions = {
+            "overall": (
+                pd.Index(["all"]),
+                per_scenario[0][None],
+                per_scenario[1][:, None],
+            ),
+            "model": (tensor_a.models, count.sum(axis=2), sums.sum(axis=3)),
+            "program": (
+                tensor_a.variables,
+                count.sum(axis=0).T,
+                sums.sum(axis=1).transpose(0, 2, 1),
+            ),
+        }
+        for column, (codes, groups) in labels.items():
+            dimensions[column] = (
+                groups,
+                _by_label(codes, len(groups), per_scenario[0]),
+                _by_label(codes, len(groups), per_scenario[1]),
+            )
+
+        for dimension, (groups, n, totals) in dimensions.items():
+            stats = _group_deltas(n, totals[0], totals[1])
+            frame = pd.DataFrame({"group": groups.astype(str), **stats})
+            frames.append(
+                frame[frame["n"] > 0].assign(dimension=dimension, metric=metric)
+            )
+    movers = pd.concat(frames, ignore_index=True)
+    movers["significant"] = movers["p_value"] < ALPHA
+    columns = ["dimension", "group", "metric", "n", "a", "b", "delta", "se"]
+    return cells, movers[[*columns, "p_value", "significant"]]
+
+
+def diff_runs(
+    ground_truth: pd.DataFrame,
+    run_a: pd.DataFrame,
+    run_b: pd.DataFrame,
+    scenarios: list[Scenario] | None = None,
+    names: tuple[str, str] = ("a", "b"),
+) -> RunDiff:
+    """Compare two runs cell by cell.
+
+    Args:
+        ground_truth: DataFrame with columns [scenario_id, variable, value]
+        run_a, run_b: Predictions with columns [condition, model,
+            scenario_id, variable, prediction], as read from the store
+        scenarios: Scenario manifest for the state and income band
+            dimensions (defaults to generate_scenarios())
+        names: Labels of the two runs
+
+    Returns:
+        RunDiff over the conditions and models present in both runs
+    """
+    if scenarios is None:
+        scenarios = generate_scenarios()
+    manifest = pd.DataFrame([scenario.to_manifest_row() for scenario in scenarios])
+    manifest = manifest.set_index("scenario_id")
+    conditions = sorted(
+        set(pd.Index(run_a["condition"].unique()).astype(str))
+        & set(pd.Index(run_b["condition"].unique()).astype(str))
+    )
+    cells, movers = [], []
+    for condition in conditions:
+        a = run_a[run_a["condition"] == condition]
+        b = run_b[run_b["condition"] == condition]
+        models = sorted(
+            set(pd.Index(a["model"].unique()).astype(str))
+            & set(pd.Index(b["model"].unique()).astype(str))
+        )
+        condition_cells, condition_movers = paired_movers(
+            PredictionTensor.from_frames(ground_truth, a, models),
+            PredictionTensor.from_frames(ground_truth, b, models),
+            manifest,
+        )
+        cells.append(condition_cells.assign(condition=condition))
+        movers.append(condition_movers.assign(condition=condition))
+
+    if not cells:
+        raise ValueError(f"Runs {names[0]} and {names[1]} share no condition")
+    cells = pd.concat(cells, ignore_index=True)
+    movers = pd.concat(movers, ignore_index=True)
+    return RunDiff(
+        run_a=names[0],
+        run_b=names[1],
+        cells=cells[["condition", *cells.columns[:-1]]],
+        movers=movers[["condition", *movers.columns[:-1]]],
+    )
@@ -0,0 +1,205 @@
+"""PolicyEngine-US access, imported on first use.
+
+Importing policyengine_us builds the whole tax-benefit system, which takes
+tens of seconds, so simulations are constructed through here rather than
+importing the package at module level.
+
+For repeated runs the system can be kept warm in a local daemon
+(``policybench engine serve``). It listens on a Unix socket and answers
+one newline-delimited JSON request per connection, forking a worker per
+request so concurrent callers do not queue behind each other.
+``calculate`` uses the daemon whenever its socket accepts connections and
+falls back to an in-process simulation otherwise, or when the daemon does
+not answer within REQUEST_TIMEOUT. The daemon and its clients find the
+socket at $POLICYBENCH_ENGINE_SOCKET, or SOCKET_PATH if that is unset.
+
+Batched marginal tax rates (``ground_truth.calculate_marginal_tax_rates``)
+need per-person arrays, which the daemon's protocol does not return, so
+they always run in-process.
+"""
+
+import gc
+import json
+import os
+import signal
+import socket
+import socketserver
+from pathlib import Path
+
+from policybench.config import TAX_YEAR
+
+SOCKET_PATH = ".policybench_engine.sock"
+
+# Environment variable overriding SOCKET_PATH, for the daemon and clients
+SOCKET_ENV = "POLICYBENCH_ENGINE_SOCKET"
+
+# Households simulated when the daemon starts, before it accepts requests
+WARM_HOUSEHOLDS = 3
+
+# Seconds to wait for the daemon before computing in-process instead; a
+# warm household takes a few seconds
+REQUEST_TIMEOUT = 60.0
+
+
+def Simulation(*args, **kwargs):
+    """policyengine_us.Simulation, importing the package on the first call."""
+    from policyengine_us import Simulation
+
+    return Simulation(*args, **kwargs)
+
+
+def simulate(situation: dict, variables: list[str], year: int = TAX_YEAR) -> dict:
+    """Compute variables for one household in this process.
+
+    Values are summed over the variable's entities, as ground truth is.
+    """
+    sim = Simulation(situation=situation)
+    return {v: float(sim.calculate(v, year).sum()) for v in variables}
+
+
+def default_socket_path() -> str:
+    """The daemon's socket: $POLICYBENCH_ENGINE_SOCKET, else SOCKET_PATH."""
+    return os.environ.get(SOCKET_ENV) or SOCKET_PATH
+
+
+def _request(
+    payload: dict,
+    socket_path: str | Path,
+    timeout: float = REQUEST_TIMEOUT,
+) -> dict:
+    """Send one request to the daemon and return its decoded response.
+
+    Raises TimeoutError (an OSError) if the daemon takes over timeout seconds.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        with sock.makefile("rwb") as stream:
+            stream.write(json.dumps(payload).encode() + b"\n")
+            stream.flush()
+            line = stream.readline()
+    if not line:
+        raise ConnectionError("PolicyEngine daemon closed the connection")
+    return json.loads(line)
+
+
+def calculate(
+    situation: dict,
+    variables: list[str],
+    year: int = TAX_YEAR,
+    socket_path: str | Path | None = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> dict[str, float]:
+    """Compute variables for one household, on the daemon if it is running.
+
+    Returns:
+        Mapping of variable to value. Simulation errors on the daemon are
+        raised here as RuntimeError with PolicyEngine's message.
+    """
+    socket_path = socket_path or default_socket_path()
+    if Path(socket_path).exists():
+        try:
+            response = _request(
+                {"situation": situation, "variables": variables, "year": year},
+                socket_path,
+                timeout,
+            )
+        except OSError:
+            pass  # Stale socket from a daemon that is gone, or a timeout
+        else:
+            if "error" in response:
+                raise RuntimeError(response["error"])
+            return response["values"]
+    return simulate(situation, variables, year)
+
+
+def daemon_pid(socket_path: str | Path | None = None) -> int | None:
+    """Process id of the running daemon, or None if none is reachable."""
+    socket_path = socket_path or default_socket_path()
+    if not Path(socket_path).exists():
+        return None
+    try:
+        return _request({"command": "ping"}, socket_path)["pid"]
+    except OSError:
+        return None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        request = json.loads(line)
+        if request.get("command") == "ping":
+            response = {"pid": self.server.pid}
+        else:
+            try:
+                values = simulate(
+                    request["situation"],
+                    request["variables"],
+                    request.get("year", TAX_YEAR),
+                )
+                response = {"values": values}
+            except Exception as e:
+                response = {"error": str(e)}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class _Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    def __init__(self, socket_path: str | Path):
+        super().__init__(str(socket_path), _Handler)
+        self.pid = os.getpid()
+
+
+def make_server(socket_path: str | Path | None = None) -> _Server:
+    """Bind the daemon's socket, replacing a stale one."""
+    socket_path = socket_path or default_socket_path()
+    if daemon_pid(socket_path) is not None:
+        raise RuntimeError(f"A PolicyEngine daemon is already serving {socket_path}")
+    Path(socket_path).unlink(missing_ok=True)
+    return _Server(socket_path)
+
+
+def serve(socket_path: str | Path | None = None, warm: bool = True):
+    """Run the daemon in the foreground until interrupted or stopped.
+
+    With ``warm``, a few households are simulated for every program before
+    accepting requests, so lazily loaded parameters are loaded once in the
+    parent and shared with every forked worker. A single household leaves
+    workers about twice as slow as a fully warm process.
+    """
+    if warm:
+        from policybench.config import PROGRAMS
+        from policybench.scenarios import generate_scenarios
+
+        for scenario in generate_scenarios(n=WARM_HOUSEHOLDS):
+            simulate(scenario.to_pe_household(), PROGRAMS)
+
+    # Keep the loaded system out of garbage collection, so collections in
+    # workers neither scan it nor copy its pages
+    gc.freeze()
+
+    socket_path = socket_path or default_socket_path()
+    server = make_server(socket_path)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"PolicyEngine daemon listening on {socket_path} (pid {server.pid})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        Path(socket_path).unlink(missing_ok=True)
+
+
+def stop_daemon(socket_path: str | Path | None = None) -> bool:
+    """Stop the running daemon; returns whether one was running."""
+    pid = daemon_pid(socket_path)
+    if pid is None:
+        return False
+    os.kill(pid, signal.SIGTERM)
+    return True
@@ -2,13 +2,27 @@
 
 import re
 import time
-
-import pandas as pd
-from litellm import completion
-
-from policybench.config import MODELS, PROGRAMS
+from typing import TYPE_CHECKING
+
+from policybench.cassette import CassetteMiss
+from policybench.config import MODELS, PROGRAMS, STREAM_TOKEN_BUDGET
+from policybench.events import emit
+from policybench.hedge import active_hedger
+from policybench.llm import completion, single_flight, stream_completion
+from policybench.profiling import span
 from policybench.prompts import make_no_tools_prompt
 from policybench.scenarios import Scenario
+from policybench.scheduler import (
+    PROVIDER_CONCURRENCY,
+    Scheduler,
+    Task,
+    make_tasks,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from policybench.streaming import StreamingMetrics
 
 MAX_RETRIES = 5
 RETRY_BASE_DELAY = 2
@@ -29,31 +43,111 @@ def extract_number(text: str) -> float | None:
     return None
 
 
+# A line holding only a number: optional bold markers, sign, dollar sign,
+# percent sign and end-of-answer punctuation, then a line break. A list
+# marker ("1. First") or a year opening a sentence ("2025 EITC") does not
+# match, nor does a number within a line of working.
+_ANSWER_LINE = re.compile(
+    r"^[ \t]*(?:\*\*)?-?\$?-?\d[\d,]*(?:\.\d+)?%?(?:\*\*)?[.!]?[ \t]*\n",
+    re.MULTILINE,
+)
+
+
+def answer_complete(text: str) -> bool:
+    """Whether any finished line of text is only a number."""
+    return _ANSWER_LINE.search(text) is not None
+
+
+def stream_answer(
+    model_id: str,
+    messages: list[dict],
+    token_budget: int = STREAM_TOKEN_BUDGET,
+) -> tuple[str, float, bool]:
+    """Stream a response until it has an answer.
+
+    The stream is closed as soon as a line of the response is a number
+    and nothing else, whether it opens the response (the prompt asks for
+    nothing else) or follows some working, so any explanation after the
+    answer is never generated. A number that ends the response without a
+    line break ends with the stream. Any other response is read to its
+    end, up to token_budget chunks.
+
+    Returns:
+        (text read, seconds from the request until it was read, whether
+        the budget cut the response off)
+    """
+    start = time.perf_counter()
+    text = ""
+    truncated = False
+    stream = stream_completion(model=model_id, messages=messages, caching=True)
+    try:
+        for chunks, delta in enumerate(stream, 1):
+            text += delta
+            if answer_complete(text):
+                break
+            if chunks >= token_budget:
+                truncated = next(stream, None) is not None
+                break
+    finally:
+        stream.close()
+    return text, round(time.perf_counter() - start, 4), truncated
+
+
 def run_single_no_tools(
     scenario: Scenario,
     variable: str,
     model_id: str,
+    stream: bool = False,
+    token_budget: int = STREAM_TOKEN_BUDGET,
 ) -> dict:
     """Run a single scenario/variable without tools.
 
-    Returns dict with: prediction, raw_response
+    If stream is set, the response is streamed and read only up to its
+    answer (see stream_answer). A response cut off by token_budget has no
+    prediction: its last number would be an intermediate figure.
+
+    Returns dict with: prediction, raw_response, and time_to_answer if
+    streamed
     """
-    prompt = make_no_tools_prompt(scenario, variable)
+    with span("eval.prompt"):
+        prompt = make_no_tools_prompt(scenario, variable)
     messages = [{"role": "user", "content": prompt}]
 
     for attempt in range(MAX_RETRIES):
         try:
-            response = completion(model=model_id, messages=messages, caching=True)
-            content = response.choices[0].message.content
+            timing = {}
+            truncated = False
+            with span("eval.completion"):
+                if stream:
+                    content, timing["time_to_answer"], truncated = stream_answer(
+                        model_id, messages, token_budget
+                    )
+                else:
+                    response = completion(
+                        model=model_id, messages=messages, caching=True
+                    )
+                    content = response.choices[0].message.content
+            with span("eval.parse"):
+                prediction = None if truncated else extract_number(content)
             return {
-                "prediction": extract_number(content),
+                "prediction": prediction,
                 "raw_response": content,
+                **timing,
             }
+        except CassetteMiss:
+            raise
         except Exception as e:
             if attempt == MAX_RETRIES - 1:
                 raise
             delay = RETRY_BASE_DELAY * (2**attempt)
             print(f"  Retry {attempt + 1}: {e!r:.60s}... {delay}s")
+            emit(
+                "retry",
+                model=model_id,
+                attempt=attempt + 1,
+                delay=delay,
+                error=repr(e)[:200],
+            )
             time.sleep(delay)
     return {"prediction": None, "raw_response": None}  # unreachable
 
@@ -63,42 +157,99 @@ def run_no_tools_eval(
     models: dict[str, str] | None = None,
     programs: list[str] | None = None,
     output_path: str | None = None,
-) -> pd.DataFrame:
+    live: "StreamingMetrics | None" = None,
+    concurrency: int = PROVIDER_CONCURRENCY,
+    stream: bool = False,
+    token_budget: int = STREAM_TOKEN_BUDGET,
+) -> "pd.DataFrame":
     """Run the AI-alone evaluation across all models.
 
+    Tasks from different providers are interleaved (see
+    policybench.scheduler), starting at ``concurrency`` requests in flight
+    per provider and adapting to each provider's rate limits and latency;
+    rows are returned in model, scenario, variable order.
+
     If output_path is provided, saves incrementally every 100 rows.
+    If live is provided, it is updated with every prediction and its
+    per-model summary is printed with each progress line.
+    If stream is set, responses are streamed and closed once they hold an
+    answer or after token_budget chunks.
 
     Returns DataFrame with columns:
-        model, scenario_id, variable, prediction, raw_response
+        model, scenario_id, variable, prediction, raw_response, and
+        time_to_answer if streamed
     """
+    import pandas as pd
+
     if models is None:
         models = MODELS
     if programs is None:
         programs = PROGRAMS
 
-    all_rows = []
-    total = len(models) * len(scenarios) * len(programs)
+    tasks = make_tasks(models, scenarios, programs)
+    position = {id(task): i for i, task in enumerate(tasks)}
+    # Rows in model-major order, whatever order tasks finish in
+    rows: list[dict | None] = [None] * len(tasks)
+    total = len(tasks)
     done = 0
-
-    for model_name, model_id in models.items():
-        for scenario in scenarios:
-            for variable in programs:
-                result = run_single_no_tools(scenario, variable, model_id)
-                all_rows.append(
-                    {
-                        "model": model_name,
-                        "scenario_id": scenario.id,
-                        "variable": variable,
-                        **result,
-                    }
-                )
-                done += 1
-                if done % 100 == 0:
-                    print(f"  Progress: {done}/{total} ({done * 100 // total}%)")
-                    if output_path:
-                        pd.DataFrame(all_rows).to_csv(output_path, index=False)
-
-    df = pd.DataFrame(all_rows)
+    coalesced_before = single_flight.coalesced
+    emit("run_start", condition="no_tools", total=total)
+
+    def run(task: Task) -> dict:
+        return run_single_no_tools(
+            task.scenario, task.variable, task.model_id, stream, token_budget
+        )
+
+    scheduler = Scheduler(concurrency)
+    for task, result in scheduler.run(tasks, run):
+        rows[position[id(task)]] = {
+            "model": task.model_name,
+            "scenario_id": task.scenario.id,
+            "variable": task.variable,
+            **result,
+        }
+        if live is not None:
+            live.update(
+                task.model_name, task.scenario.id, task.variable, result["prediction"]
+            )
+        emit(
+            "task_end",
+            condition="no_tools",
+            model=task.model_name,
+            scenario_id=task.scenario.id,
+            variable=task.variable,
+            ok=result["prediction"] is not None,
+        )
+        done += 1
+        if done % 100 == 0:
+            print(
+                f"  Progress: {done}/{total} ({done * 100 // total}%)"
+                f" [concurrency {scheduler.describe()}]"
+            )
+            if live is not None:
+                print(live.render())
+            if output_path:
+                finished = [row for row in rows if row is not None]
+                with span("eval.csv_write"):
+                    pd.DataFrame(finished).to_csv(output_path, index=False)
+                emit("checkpoint", path=output_path, rows=len(finished))
+
+    if live is not None:
+        print(live.render())
+
+    df = pd.DataFrame(rows)
     if output_path:
-        df.to_csv(output_path, index=False)
+        with span("eval.csv_write"):
+            df.to_csv(output_path, index=False)
+        emit("checkpoint", path=output_path, rows=len(df))
+    coalesced = single_flight.coalesced - coalesced_before
+    if coalesced:
+        print(f"  Coalesced {coalesced} identical in-flight requests")
+    hedger = active_hedger()
+    if hedger is not None:
+        print(
+            f"  Hedged {hedger.hedges}/{hedger.requests} requests; "
+            f"{hedger.wins} hedges answered first"
+        )
+    emit("run_end", condition="no_tools", done=done, coalesced=coalesced)
     return df
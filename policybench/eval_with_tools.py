@@ -1,27 +1,44 @@
 """AI-with-tools evaluation using LiteLLM."""
 
 import json
+import multiprocessing
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING
 
-import pandas as pd
-from litellm import completion
-from policyengine_us import Simulation
-
+from policybench.cassette import CassetteMiss
 from policybench.config import MODELS, PE_TOOL_DEFINITION, PROGRAMS, TAX_YEAR
+from policybench.engine import calculate, daemon_pid
 from policybench.eval_no_tools import extract_number
+from policybench.events import emit
+from policybench.hedge import active_hedger
+from policybench.llm import completion, single_flight
+from policybench.profiling import span
 from policybench.prompts import make_with_tools_prompt
 from policybench.scenarios import Scenario
+from policybench.scheduler import (
+    PROVIDER_CONCURRENCY,
+    Scheduler,
+    Task,
+    make_tasks,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from policybench.shortcut import GroundTruthIndex
+    from policybench.streaming import StreamingMetrics
 
 MAX_RETRIES = 5
 RETRY_BASE_DELAY = 2
 
 
-def handle_tool_call(tool_call, fallback_household: dict | None = None) -> str:
-    """Execute a PolicyEngine tool call and return the result.
+# Simulations run at once for the tool calls of one assistant turn
+TOOL_CALL_WORKERS = 8
 
-    If the model omits the household arg, uses fallback_household.
-    Catches PE simulation errors and returns them so the model can retry.
-    """
+
+def _parse_tool_call(tool_call, fallback_household: dict | None):
+    """(household, variable, year) for a tool call, or its error result."""
     try:
         args = json.loads(tool_call.function.arguments)
     except json.JSONDecodeError as e:
@@ -35,25 +52,153 @@ def handle_tool_call(tool_call, fallback_household: dict | None = None) -> str:
         return json.dumps({"error": "No household provided"})
     if variable is None:
         return json.dumps({"error": "No variable provided"})
+    if not isinstance(variable, str):
+        return json.dumps({"error": "variable must be a string"})
+    return household_json, variable, year
+
+
+def _simulate(
+    household: dict, variables: list[str], year
+) -> tuple[dict[str, str], list[dict]]:
+    """Result JSON per variable, from one simulation where possible.
 
+    A simulation fails as a whole if any variable is invalid, so a failed
+    multi-variable simulation is retried one variable at a time to give
+    each call its own result or error.
+
+    Returns:
+        (results, tool_call event fields), the events left to the caller
+        to emit, since this may run in a worker process
+    """
+    start = time.perf_counter()
     try:
-        sim = Simulation(situation=household_json)
-        result = float(sim.calculate(variable, year).sum())
-        return json.dumps({"result": result})
+        values = calculate(household, variables, year)
     except Exception as e:
-        return json.dumps({"error": str(e)[:500]})
+        if len(variables) > 1:
+            results, events = {}, []
+            for variable in variables:
+                variable_results, variable_events = _simulate(
+                    household, [variable], year
+                )
+                results.update(variable_results)
+                events.extend(variable_events)
+            return results, events
+        seconds = round(time.perf_counter() - start, 4)
+        event = {"variable": variables[0], "seconds": seconds, "ok": False}
+        return {variables[0]: json.dumps({"error": str(e)[:500]})}, [event]
+    seconds = round(time.perf_counter() - start, 4)
+    events = [{"variable": v, "seconds": seconds, "ok": True} for v in variables]
+    return {v: json.dumps({"result": values[v]}) for v in variables}, events
+
+
+def _simulate_groups(groups: list[tuple]) -> list[tuple[dict, list[dict]]]:
+    """_simulate for each (household, variables, year) group, concurrently.
+
+    With the engine daemon running, threads only wait on its forked
+    workers. Otherwise PolicyEngine runs in this process, where the GIL
+    would serialize threads, so groups go to forked worker processes;
+    they inherit PolicyEngine already imported and any patched state.
+    """
+    if len(groups) < 2:
+        return [_simulate(*group) for group in groups]
+    workers = min(TOOL_CALL_WORKERS, len(groups))
+    if daemon_pid() is not None:
+        executor = ThreadPoolExecutor(max_workers=workers)
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("fork")
+        )
+    with executor:
+        return list(executor.map(_simulate, *zip(*groups)))
+
+
+@span("eval.tool_call")
+def handle_tool_calls(
+    tool_calls: list,
+    fallback_household: dict | None = None,
+    shortcut: "GroundTruthIndex | None" = None,
+) -> list[str]:
+    """Execute one assistant turn's PolicyEngine tool calls.
+
+    If the model omits the household arg, uses fallback_household.
+    If shortcut is given, calls on a benchmark household are answered from
+    its precomputed ground truth instead of a simulation. The remaining
+    calls are grouped by household and year, each group computing all its
+    variables in one simulation, and the groups run concurrently (see
+    _simulate_groups).
+    Catches PE simulation errors and returns them so the model can retry.
+
+    Returns:
+        Result JSON for each tool call, in the order of tool_calls
+    """
+    results: list[str | None] = [None] * len(tool_calls)
+    # (household JSON, year) -> (household, year, {variable: call indexes})
+    groups: dict[tuple[str, str], tuple[dict, object, dict[str, list[int]]]] = {}
+    for i, tool_call in enumerate(tool_calls):
+        parsed = _parse_tool_call(tool_call, fallback_household)
+        if isinstance(parsed, str):
+            results[i] = parsed
+            continue
+        household, variable, year = parsed
+        if shortcut is not None:
+            start = time.perf_counter()
+            value = shortcut.lookup(household, variable, year)
+            if value is not None:
+                seconds = round(time.perf_counter() - start, 4)
+                emit(
+                    "tool_call",
+                    variable=variable,
+                    seconds=seconds,
+                    ok=True,
+                    shortcut=True,
+                )
+                results[i] = json.dumps({"result": value})
+                continue
+        key = (json.dumps(household, sort_keys=True), str(year))
+        group = groups.setdefault(key, (household, year, {}))
+        group[2].setdefault(variable, []).append(i)
+
+    outcomes = _simulate_groups(
+        [(household, list(calls), year) for household, year, calls in groups.values()]
+    )
+    for (_, _, calls), (group_results, events) in zip(groups.values(), outcomes):
+        for event in events:
+            emit("tool_call", **event)
+        for variable, indexes in calls.items():
+            for i in indexes:
+                results[i] = group_results[variable]
+    return results
+
+
+def handle_tool_call(
+    tool_call,
+    fallback_household: dict | None = None,
+    shortcut: "GroundTruthIndex | None" = None,
+) -> str:
+    """Execute a single PolicyEngine tool call and return the result."""
+    return handle_tool_calls([tool_call], fallback_household, shortcut)[0]
 
 
 def _completion_with_retry(**kwargs):
     """Call litellm.completion with exponential backoff retry."""
     for attempt in range(MAX_RETRIES):
         try:
-            return completion(**kwargs)
+            with span("eval.completion"):
+                return completion(**kwargs)
+        except CassetteMiss:
+            raise
         except Exception as e:
             if attempt == MAX_RETRIES - 1:
                 raise
             delay = RETRY_BASE_DELAY * (2**attempt)
             print(f"  Retry {attempt + 1}: {e!r:.60s}... {delay}s")
+            emit(
+                "retry",
+                model=kwargs.get("model"),
+                attempt=attempt + 1,
+                delay=delay,
+                error=repr(e)[:200],
+            )
             time.sleep(delay)
 
 
@@ -61,12 +206,15 @@ def run_single_with_tools(
     scenario: Scenario,
     variable: str,
     model_id: str,
+    shortcut: "GroundTruthIndex | None" = None,
 ) -> dict:
     """Run a single scenario/variable with tool access.
 
-    Returns dict with: prediction, used_tool, tool_calls, raw_response
+    Returns dict with: prediction, used_tool, tool_calls, tool_rounds
+    (assistant turns that made tool calls)
     """
-    prompt = make_with_tools_prompt(scenario, variable)
+    with span("eval.prompt"):
+        prompt = make_with_tools_prompt(scenario, variable)
 
     messages = [{"role": "user", "content": prompt}]
     response = _completion_with_retry(
@@ -81,6 +229,7 @@ def run_single_with_tools(
     used_tool = False
     prediction = None
     tool_call_count = 0
+    tool_rounds = 0
 
     # Handle tool calls (may need multiple rounds)
     last_tool_result = None
@@ -91,14 +240,17 @@ def run_single_with_tools(
 
         used_tool = True
         tool_call_count += len(message.tool_calls)
+        tool_rounds += 1
 
         # Add assistant message with tool calls
         messages.append(message.model_dump())
 
-        # Process each tool call
+        # Execute the turn's tool calls; results keep the call order
         fallback_hh = scenario.to_pe_household()
-        for tc in message.tool_calls:
-            result = handle_tool_call(tc, fallback_household=fallback_hh)
+        results = handle_tool_calls(
+            message.tool_calls, fallback_household=fallback_hh, shortcut=shortcut
+        )
+        for tc, result in zip(message.tool_calls, results):
             # Track last successful tool result
             try:
                 result_data = json.loads(result)
@@ -129,12 +281,14 @@ def run_single_with_tools(
     if last_tool_result is not None:
         prediction = last_tool_result
     elif message.content:
-        prediction = extract_number(message.content)
+        with span("eval.parse"):
+            prediction = extract_number(message.content)
 
     return {
         "prediction": prediction,
         "used_tool": used_tool,
         "tool_calls": tool_call_count,
+        "tool_rounds": tool_rounds,
     }
 
 
@@ -143,46 +297,123 @@ def run_with_tools_eval(
     models: dict[str, str] | None = None,
     programs: list[str] | None = None,
     output_path: str | None = None,
-) -> pd.DataFrame:
+    live: "StreamingMetrics | None" = None,
+    concurrency: int = PROVIDER_CONCURRENCY,
+    shortcut: "GroundTruthIndex | None" = None,
+) -> "pd.DataFrame":
     """Run the AI-with-tools evaluation across all models.
 
+    Tasks from different providers are interleaved (see
+    policybench.scheduler), starting at ``concurrency`` requests in flight
+    per provider and adapting to each provider's rate limits and latency;
+    rows are returned in model, scenario, variable order.
+
     If output_path is provided, saves incrementally every 100 rows.
+    If shortcut is provided, tool calls on the scenario households are
+    answered from ground truth, and the share answered is printed.
 
     Returns DataFrame with columns:
-        model, scenario_id, variable, prediction, used_tool, tool_calls
+        model, scenario_id, variable, prediction, used_tool, tool_calls,
+        tool_rounds
     """
+    import pandas as pd
+
     if models is None:
         models = MODELS
     if programs is None:
         programs = PROGRAMS
 
-    all_rows = []
-    total = len(models) * len(scenarios) * len(programs)
+    tasks = make_tasks(models, scenarios, programs)
+    position = {id(task): i for i, task in enumerate(tasks)}
+    # Rows in model-major order, whatever order tasks finish in
+    rows: list[dict | None] = [None] * len(tasks)
+    total = len(tasks)
     done = 0
+    coalesced_before = single_flight.coalesced
+    emit("run_start", condition="with_tools", total=total)
 
-    for model_name, model_id in models.items():
-        for scenario in scenarios:
-            for variable in programs:
-                try:
-                    result = run_single_with_tools(scenario, variable, model_id)
-                except Exception as e:
-                    print(f"  ERROR: {scenario.id}/{variable}: {e!r:.60s}")
-                    result = {"prediction": None, "used_tool": False, "tool_calls": 0}
-                all_rows.append(
-                    {
-                        "model": model_name,
-                        "scenario_id": scenario.id,
-                        "variable": variable,
-                        **result,
-                    }
-                )
-                done += 1
-                if done % 10 == 0:
-                    print(f"  Progress: {done}/{total} ({done * 100 // total}%)")
-                    if output_path:
-                        pd.DataFrame(all_rows).to_csv(output_path, index=False)
+    def run(task: Task) -> dict:
+        try:
+            return run_single_with_tools(
+                task.scenario, task.variable, task.model_id, shortcut
+            )
+        except CassetteMiss:
+            raise
+        except Exception as e:
+            scenario_id, variable = task.scenario.id, task.variable
+            print(f"  ERROR: {scenario_id}/{variable}: {e!r:.60s}")
+            emit(
+                "error",
+                condition="with_tools",
+                model=task.model_name,
+                scenario_id=scenario_id,
+                variable=variable,
+                error=repr(e)[:200],
+            )
+            return {
+                "prediction": None,
+                "used_tool": False,
+                "tool_calls": 0,
+                "tool_rounds": 0,
+            }
 
-    df = pd.DataFrame(all_rows)
+    scheduler = Scheduler(concurrency)
+    for task, result in scheduler.run(tasks, run):
+        rows[position[id(task)]] = {
+            "model": task.model_name,
+            "scenario_id": task.scenario.id,
+            "variable": task.variable,
+            **result,
+        }
+        if live is not None:
+            live.update(
+                task.model_name, task.scenario.id, task.variable, result["prediction"]
+            )
+        emit(
+            "task_end",
+            condition="with_tools",
+            model=task.model_name,
+            scenario_id=task.scenario.id,
+            variable=task.variable,
+            ok=result["prediction"] is not None,
+        )
+        done += 1
+        if done % 10 == 0:
+            print(
+                f"  Progress: {done}/{total} ({done * 100 // total}%)"
+                f" [concurrency {scheduler.describe()}]"
+            )
+            if live is not None:
+                print(live.render())
+            if output_path:
+                finished = [row for row in rows if row is not None]
+                with span("eval.csv_write"):
+                    pd.DataFrame(finished).to_csv(output_path, index=False)
+                emit("checkpoint", path=output_path, rows=len(finished))
+
+    if live is not None:
+        print(live.render())
+    if shortcut is not None:
+        lookups = shortcut.hits + shortcut.misses
+        print(
+            f"  Ground-truth shortcut: {shortcut.hits}/{lookups} tool calls "
+            f"({shortcut.rate:.1%}) answered without a simulation"
+        )
+        emit("shortcut", hits=shortcut.hits, lookups=lookups)
+
+    df = pd.DataFrame(rows)
     if output_path:
-        df.to_csv(output_path, index=False)
+        with span("eval.csv_write"):
+            df.to_csv(output_path, index=False)
+        emit("checkpoint", path=output_path, rows=len(df))
+    coalesced = single_flight.coalesced - coalesced_before
+    if coalesced:
+        print(f"  Coalesced {coalesced} identical in-flight requests")
+    hedger = active_hedger()
+    if hedger is not None:
+        print(
+            f"  Hedged {hedger.hedges}/{hedger.requests} requests; "
+            f"{hedger.wins} hedges answered first"
+        )
+    emit("run_end", condition="with_tools", done=done, coalesced=coalesced)
     return df
@@ -0,0 +1,234 @@
+"""Structured event log and Prometheus textfile metrics for long runs.
+
+``emit(event, **fields)`` appends one JSON object per line to the event
+log, with a Unix timestamp ``ts`` and the event name. Events:
+
+- run_start (condition, total) and run_end (condition, done, coalesced)
+- request_start, request_end (seconds, cache_hit, token usage) and
+  request_error (seconds, error, status), all with model and tools;
+  streamed requests end with first_text_seconds and stopped_early too
+- retry (model, attempt, delay, error)
+- coalesced (model) when a request shares an identical one in flight
+- hedge (model, after) when a slow request gets a duplicate
+- tool_call (variable, seconds, ok, and shortcut if answered from ground
+  truth) and shortcut (hits, lookups) at the end of a with-tools run
+- task_end (condition, model, scenario_id, variable, ok)
+- error (condition, model, scenario_id, variable, error)
+- checkpoint (path, rows)
+- concurrency (provider, limit, reason) when a provider's adaptive limit
+  changes
+
+With a metrics path, the same events feed counters and gauges written in
+the Prometheus text format, for node_exporter's textfile collector: the
+file is replaced atomically at most every METRICS_INTERVAL seconds and at
+every checkpoint and run end. ``policybench_last_event_timestamp_seconds``
+lets alerts catch stalled runs.
+
+Nothing is written until ``enable_event_log()`` is called. In-process
+consumers, such as the scheduler's adaptive concurrency limits, subscribe
+with ``add_listener``.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+
+EVENT_LOG_PATH = "results/events.jsonl"
+
+# Seconds between rewrites of the metrics file
+METRICS_INTERVAL = 5.0
+
+# Exported metrics: name -> (type, help)
+METRICS = {
+    "requests_total": ("counter", "Finished LLM requests."),
+    "request_errors_total": ("counter", "Failed LLM requests."),
+    "retries_total": ("counter", "LLM request retries."),
+    "coalesced_requests_total": (
+        "counter",
+        "LLM requests answered by an identical one in flight.",
+    ),
+    "hedges_total": ("counter", "Slow LLM requests sent a second time."),
+    "requests_in_flight": ("gauge", "LLM requests in flight."),
+    "error_rate": ("gauge", "Failed share of finished LLM requests."),
+    "tool_calls_total": ("counter", "PolicyEngine tool calls."),
+    "tool_errors_total": ("counter", "Failed PolicyEngine tool calls."),
+    "tool_shortcuts_total": ("counter", "Tool calls answered from ground truth."),
+    "tasks_done": ("gauge", "Finished (model, scenario, variable) tasks."),
+    "tasks_total": ("gauge", "Tasks in the runs started so far."),
+    "throughput_tasks_per_second": ("gauge", "Tasks finished per second."),
+    "eta_seconds": ("gauge", "Estimated seconds until the runs finish."),
+    "concurrency_limit": ("gauge", "Adaptive in-flight limit per provider."),
+    "last_event_timestamp_seconds": ("gauge", "Unix time of the latest event."),
+}
+
+# Reentrant so listeners can emit events of their own
+_lock = threading.RLock()
+_log = None
+_metrics: "RunMetrics | None" = None
+_listeners: list[Callable[[dict], None]] = []
+
+
+class RunMetrics:
+    """Counters and gauges derived from the event stream."""
+
+    def __init__(self, path: str | Path, interval: float = METRICS_INTERVAL):
+        self.path = Path(path)
+        self.interval = interval
+        self.requests = Counter()
+        self.request_errors = Counter()
+        self.retries = Counter()
+        self.coalesced = Counter()
+        self.hedges = Counter()
+        self.limits: dict[str, int] = {}
+        self.tool_calls = 0
+        self.tool_errors = 0
+        self.tool_shortcuts = 0
+        self.in_flight = 0
+        self.tasks_total = 0
+        self.tasks_done = 0
+        self.started: float | None = None
+        self.last_event = 0.0
+        self._written = 0.0
+
+    def update(self, record: dict):
+        event = record["event"]
+        self.last_event = record["ts"]
+        if event == "run_start":
+            if self.started is None:
+                self.started = record["ts"]
+            self.tasks_total += record.get("total", 0)
+        elif event == "request_start":
+            self.in_flight += 1
+        elif event in ("request_end", "request_error"):
+            self.in_flight -= 1
+            self.requests[record.get("model")] += 1
+            if event == "request_error":
+                self.request_errors[record.get("model")] += 1
+        elif event == "retry":
+            self.retries[record.get("model")] += 1
+        elif event == "coalesced":
+            self.coalesced[record.get("model")] += 1
+        elif event == "hedge":
+            self.hedges[record.get("model")] += 1
+        elif event == "tool_call":
+            self.tool_calls += 1
+            self.tool_errors += not record.get("ok", True)
+            self.tool_shortcuts += bool(record.get("shortcut"))
+        elif event == "task_end":
+            self.tasks_done += 1
+        elif event == "concurrency":
+            self.limits[record["provider"]] = record["limit"]
+
+        if (
+            event in ("checkpoint", "run_end")
+            or record["ts"] - self._written >= self.interval
+        ):
+            self.write(record["ts"])
+
+    def throughput(self, now: float) -> float:
+        """Tasks per second since the first run started."""
+        if self.started is None or now <= self.started:
+            return 0.0
+        return self.tasks_done / (now - self.started)
+
+    def render(self, now: float) -> str:
+        requests = sum(self.requests.values())
+        errors = sum(self.request_errors.values())
+        rate = self.throughput(now)
+        remaining = self.tasks_total - self.tasks_done
+        eta = remaining / rate if rate else float("nan")
+
+        def by(label: str, values: dict) -> list[tuple[str, float]]:
+            return [(f'{{{label}="{k}"}}', n) for k, n in sorted(values.items())]
+
+        def scalar(value: float) -> list[tuple[str, float]]:
+            return [("", value)]
+
+        samples = {
+            "requests_total": by("model", self.requests),
+            "request_errors_total": by("model", self.request_errors),
+            "retries_total": by("model", self.retries),
+            "coalesced_requests_total": by("model", self.coalesced),
+            "hedges_total": by("model", self.hedges),
+            "requests_in_flight": scalar(self.in_flight),
+            "error_rate": scalar(errors / requests if requests else 0.0),
+            "tool_calls_total": scalar(self.tool_calls),
+            "tool_errors_total": scalar(self.tool_errors),
+            "tool_shortcuts_total": scalar(self.tool_shortcuts),
+            "tasks_done": scalar(self.tasks_done),
+            "tasks_total": scalar(self.tasks_total),
+            "throughput_tasks_per_second": scalar(rate),
+            "eta_seconds": scalar(eta),
+            "concurrency_limit": by("provider", self.limits),
+            "last_event_timestamp_seconds": scalar(self.last_event),
+        }
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            lines.append(f"# HELP policybench_{name} {help_text}")
+            lines.append(f"# TYPE policybench_{name} {kind}")
+            for labels, value in samples[name]:
+                value = "NaN" if value != value else f"{value:g}"
+                lines.append(f"policybench_{name}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, now: float):
+        """Replace the metrics file atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(self.render(now))
+        os.replace(tmp, self.path)
+        self._written = now
+
+
+def enable_event_log(
+    path: str | Path = EVENT_LOG_PATH,
+    metrics_path: str | Path | None = None,
+):
+    """Append events to path and, optionally, export metrics to metrics_path."""
+    global _log, _metrics
+    disable_event_log()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _log = path.open("a", buffering=1)
+    _metrics = RunMetrics(metrics_path) if metrics_path is not None else None
+
+
+def disable_event_log():
+    """Stop recording events, closing the log."""
+    global _log, _metrics
+    if _log is not None:
+        _log.close()
+    _log = None
+    _metrics = None
+
+
+def add_listener(listener: Callable[[dict], None]):
+    """Call listener with every event record, logged or not."""
+    with _lock:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[dict], None]):
+    with _lock:
+        _listeners.remove(listener)
+
+
+def emit(event: str, **fields):
+    """Record one event; a no-op unless the event log or a listener is on.
+
+    Listeners are called one at a time, in the emitting thread.
+    """
+    if _log is None and not _listeners:
+        return
+    record = {"ts": round(time.time(), 4), "event": event, **fields}
+    with _lock:
+        if _log is not None:
+            _log.write(json.dumps(record, default=str) + "\n")
+        if _metrics is not None:
+            _metrics.update(record)
+        for listener in _listeners:
+            listener(record)
@@ -0,0 +1,228 @@
+"""Export precomputed, chunked JSON for the web app.
+
+The app only downloads aggregates whose size depends on the number of
+models and programs, never on the number of observations:
+
+    manifest.json        models, programs and the example chunk count
+    summary.json         per-model stats and overall headline numbers
+    programs.json        per-(program, model) stats
+    examples/NNN.json    example scenarios, ranked, EXAMPLE_CHUNK_SIZE each
+
+Example chunks are fetched lazily as the reader asks for more.
+"""
+
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from policybench.analysis import compare_conditions
+from policybench.config import BINARY_PROGRAMS, PROGRAMS, RATE_PROGRAMS
+from policybench.prompts import VARIABLE_DESCRIPTIONS, describe_household
+from policybench.scenarios import Scenario
+from policybench.tensor import PredictionTensor
+
+APP_DATA_DIR = "app/public/data"
+
+EXAMPLE_CHUNK_SIZE = 4
+MAX_EXAMPLES = 40
+
+
+def _clean(value, digits: int):
+    """Round for compact JSON; NaN becomes null."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return round(float(value), digits) if digits else int(round(float(value)))
+
+
+def model_stats(no_tools: pd.DataFrame, with_tools: pd.DataFrame) -> list[dict]:
+    """Per-model MAE and % within 10% for both conditions."""
+    comparison = compare_conditions(no_tools, with_tools)
+    return [
+        {
+            "model": row.model,
+            "mae_no_tools": _clean(row.no_tools_mae, 0),
+            "mae_with_tools": _clean(row.with_tools_mae, 0),
+            "pct_within_10_no_tools": _clean(100 * row.no_tools_within_10pct, 1),
+            "pct_within_10_with_tools": _clean(100 * row.with_tools_within_10pct, 1),
+        }
+        for row in comparison.itertuples()
+    ]
+
+
+def program_stats(no_tools: pd.DataFrame, with_tools: pd.DataFrame) -> list[dict]:
+    """Per-(program, model) MAE and % within 10% for both conditions.
+
+    Binary programs have no within-10% figure; it is exported as null.
+    """
+    merged = no_tools.merge(
+        with_tools,
+        on=["model", "variable"],
+        how="outer",
+        suffixes=("_no_tools", "_with_tools"),
+    )
+    order = {program: i for i, program in enumerate(PROGRAMS)}
+    merged = merged.assign(order=merged["variable"].map(order)).sort_values(
+        ["model", "order", "variable"]
+    )
+    return [
+        {
+            "program": row.variable,
+            "model": row.model,
+            "mae_no_tools": _clean(row.mae_no_tools, 2),
+            "mae_with_tools": _clean(row.mae_with_tools, 2),
+            "pct_within_10_no_tools": _clean(100 * row.within_10pct_no_tools, 1),
+            "pct_within_10_with_tools": _clean(100 * row.within_10pct_with_tools, 1),
+        }
+        for row in merged.itertuples()
+    ]
+
+
+def example_scenarios(
+    no_tools: PredictionTensor,
+    with_tools: PredictionTensor,
+    scenarios: list[Scenario],
+    limit: int = MAX_EXAMPLES,
+) -> list[dict]:
+    """Dollar-valued cases where AI alone missed most and tools got it right.
+
+    Ranked by absolute error without tools, ties broken by model, scenario
+    and variable, one example per scenario. Both tensors must share their
+    axes, as export_app_data builds them.
+    """
+    truth = no_tools.ground_truth[None]
+    valid = no_tools.mask & with_tools.mask & ~np.isnan(truth)
+    valid &= ~np.isnan(no_tools.predictions) & ~np.isnan(with_tools.predictions)
+    dollar = ~np.isin(no_tools.variables, BINARY_PROGRAMS + RATE_PROGRAMS)
+    exact = np.abs(with_tools.predictions - truth) <= 1.0
+    m, s, v = np.nonzero(valid & exact & dollar)
+    error = np.abs(no_tools.predictions[m, s, v] - truth[0, s, v])
+
+    # Models and variables are sorted; scenarios follow the ground truth
+    scenario_rank = no_tools.scenarios.argsort().argsort()
+    order = np.lexsort((v, scenario_rank[s], m, -error))
+    _, first = np.unique(s[order], return_index=True)
+    order = order[np.sort(first)][:limit]
+
+    by_id = {scenario.id: scenario for scenario in scenarios}
+    examples = []
+    for i in order:
+        scenario_id = no_tools.scenarios[s[i]]
+        variable = no_tools.variables[v[i]]
+        scenario = by_id.get(scenario_id)
+        if scenario is None:
+            continue
+        label = VARIABLE_DESCRIPTIONS.get(variable, variable)
+        examples.append(
+            {
+                "scenario_id": scenario_id,
+                "description": describe_household(scenario),
+                "variable": variable,
+                "variable_label": label[:1].upper() + label[1:],
+                "ground_truth": _clean(truth[0, s[i], v[i]], 0),
+                "no_tools_prediction": _clean(
+                    no_tools.predictions[m[i], s[i], v[i]], 0
+                ),
+                "with_tools_prediction": _clean(
+                    with_tools.predictions[m[i], s[i], v[i]], 0
+                ),
+                "model": no_tools.models[m[i]],
+            }
+        )
+    return examples
+
+
+def _write_json(path: Path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, separators=(",", ":")))
+
+
+def export_app_data(
+    ground_truth: pd.DataFrame,
+    no_tools: pd.DataFrame,
+    with_tools: pd.DataFrame,
+    scenarios: list[Scenario],
+    output_dir: str | Path = APP_DATA_DIR,
+) -> list[Path]:
+    """Compute the app's aggregates and write them as chunked JSON.
+
+    Args:
+        ground_truth: DataFrame with columns [scenario_id, variable, value]
+        no_tools, with_tools: Predictions for each condition
+        scenarios: Scenarios the predictions refer to (for descriptions)
+        output_dir: Directory served by the app, replaced on every export
+
+    Returns:
+        Paths of the written files
+    """
+    models = sorted(
+        set(no_tools["model"].astype(str)) | set(with_tools["model"].astype(str))
+    )
+    return export_app_tensors(
+        PredictionTensor.from_frames(ground_truth, no_tools, models),
+        PredictionTensor.from_frames(ground_truth, with_tools, models),
+        scenarios,
+        output_dir,
+    )
+
+
+def export_app_tensors(
+    no_tools: PredictionTensor,
+    with_tools: PredictionTensor,
+    scenarios: list[Scenario],
+    output_dir: str | Path = APP_DATA_DIR,
+) -> list[Path]:
+    """export_app_data for prediction tensors sharing their axes."""
+    if not no_tools.models.equals(with_tools.models):
+        models = no_tools.models.union(with_tools.models)
+        no_tools = no_tools.select_models(models)
+        with_tools = with_tools.select_models(models)
+    nt_metrics = no_tools.metrics()
+    wt_metrics = with_tools.metrics()
+    models = model_stats(nt_metrics, wt_metrics)
+    examples = example_scenarios(no_tools, with_tools, scenarios)
+    chunks = [
+        examples[i : i + EXAMPLE_CHUNK_SIZE]
+        for i in range(0, len(examples), EXAMPLE_CHUNK_SIZE)
+    ]
+
+    def overall(field: str, digits: int):
+        values = [m[field] for m in models if m[field] is not None]
+        return _clean(sum(values) / len(values), digits) if values else None
+
+    output_dir = Path(output_dir)
+    for stale in output_dir.glob("examples/*.json"):
+        stale.unlink()
+
+    payloads = {
+        "manifest.json": {
+            "models": [m["model"] for m in models],
+            "programs": [p for p in PROGRAMS if p in set(nt_metrics["variable"])],
+            "example_chunks": len(chunks),
+            "observations": {
+                "no_tools": int(nt_metrics["n"].sum()),
+                "with_tools": int(wt_metrics["n"].sum()),
+            },
+        },
+        "summary.json": {
+            "model_stats": models,
+            "overall": {
+                "pct_within_10_no_tools": overall("pct_within_10_no_tools", 1),
+                "pct_within_10_with_tools": overall("pct_within_10_with_tools", 1),
+                "mae_no_tools": overall("mae_no_tools", 0),
+                "mae_with_tools": overall("mae_with_tools", 0),
+            },
+        },
+        "programs.json": program_stats(nt_metrics, wt_metrics),
+    }
+    for i, chunk in enumerate(chunks):
+        payloads[f"examples/{i:03d}.json"] = chunk
+
+    paths = []
+    for name, payload in payloads.items():
+        path = output_dir / name
+        _write_json(path, payload)
+        paths.append(path)
+    return paths
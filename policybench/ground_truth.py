@@ -1,11 +1,15 @@
 """Ground truth calculations using PolicyEngine-US."""
 
-import pandas as pd
-from policyengine_us import Simulation
+from typing import TYPE_CHECKING
 
 from policybench.config import PROGRAMS, TAX_YEAR
+from policybench.engine import Simulation, calculate
+from policybench.profiling import span
 from policybench.scenarios import Scenario
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def calculate_single(
     scenario: Scenario,
@@ -14,30 +18,116 @@ def calculate_single(
 ) -> float:
     """Calculate a single variable for a scenario using PE-US."""
     household = scenario.to_pe_household()
-    sim = Simulation(situation=household)
-    result = sim.calculate(variable, year)
-    # Most variables return arrays; take first element or sum as appropriate
-    value = float(result.sum())
-    return value
+    # Most variables return arrays; values are summed over entities
+    with span("ground_truth.simulation"):
+        return calculate(household, [variable], year)[variable]
+
+
+def _combined_situation(scenarios: list[Scenario]) -> tuple[dict, list[int]]:
+    """One situation holding every scenario's household, and the index of
+    each person's scenario in PolicyEngine's person order.
+
+    A single-household situation leaves marital units to PolicyEngine,
+    which puts everyone in one unit. Each household gets that unit
+    explicitly here, or every person in the batch would share one.
+    """
+    situation = {
+        "people": {},
+        "tax_units": {},
+        "spm_units": {},
+        "families": {},
+        "marital_units": {},
+        "households": {},
+    }
+    person_scenario = []
+    for index, scenario in enumerate(scenarios):
+        household = scenario.to_pe_household()
+        for name, person in household["people"].items():
+            situation["people"][f"{scenario.id}/{name}"] = person
+            person_scenario.append(index)
+        for group_key, groups in household.items():
+            if group_key == "people":
+                continue
+            for name, group in groups.items():
+                members = [f"{scenario.id}/{m}" for m in group["members"]]
+                situation[group_key][f"{scenario.id}/{name}"] = {
+                    **group,
+                    "members": members,
+                }
+        situation["marital_units"][f"{scenario.id}/marital_unit"] = {
+            "members": [f"{scenario.id}/{name}" for name in household["people"]]
+        }
+    return situation, person_scenario
+
+
+def calculate_marginal_tax_rates(
+    scenarios: list[Scenario],
+    year: int = TAX_YEAR,
+) -> dict[str, float]:
+    """marginal_tax_rate for every scenario in one batched pass.
+
+    PolicyEngine-US computes a household's marginal tax rate by re-running
+    the whole tax-benefit chain with one adult's earnings raised, for each
+    of the top ``simulation.marginal_tax_rate_adults`` earners. Done per
+    household that is the most expensive ground-truth variable. Here all
+    households share one simulation, so each of those re-runs is
+    vectorized over every household.
+
+    The variable is PolicyEngine-US's own, and per-person rates are summed
+    over each household's people as ``calculate_single`` sums them, so
+    values equal simulating each household alone and match what the
+    with-tools ``calculate_policy`` tool returns.
+
+    Returns:
+        Mapping of scenario id to marginal tax rate
+    """
+    import numpy as np
+
+    if not scenarios:
+        return {}
+    situation, person_scenario = _combined_situation(scenarios)
+
+    with span("ground_truth.marginal_tax_rate"):
+        rates = Simulation(situation=situation).calculate("marginal_tax_rate", year)
+
+    totals = np.bincount(person_scenario, weights=rates, minlength=len(scenarios))
+    return {scenario.id: float(total) for scenario, total in zip(scenarios, totals)}
 
 
 def calculate_ground_truth(
     scenarios: list[Scenario],
     programs: list[str] | None = None,
     year: int = TAX_YEAR,
-) -> pd.DataFrame:
+) -> "pd.DataFrame":
     """Calculate ground truth for all scenarios × programs.
 
+    marginal_tax_rate, if requested, comes from one batched pass over all
+    scenarios (see calculate_marginal_tax_rates); other variables are
+    simulated household by household.
+
     Returns a DataFrame with columns: scenario_id, variable, value
     """
+    import pandas as pd
+
     if programs is None:
         programs = PROGRAMS
 
+    per_household = [v for v in programs if v != "marginal_tax_rate"]
+    rates = {}
+    if "marginal_tax_rate" in programs:
+        rates = calculate_marginal_tax_rates(scenarios, year)
+
     rows = []
     for scenario in scenarios:
-        sim = Simulation(situation=scenario.to_pe_household())
+        values = {}
+        if per_household:
+            with span("ground_truth.simulation"):
+                values = calculate(scenario.to_pe_household(), per_household, year)
         for variable in programs:
-            value = float(sim.calculate(variable, year).sum())
+            if variable == "marginal_tax_rate":
+                value = rates[scenario.id]
+            else:
+                value = values[variable]
             rows.append(
                 {
                     "scenario_id": scenario.id,
@@ -0,0 +1,143 @@
+"""Hedged LLM requests against tail latency.
+
+A few slow completions dominate the end of a run. With hedging enabled,
+a completion still running after its model's PERCENTILE latency gets a
+duplicate request; whichever answers first is used and the other is
+cancelled. Only requests slower than nearly all others are duplicated,
+and BUDGET caps hedges at a share of all requests, so cost rises by at
+most that share.
+
+Latencies come from the uncached request_end events of policybench.events,
+over the last WINDOW requests per model. A model is not hedged until it
+has MIN_SAMPLES of them.
+
+A synchronous litellm call cannot be interrupted once it has started:
+the losing request is cancelled if it has not started, and otherwise
+left to finish in the background with its response discarded.
+"""
+
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from policybench.events import add_listener, emit, remove_listener
+
+# Latency percentile after which a request is hedged
+PERCENTILE = 0.95
+
+# Largest share of requests that may be hedged
+BUDGET = 0.05
+
+# Recent latencies kept per model, and the number needed before hedging
+WINDOW = 500
+MIN_SAMPLES = 20
+
+# Threads running hedged requests
+HEDGE_WORKERS = 256
+
+_hedger: "Hedger | None" = None
+
+
+class Hedger:
+    """Runs requests with a hedge after each model's latency percentile.
+
+    Args:
+        percentile: Latency percentile, per model, that triggers a hedge
+        budget: Largest share of requests that may be hedged
+    """
+
+    def __init__(self, percentile: float = PERCENTILE, budget: float = BUDGET):
+        if not 0 < percentile < 1:
+            raise ValueError(f"percentile must be between 0 and 1, got {percentile}")
+        if not 0 <= budget <= 1:
+            raise ValueError(f"budget must be from 0 to 1, got {budget}")
+        self.percentile = percentile
+        self.budget = budget
+        self.latencies: dict[str, deque[float]] = {}
+        self.requests = 0
+        self.hedges = 0
+        self.wins = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(HEDGE_WORKERS)
+
+    def observe(self, record: dict):
+        """Event listener collecting uncached latencies."""
+        if record["event"] != "request_end" or record.get("cache_hit"):
+            return
+        seconds = record.get("seconds")
+        if seconds is None:
+            return
+        with self._lock:
+            model = str(record.get("model"))
+            self.latencies.setdefault(model, deque(maxlen=WINDOW)).append(seconds)
+
+    def threshold(self, model: str) -> float | None:
+        """Seconds after which a request to model is hedged, if known."""
+        with self._lock:
+            samples = sorted(self.latencies.get(model, ()))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return samples[int(self.percentile * (len(samples) - 1))]
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.budget * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def call(self, model: str, fn: Callable[[], object]):
+        """fn(), hedged with a second fn() if the first runs long."""
+        with self._lock:
+            self.requests += 1
+        threshold = self.threshold(model)
+        if threshold is None:
+            return fn()
+
+        primary = self._executor.submit(fn)
+        done, _ = wait([primary], timeout=threshold)
+        if done or not self._take_budget():
+            return primary.result()
+
+        emit("hedge", model=model, after=round(threshold, 4))
+        backup = self._executor.submit(fn)
+        pending: set[Future] = {primary, backup}
+        error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    if future is backup:
+                        with self._lock:
+                            self.wins += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def enable_hedging(percentile: float = PERCENTILE, budget: float = BUDGET) -> Hedger:
+    """Hedge slow completions from now on."""
+    global _hedger
+    disable_hedging()
+    _hedger = Hedger(percentile, budget)
+    add_listener(_hedger.observe)
+    return _hedger
+
+
+def disable_hedging():
+    """Stop hedging."""
+    global _hedger
+    if _hedger is not None:
+        remove_listener(_hedger.observe)
+        _hedger.close()
+    _hedger = None
+
+
+def active_hedger() -> "Hedger | None":
+    return _hedger
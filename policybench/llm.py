@@ -0,0 +1,221 @@
+"""LiteLLM access, imported on first use.
+
+Importing litellm takes seconds (provider SDKs, the model cost map), so
+modules call ``completion`` from here rather than importing litellm at
+module level. Commands that never reach an LLM call never pay for it.
+
+Every call is recorded in the event log (see policybench.events) as
+request_start followed by request_end, with latency, cache hit and token
+usage, or request_error. ``policybench plan`` estimates later runs from
+the request_end records.
+
+Identical calls (same arguments: model, messages, tools, ...) that are in
+flight at the same time are coalesced: the first goes upstream, the others
+wait for it and get its response or exception. The disk cache only helps
+once a response is stored; this covers duplicate scenarios and shared
+first turns sent by concurrent workers. Waiting calls are counted in
+``single_flight.coalesced``, and each one answered is recorded as a
+coalesced event.
+
+With a cassette enabled (see policybench.cassette), responses are recorded
+as they arrive, or replayed from it without litellm and without events.
+
+``stream_completion`` yields a streamed response's text as it arrives,
+so callers can stop reading, and the provider can stop generating, once
+they have what they need. Streams are not coalesced.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+from policybench.cassette import Replayed, active_cassette
+from policybench.events import emit
+from policybench.hedge import active_hedger
+
+
+def _count(value) -> int | None:
+    return value if isinstance(value, int) else None
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Runs one call per key at a time, sharing its outcome with duplicates."""
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], object]) -> tuple[object, bool]:
+        """fn's result, and whether it came from a call already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+single_flight = SingleFlight()
+
+
+def request_key(kwargs: dict) -> str:
+    """Hash identifying a completion call by its arguments."""
+    payload = json.dumps(kwargs, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def completion(**kwargs):
+    """litellm.completion, importing litellm on the first call.
+
+    Coalesces with an identical call already in flight, if any, and is
+    hedged if hedging is enabled (see policybench.hedge).
+    """
+    hedger = active_hedger()
+
+    def call():
+        if hedger is None:
+            return _completion(**kwargs)
+        return hedger.call(kwargs.get("model"), lambda: _completion(**kwargs))
+
+    response, coalesced = single_flight.do(request_key(kwargs), call)
+    if coalesced:
+        emit("coalesced", model=kwargs.get("model"))
+    return response
+
+
+def _completion(**kwargs):
+    cassette = active_cassette()
+    if cassette is not None and cassette.mode == "replay":
+        return cassette.replay(request_key(kwargs), kwargs)
+
+    from litellm import completion
+
+    request = {"model": kwargs.get("model"), "tools": bool(kwargs.get("tools"))}
+    emit("request_start", **request)
+    start = time.perf_counter()
+    try:
+        response = completion(**kwargs)
+    except Exception as e:
+        seconds = round(time.perf_counter() - start, 4)
+        emit(
+            "request_error",
+            **request,
+            seconds=seconds,
+            error=repr(e)[:200],
+            status=getattr(e, "status_code", None),
+        )
+        raise
+
+    usage = getattr(response, "usage", None)
+    hidden = getattr(response, "_hidden_params", None)
+    cache_hit = hidden.get("cache_hit") if isinstance(hidden, dict) else None
+    emit(
+        "request_end",
+        **request,
+        seconds=round(time.perf_counter() - start, 4),
+        cache_hit=bool(cache_hit),
+        prompt_tokens=_count(getattr(usage, "prompt_tokens", None)),
+        completion_tokens=_count(getattr(usage, "completion_tokens", None)),
+    )
+    if cassette is not None:
+        cassette.record(request_key(kwargs), kwargs, response)
+    return response
+
+
+def _close(stream):
+    """Close a litellm stream's underlying HTTP response, if it has one."""
+    inner = getattr(stream, "completion_stream", None) or stream
+    close = getattr(inner, "close", None)
+    if callable(close):
+        close()
+
+
+def stream_completion(**kwargs) -> Iterator[str]:
+    """Text deltas of a streamed litellm.completion.
+
+    Closing the generator closes the stream. The request_end event comes
+    when the generator finishes or is closed, with the seconds to the
+    first text, streamed chunks as completion tokens, and whether the
+    caller stopped early. A cassette records the text read as a single
+    response and replays it as one delta.
+    """
+    kwargs = {**kwargs, "stream": True}
+    key = request_key(kwargs)
+    cassette = active_cassette()
+    if cassette is not None and cassette.mode == "replay":
+        yield cassette.replay(key, kwargs).choices[0].message.content or ""
+        return
+
+    from litellm import completion
+
+    request = {"model": kwargs.get("model"), "tools": bool(kwargs.get("tools"))}
+    emit("request_start", **request)
+    start = time.perf_counter()
+    parts = []
+    first_text = None
+    exhausted = failed = False
+    try:
+        stream = completion(**kwargs)
+        try:
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    if first_text is None:
+                        first_text = round(time.perf_counter() - start, 4)
+                    parts.append(delta)
+                    yield delta
+            exhausted = True
+        finally:
+            _close(stream)
+    except Exception as e:
+        failed = True
+        emit(
+            "request_error",
+            **request,
+            seconds=round(time.perf_counter() - start, 4),
+            error=repr(e)[:200],
+            status=getattr(e, "status_code", None),
+        )
+        raise
+    finally:
+        if not failed:
+            emit(
+                "request_end",
+                **request,
+                seconds=round(time.perf_counter() - start, 4),
+                first_text_seconds=first_text,
+                cache_hit=False,
+                completion_tokens=len(parts),
+                stopped_early=not exhausted,
+            )
+            if cassette is not None:
+                message = {"role": "assistant", "content": "".join(parts)}
+                cassette.record(
+                    key, kwargs, Replayed({"choices": [{"message": message}]})
+                )
@@ -0,0 +1,319 @@
+"""Stage-aware benchmark pipeline.
+
+``policybench run`` models the benchmark as a dependency graph:
+
+    ground_truth ──┐
+    no_tools ──────┼──> analyze
+    with_tools ────┘
+
+Each stage has a fingerprint: a hash of its inputs (scenario set, models,
+programs, rendered prompts, package versions) and of its dependencies'
+fingerprints. The fingerprint of every finished stage is recorded in
+``results/pipeline.json``; a stage whose outputs exist and whose
+fingerprint is unchanged is skipped. Stages whose dependencies are done
+run concurrently, so the three independent stages overlap.
+"""
+
+import dataclasses
+import hashlib
+import json
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+
+from policybench.config import (
+    ANALYSIS_DIR,
+    GROUND_TRUTH_PATH,
+    MODELS,
+    NO_TOOLS_PATH,
+    PE_TOOL_DEFINITION,
+    PROGRAMS,
+    TAX_YEAR,
+    WITH_TOOLS_PATH,
+)
+from policybench.profiling import span
+from policybench.scenarios import Scenario
+
+STATE_PATH = "results/pipeline.json"
+
+
+@dataclass
+class Stage:
+    """One step of the pipeline.
+
+    Attributes:
+        name: Stage name, referenced by other stages' deps
+        outputs: Files the stage writes; it reruns if any is missing
+        run: Callable doing the work
+        inputs: JSON-serializable values the outputs depend on
+        deps: Names of stages that must finish first
+    """
+
+    name: str
+    outputs: list[str]
+    run: Callable[[], object]
+    inputs: dict = field(default_factory=dict)
+    deps: list[str] = field(default_factory=list)
+
+
+def _digest(value) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _version(package: str) -> str | None:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _ordered(stages: list[Stage]) -> list[Stage]:
+    """Stages in dependency order; raises ValueError on unknown deps or cycles."""
+    by_name = {stage.name: stage for stage in stages}
+    ordered, visiting, done = [], set(), set()
+
+    def visit(stage: Stage):
+        if stage.name in done:
+            return
+        if stage.name in visiting:
+            raise ValueError(f"Dependency cycle through stage {stage.name!r}")
+        visiting.add(stage.name)
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise ValueError(f"Stage {stage.name!r} depends on unknown {dep!r}")
+            visit(by_name[dep])
+        visiting.discard(stage.name)
+        done.add(stage.name)
+        ordered.append(stage)
+
+    for stage in stages:
+        visit(stage)
+    return ordered
+
+
+def fingerprints(stages: list[Stage]) -> dict[str, str]:
+    """Fingerprint of each stage, covering its inputs and its dependencies."""
+    result = {}
+    for stage in _ordered(stages):
+        result[stage.name] = _digest(
+            {
+                "inputs": stage.inputs,
+                "deps": {dep: result[dep] for dep in stage.deps},
+            }
+        )
+    return result
+
+
+def load_state(path: str | Path = STATE_PATH) -> dict:
+    path = Path(path)
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _save_state(state: dict, path: str | Path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n")
+
+
+def plan(
+    stages: list[Stage],
+    state_path: str | Path = STATE_PATH,
+    force: bool = False,
+) -> dict[str, str]:
+    """Decide which stages are up to date.
+
+    Returns:
+        Mapping of stage name to "skip" or "run", in dependency order.
+        A stage runs if forced, if any output is missing, if its
+        fingerprint changed, or if one of its dependencies runs.
+    """
+    state = load_state(state_path)
+    prints = fingerprints(stages)
+    actions = {}
+    for stage in _ordered(stages):
+        current = (
+            not force
+            and state.get(stage.name, {}).get("fingerprint") == prints[stage.name]
+            and all(Path(output).exists() for output in stage.outputs)
+            and all(actions[dep] == "skip" for dep in stage.deps)
+        )
+        actions[stage.name] = "skip" if current else "run"
+    return actions
+
+
+def run_pipeline(
+    stages: list[Stage],
+    state_path: str | Path = STATE_PATH,
+    force: bool = False,
+    max_workers: int | None = None,
+) -> dict[str, str]:
+    """Run out-of-date stages, independent ones concurrently.
+
+    A stage's fingerprint is recorded as soon as it succeeds, so an
+    interrupted run resumes from the stages that did not finish.
+
+    Returns:
+        Mapping of stage name to "skipped", "ran", "failed", or "blocked"
+        (not run because a dependency failed)
+    """
+    by_name = {stage.name: stage for stage in _ordered(stages)}
+    prints = fingerprints(stages)
+    actions = plan(stages, state_path, force)
+    state = load_state(state_path)
+    status = {name: "skipped" for name, action in actions.items() if action == "skip"}
+    for name in status:
+        print(f"[{name}] up to date, skipping")
+
+    def execute(stage: Stage) -> float:
+        start = time.perf_counter()
+        for output in stage.outputs:
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+        with span(f"pipeline.{stage.name}"):
+            stage.run()
+        return time.perf_counter() - start
+
+    pending = {name for name, action in actions.items() if action == "run"}
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            for name in sorted(pending):
+                deps = [status.get(dep) for dep in by_name[name].deps]
+                if any(dep in ("failed", "blocked") for dep in deps):
+                    status[name] = "blocked"
+                    pending.discard(name)
+                    print(f"[{name}] blocked by a failed dependency")
+                elif all(dep in ("skipped", "ran") for dep in deps):
+                    print(f"[{name}] running")
+                    running[executor.submit(execute, by_name[name])] = name
+                    pending.discard(name)
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    status[name] = "failed"
+                    print(f"[{name}] failed: {e!r}")
+                    continue
+                status[name] = "ran"
+                state[name] = {
+                    "fingerprint": prints[name],
+                    "finished_at": datetime.now(timezone.utc).isoformat(),
+                    "seconds": round(seconds, 3),
+                }
+                _save_state(state, state_path)
+                print(f"[{name}] done in {seconds:.1f}s")
+    return {name: status[name] for name in by_name}
+
+
+def benchmark_stages(
+    scenarios: list[Scenario],
+    models: dict[str, str] | None = None,
+    programs: list[str] | None = None,
+) -> list[Stage]:
+    """The standard ground truth → evals → analysis pipeline."""
+    from policybench.prompts import make_no_tools_prompt, make_with_tools_prompt
+
+    if models is None:
+        models = MODELS
+    if programs is None:
+        programs = PROGRAMS
+
+    scenario_set = _digest([dataclasses.asdict(s) for s in scenarios])
+    versions = {
+        package: _version(package)
+        for package in ("policybench", "policyengine-us", "litellm")
+    }
+
+    def prompts(make_prompt) -> str:
+        return _digest([make_prompt(s, v) for s in scenarios for v in programs])
+
+    def ground_truth():
+        from policybench.ground_truth import calculate_ground_truth
+
+        calculate_ground_truth(scenarios, programs).to_csv(
+            GROUND_TRUTH_PATH, index=False
+        )
+
+    def no_tools():
+        from policybench.eval_no_tools import run_no_tools_eval
+
+        run_no_tools_eval(scenarios, models, programs, output_path=NO_TOOLS_PATH)
+
+    def with_tools():
+        from policybench.eval_with_tools import run_with_tools_eval
+
+        run_with_tools_eval(scenarios, models, programs, output_path=WITH_TOOLS_PATH)
+
+    analysis_outputs = [
+        f"{ANALYSIS_DIR}/no_tools_metrics.csv",
+        f"{ANALYSIS_DIR}/with_tools_metrics.csv",
+        f"{ANALYSIS_DIR}/comparison.csv",
+    ]
+
+    def analyze():
+        import pandas as pd
+
+        from policybench.analysis import compare_conditions, compute_metrics
+
+        gt = pd.read_csv(GROUND_TRUTH_PATH)
+        nt_metrics = compute_metrics(gt, pd.read_csv(NO_TOOLS_PATH))
+        wt_metrics = compute_metrics(gt, pd.read_csv(WITH_TOOLS_PATH))
+        comparison = compare_conditions(nt_metrics, wt_metrics)
+        for df, path in zip([nt_metrics, wt_metrics, comparison], analysis_outputs):
+            df.to_csv(path, index=False)
+        print(comparison.to_string(index=False))
+
+    return [
+        Stage(
+            "ground_truth",
+            [GROUND_TRUTH_PATH],
+            ground_truth,
+            inputs={
+                "scenarios": scenario_set,
+                "programs": programs,
+                "year": TAX_YEAR,
+                "policyengine-us": versions["policyengine-us"],
+            },
+        ),
+        Stage(
+            "no_tools",
+            [NO_TOOLS_PATH],
+            no_tools,
+            inputs={
+                "scenarios": scenario_set,
+                "models": models,
+                "programs": programs,
+                "prompts": prompts(make_no_tools_prompt),
+                "litellm": versions["litellm"],
+            },
+        ),
+        Stage(
+            "with_tools",
+            [WITH_TOOLS_PATH],
+            with_tools,
+            inputs={
+                "scenarios": scenario_set,
+                "models": models,
+                "programs": programs,
+                "prompts": prompts(make_with_tools_prompt),
+                "tool": PE_TOOL_DEFINITION,
+                "policyengine-us": versions["policyengine-us"],
+                "litellm": versions["litellm"],
+            },
+        ),
+        Stage(
+            "analyze",
+            analysis_outputs,
+            analyze,
+            inputs={"policybench": versions["policybench"]},
+            deps=["ground_truth", "no_tools", "with_tools"],
+        ),
+    ]
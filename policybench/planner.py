@@ -0,0 +1,259 @@
+"""Cost and wall-time estimates for a benchmark configuration.
+
+Everything here runs offline:
+
+- Prompts are rendered with prompts.py and tokenized with tiktoken's
+  o200k_base encoding; ``policybench plan`` points TIKTOKEN_CACHE_DIR at
+  the copy bundled with LiteLLM (``tiktoken_cache_dir``). Other
+  providers' tokenizers differ by a few percent.
+- Prices come from LiteLLM's bundled price list, with config.MODEL_PRICES
+  filling the gaps.
+- Latency, cache-hit rates and output lengths come from previous runs: the
+  event log's request_end records (see policybench.events) and the
+  predictions CSVs.
+  Models without history fall back to the DEFAULT_* constants.
+
+Cache hits are assumed free and instant. With-tools tasks take one extra
+completion per tool round; each round's input repeats the conversation so
+far plus the tool call and its result.
+"""
+
+import json
+from importlib.util import find_spec
+from pathlib import Path
+
+import pandas as pd
+
+from policybench.config import (
+    MODEL_PRICES,
+    MODELS,
+    NO_TOOLS_PATH,
+    PE_TOOL_DEFINITION,
+    PROGRAMS,
+    WITH_TOOLS_PATH,
+)
+from policybench.events import EVENT_LOG_PATH
+from policybench.prompts import make_no_tools_prompt, make_with_tools_prompt
+from policybench.scenarios import Scenario
+from policybench.scheduler import provider_of
+
+# Fallbacks for models without history
+DEFAULT_LATENCY = 5.0  # seconds per uncached completion
+DEFAULT_OUTPUT_TOKENS = 20
+DEFAULT_TOOL_ROUNDS = 1.0
+
+# Per-message chat formatting overhead, in tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# A tool result is a short JSON object such as {"result": 1234.5}
+TOOL_RESULT_TOKENS = 12
+
+# Warm PolicyEngine-US timings: every program for one household, and one
+# variable for one tool call
+HOUSEHOLD_SECONDS = 4.0
+TOOL_CALL_SECONDS = 1.0
+
+
+def _litellm_dir() -> Path | None:
+    spec = find_spec("litellm")
+    return Path(spec.origin).parent if spec and spec.origin else None
+
+
+def tiktoken_cache_dir() -> Path | None:
+    """LiteLLM's bundled tiktoken encodings, for TIKTOKEN_CACHE_DIR."""
+    litellm_dir = _litellm_dir()
+    if litellm_dir is None:
+        return None
+    return litellm_dir / "litellm_core_utils" / "tokenizers"
+
+
+def count_tokens(texts: list[str]) -> list[int]:
+    """Token counts with o200k_base, or about four characters per token
+    if tiktoken or the encoding is unavailable."""
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return [max(1, len(text) // 4) for text in texts]
+    return [len(tokens) for tokens in encoding.encode_batch(texts)]
+
+
+def model_prices(model_ids: list[str]) -> dict[str, tuple[float, float]]:
+    """USD per token (input, output) for each model; NaN if unknown."""
+    bundled = {}
+    litellm_dir = _litellm_dir()
+    if litellm_dir is not None:
+        path = litellm_dir / "model_prices_and_context_window_backup.json"
+        if path.exists():
+            bundled = json.loads(path.read_text())
+
+    prices = {}
+    for model_id in model_ids:
+        if model_id in MODEL_PRICES:
+            per_million = MODEL_PRICES[model_id]
+            prices[model_id] = (per_million[0] / 1e6, per_million[1] / 1e6)
+        elif "input_cost_per_token" in bundled.get(model_id, {}):
+            entry = bundled[model_id]
+            prices[model_id] = (
+                entry["input_cost_per_token"],
+                entry.get("output_cost_per_token", 0.0),
+            )
+        else:
+            prices[model_id] = (float("nan"), float("nan"))
+    return prices
+
+
+def load_history(
+    models: dict[str, str] | None = None,
+    event_log: str | Path = EVENT_LOG_PATH,
+    no_tools_path: str | Path = NO_TOOLS_PATH,
+    with_tools_path: str | Path = WITH_TOOLS_PATH,
+) -> dict[tuple[str, bool], dict]:
+    """Per (model name, tools) history from previous runs.
+
+    Returns:
+        Mapping to dicts with any of: latency (median seconds of uncached
+        calls), cache_hit_rate, output_tokens (mean per completion), and
+        for tools=True, tool_rounds (mean assistant turns with tool calls
+        per task, from results that record them)
+    """
+    if models is None:
+        models = MODELS
+    names = {model_id: name for name, model_id in models.items()}
+    history: dict[tuple[str, bool], dict] = {}
+
+    if Path(no_tools_path).exists():
+        df = pd.read_csv(no_tools_path, usecols=["model", "raw_response"])
+        df = df[df["model"].isin(models)].dropna()
+        if not df.empty:
+            tokens = count_tokens(df["raw_response"].astype(str).tolist())
+            means = df.assign(tokens=tokens).groupby("model")["tokens"].mean()
+            for name, mean in means.items():
+                history.setdefault((name, False), {})["output_tokens"] = mean
+
+    if Path(with_tools_path).exists():
+        df = pd.read_csv(with_tools_path)
+        # One turn may make several tool calls; each turn is one request
+        if "tool_rounds" in df:
+            df = df[df["model"].isin(models)]
+            for name, rounds in df.groupby("model")["tool_rounds"].mean().items():
+                history.setdefault((name, True), {})["tool_rounds"] = float(rounds)
+
+    if Path(event_log).exists():
+        events = pd.read_json(event_log, lines=True)
+        if "model" not in events:
+            return history
+        calls = events[(events["event"] == "request_end") & events["model"].isin(names)]
+        for (model_id, tools), group in calls.groupby(["model", "tools"]):
+            entry = history.setdefault((names[model_id], bool(tools)), {})
+            entry["cache_hit_rate"] = float(group["cache_hit"].mean())
+            uncached = group.loc[~group["cache_hit"].astype(bool), "seconds"]
+            if not uncached.empty:
+                entry["latency"] = float(uncached.median())
+            completion_tokens = group.get("completion_tokens", pd.Series()).dropna()
+            if not tools and not completion_tokens.empty:
+                # Usage includes reasoning tokens, which raw responses omit
+                entry["output_tokens"] = float(completion_tokens.mean())
+    return history
+
+
+def plan_costs(
+    scenarios: list[Scenario],
+    models: dict[str, str] | None = None,
+    programs: list[str] | None = None,
+    concurrency: int = 1,
+    history: dict[tuple[str, bool], dict] | None = None,
+) -> pd.DataFrame:
+    """Estimate requests, tokens, simulations, cost and wall time.
+
+    Returns:
+        DataFrame with one row per (condition, model) plus a ground_truth
+        row: provider, requests, input_tokens, output_tokens,
+        cache_hit_rate, simulations, cost_usd, and hours with
+        ``concurrency`` of the model's requests in flight (ground truth
+        runs one household at a time). Providers run side by side, so a
+        condition takes as long as its slowest provider.
+    """
+    if models is None:
+        models = MODELS
+    if programs is None:
+        programs = PROGRAMS
+    if history is None:
+        history = load_history(models)
+
+    tasks = [(s, v) for s in scenarios for v in programs]
+    n_tasks = len(tasks)
+    no_tools_prompt = sum(
+        count_tokens([make_no_tools_prompt(s, v) for s, v in tasks])
+    ) / max(n_tasks, 1)
+    with_tools_prompt = sum(
+        count_tokens([make_with_tools_prompt(s, v) for s, v in tasks])
+    ) / max(n_tasks, 1)
+    tool_definition = count_tokens([json.dumps(PE_TOOL_DEFINITION)])[0]
+    households = count_tokens([json.dumps(s.to_pe_household()) for s in scenarios])
+    tool_call = sum(households) / max(len(households), 1) + MESSAGE_OVERHEAD_TOKENS
+
+    prices = model_prices(list(models.values()))
+    rows = []
+    for name, model_id in models.items():
+        input_price, output_price = prices[model_id]
+        for tools in (False, True):
+            past = history.get((name, tools), {})
+            answer = history.get((name, False), {}).get(
+                "output_tokens", DEFAULT_OUTPUT_TOKENS
+            )
+            cache_hit_rate = past.get("cache_hit_rate", 0.0)
+            latency = past.get("latency", DEFAULT_LATENCY)
+
+            if tools:
+                rounds = past.get("tool_rounds", DEFAULT_TOOL_ROUNDS)
+                first = with_tools_prompt + tool_definition + MESSAGE_OVERHEAD_TOKENS
+                # Request i resends the conversation plus i calls and results
+                step = tool_call + TOOL_RESULT_TOKENS + MESSAGE_OVERHEAD_TOKENS
+                per_task_input = (1 + rounds) * first + step * rounds * (1 + rounds) / 2
+                per_task_output = rounds * tool_call + answer
+                requests = n_tasks * (1 + rounds)
+                simulations = n_tasks * rounds
+            else:
+                per_task_input = no_tools_prompt + MESSAGE_OVERHEAD_TOKENS
+                per_task_output = answer
+                requests = n_tasks
+                simulations = 0
+
+            uncached = 1 - cache_hit_rate
+            seconds = (
+                requests * uncached * latency + simulations * TOOL_CALL_SECONDS
+            ) / concurrency
+            rows.append(
+                {
+                    "condition": "with_tools" if tools else "no_tools",
+                    "model": name,
+                    "provider": provider_of(model_id),
+                    "requests": round(requests),
+                    "input_tokens": round(n_tasks * per_task_input),
+                    "output_tokens": round(n_tasks * per_task_output),
+                    "cache_hit_rate": cache_hit_rate,
+                    "simulations": round(simulations),
+                    "cost_usd": n_tasks
+                    * uncached
+                    * (per_task_input * input_price + per_task_output * output_price),
+                    "hours": seconds / 3600,
+                }
+            )
+
+    rows.append(
+        {
+            "condition": "ground_truth",
+            "model": "-",
+            "provider": "-",
+            "requests": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_hit_rate": 0.0,
+            "simulations": len(scenarios),
+            "cost_usd": 0.0,
+            "hours": len(scenarios) * HOUSEHOLD_SECONDS / 3600,
+        }
+    )
+    return pd.DataFrame(rows).sort_values(["condition", "model"], ignore_index=True)
@@ -0,0 +1,161 @@
+"""Opt-in profiling: named spans plus a sampling profiler.
+
+Code marks stages with ``span``:
+
+    with span("ground_truth.simulation"):
+        ...
+
+Spans cost one global check while profiling is off. Under ``Profiler``
+(the CLI's ``--profile`` flag) each span's count and inclusive time are
+recorded, and a background thread samples every thread's Python stack.
+Samples are written in the folded-stack format read by flamegraph.pl,
+inferno and speedscope, with the active span names as the outermost
+frames, so time is attributed to stages as well as functions.
+
+Threads blocked waiting on locks, queues or selectors are not sampled.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ContextDecorator
+from pathlib import Path
+
+PROFILE_DIR = "results/profile"
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.005
+
+# Innermost frames of threads that are waiting rather than working
+_IDLE_FRAMES = {
+    ("threading", "wait"),
+    ("threading", "_wait_for_tstate_lock"),
+    ("queue", "get"),
+    ("selectors", "select"),
+    ("concurrent.futures.thread", "_worker"),
+}
+
+_enabled = False
+_lock = threading.Lock()
+# Active (span name, start time) pairs per thread id
+_active: dict[int, list[tuple[str, float]]] = {}
+# Span name -> [count, total seconds]
+_totals: dict[str, list] = {}
+
+
+class span(ContextDecorator):
+    """Attribute the enclosed time to a named stage; also a decorator."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        if _enabled:
+            stack = _active.setdefault(threading.get_ident(), [])
+            stack.append((self.name, time.perf_counter()))
+        return self
+
+    def __exit__(self, *exc):
+        if not _enabled:
+            return False
+        stack = _active.get(threading.get_ident())
+        if stack and stack[-1][0] == self.name:
+            name, start = stack.pop()
+            elapsed = time.perf_counter() - start
+            with _lock:
+                entry = _totals.setdefault(name, [0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed
+        return False
+
+
+def _frame_stack(frame) -> list[str]:
+    """Frames from outermost to innermost as module:function."""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+class Profiler:
+    """Profile everything run inside the ``with`` block.
+
+    On exit writes ``<name>.folded`` (sampled stacks) and
+    ``<name>.spans.tsv`` (count, total and mean time per span) to
+    output_dir, and prints the span table.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path = PROFILE_DIR,
+        name: str = "profile",
+        interval: float = SAMPLE_INTERVAL,
+    ):
+        self.output_dir = Path(output_dir)
+        self.name = name
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _sample(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                code = frame.f_code
+                if (frame.f_globals.get("__name__"), code.co_name) in _IDLE_FRAMES:
+                    continue
+                spans = [name for name, _ in _active.get(ident, [])]
+                self.samples[";".join(spans + _frame_stack(frame))] += 1
+
+    def __enter__(self):
+        global _enabled
+        _active.clear()
+        _totals.clear()
+        _enabled = True
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        global _enabled
+        wall = time.perf_counter() - self._start
+        self._stop.set()
+        self._thread.join()
+        _enabled = False
+        self.write(wall)
+        return False
+
+    def span_table(self, wall: float) -> list[tuple[str, int, float, float]]:
+        """(span, count, total seconds, mean ms), slowest first, plus total."""
+        rows = [
+            (name, count, total, 1000 * total / count)
+            for name, (count, total) in _totals.items()
+        ]
+        rows.sort(key=lambda row: -row[2])
+        return [("total", 1, wall, 1000 * wall), *rows]
+
+    def write(self, wall: float):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        folded = self.output_dir / f"{self.name}.folded"
+        folded.write_text(
+            "".join(f"{stack} {n}\n" for stack, n in sorted(self.samples.items()))
+        )
+        table = self.span_table(wall)
+        spans = self.output_dir / f"{self.name}.spans.tsv"
+        spans.write_text(
+            "span\tcount\ttotal_seconds\tmean_ms\n"
+            + "".join(f"{n}\t{c}\t{t:.4f}\t{m:.3f}\n" for n, c, t, m in table)
+        )
+
+        print(f"\n=== Profile ({sum(self.samples.values())} samples) ===")
+        for name, count, total, mean in table:
+            print(f"  {name:<28} {count:>8} {total:>10.3f}s {mean:>10.2f}ms")
+        print(f"  Flamegraph stacks: {folded}")
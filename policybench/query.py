@@ -0,0 +1,166 @@
+"""Embedded SQL over stored runs, powered by DuckDB.
+
+``connect()`` returns a DuckDB connection with these views:
+
+- ``predictions``: every row in the results store, with the partition keys
+  run, condition and model as columns
+- ``responses``: hash, text; the raw response behind each prediction's
+  response_hash
+- ``ground_truth``: scenario_id, variable, value
+- ``scenarios``: the scenario manifest (state, filing_status, num_adults,
+  num_children, total_income, income_band, year)
+- ``results``: predictions with a number joined to ground truth and the
+  manifest, with the per-row terms behind compute_metrics: abs_error,
+  rel_error (dollar variables only), and 0/1 columns correct (binary
+  variables only) and within_10pct (non-binary variables only), so
+  ``avg()`` and ``count(*)`` give each metric and its n
+
+DuckDB scans the Parquet partitions directly, reading only the columns
+and partitions a query touches.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from policybench.config import BINARY_PROGRAMS, GROUND_TRUTH_PATH, RATE_PROGRAMS
+from policybench.scenarios import Scenario, generate_scenarios
+from policybench.store import STORE_DIR
+
+_EMPTY_PREDICTIONS = """
+SELECT
+    NULL::VARCHAR AS scenario_id,
+    NULL::VARCHAR AS variable,
+    NULL::DOUBLE AS prediction,
+    NULL::VARCHAR AS response_hash,
+    NULL::BOOLEAN AS used_tool,
+    NULL::INTEGER AS tool_calls,
+    NULL::INTEGER AS tool_rounds,
+    NULL::DOUBLE AS time_to_answer,
+    NULL::VARCHAR AS run,
+    NULL::VARCHAR AS condition,
+    NULL::VARCHAR AS model
+WHERE false
+"""
+
+_RESULTS = """
+CREATE VIEW results AS
+SELECT
+    p.run,
+    p.condition,
+    p.model,
+    p.scenario_id,
+    p.variable,
+    p.prediction,
+    g.value AS ground_truth,
+    abs(p.prediction - g.value) AS abs_error,
+    CASE WHEN g.value <> 0 AND p.variable NOT IN ({binary}, {rate})
+        THEN abs((g.value - p.prediction) / g.value) END AS rel_error,
+    CASE WHEN p.variable IN ({binary})
+        THEN (round_even(p.prediction, 0) = round_even(g.value, 0))::DOUBLE
+        END AS correct,
+    CASE WHEN p.variable IN ({binary}) THEN NULL
+        WHEN g.value <> 0
+        THEN (abs((g.value - p.prediction) / g.value) <= 0.10)::DOUBLE
+        ELSE (abs(p.prediction) <= 1.0)::DOUBLE END AS within_10pct,
+    s.state,
+    s.filing_status,
+    s.num_adults,
+    s.num_children,
+    s.total_income,
+    s.income_band
+FROM predictions AS p
+JOIN ground_truth AS g
+    ON p.scenario_id = g.scenario_id AND p.variable = g.variable
+LEFT JOIN scenarios AS s
+    ON p.scenario_id = s.scenario_id
+WHERE p.prediction IS NOT NULL
+"""
+
+
+def _sql_string(value: str | Path) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def connect(
+    store_root: str | Path = STORE_DIR,
+    ground_truth_path: str | Path = GROUND_TRUTH_PATH,
+    scenarios: list[Scenario] | None = None,
+    database: str = ":memory:",
+):
+    """Open a DuckDB connection with the PolicyBench views defined.
+
+    Args:
+        store_root: Root of the results store (see policybench.store)
+        ground_truth_path: Ground truth CSV
+        scenarios: Scenarios for the manifest (defaults to generate_scenarios())
+        database: DuckDB database path; in-memory by default
+    """
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError(
+            "policybench query needs DuckDB: pip install 'policybench[query]'"
+        ) from e
+
+    if scenarios is None:
+        scenarios = generate_scenarios()
+
+    con = duckdb.connect(database)
+    predictions_dir = Path(store_root) / "predictions"
+    if any(predictions_dir.glob("**/*.parquet")):
+        pattern = _sql_string(predictions_dir / "**" / "*.parquet")
+        con.execute(
+            f"CREATE VIEW predictions AS SELECT * FROM read_parquet({pattern}, "
+            "hive_partitioning = true, union_by_name = true, hive_types = "
+            "{'run': VARCHAR, 'condition': VARCHAR, 'model': VARCHAR})"
+        )
+    else:
+        con.execute(f"CREATE VIEW predictions AS {_EMPTY_PREDICTIONS}")
+
+    blobs_dir = Path(store_root) / "blobs"
+    if any(blobs_dir.glob("*.parquet")):
+        pattern = _sql_string(blobs_dir / "*.parquet")
+        con.execute(f"CREATE VIEW responses AS SELECT * FROM read_parquet({pattern})")
+    else:
+        con.execute(
+            "CREATE VIEW responses AS "
+            "SELECT NULL::VARCHAR AS hash, NULL::VARCHAR AS text WHERE false"
+        )
+
+    con.execute(
+        "CREATE VIEW ground_truth AS SELECT * FROM read_csv("
+        f"{_sql_string(ground_truth_path)}, header = true, columns = "
+        "{'scenario_id': 'VARCHAR', 'variable': 'VARCHAR', 'value': 'DOUBLE'})"
+    )
+
+    manifest = pd.DataFrame([scenario.to_manifest_row() for scenario in scenarios])
+    con.register("scenario_manifest", manifest)
+    con.execute("CREATE TABLE scenarios AS SELECT * FROM scenario_manifest")
+    con.unregister("scenario_manifest")
+
+    con.execute(
+        _RESULTS.format(
+            binary=", ".join(map(_sql_string, BINARY_PROGRAMS)),
+            rate=", ".join(map(_sql_string, RATE_PROGRAMS)),
+        )
+    )
+    return con
+
+
+def query(sql: str, **connect_kwargs) -> pd.DataFrame:
+    """Run one SQL query against the PolicyBench views.
+
+    Example:
+        query('''
+            SELECT run, model, income_band, avg(within_10pct) AS within_10pct
+            FROM results
+            WHERE condition = 'no_tools'
+            GROUP BY ALL ORDER BY ALL
+        ''')
+    """
+    con = connect(**connect_kwargs)
+    try:
+        return con.execute(sql).df()
+    finally:
+        con.close()
@@ -5,6 +5,7 @@ from dataclasses import dataclass, field
 
 from policybench.config import (
     FILING_STATUSES,
+    INCOME_BANDS,
     INCOME_LEVELS,
     NUM_CHILDREN_OPTIONS,
     NUM_SCENARIOS,
@@ -12,6 +13,7 @@ from policybench.config import (
     STATES,
     TAX_YEAR,
 )
+from policybench.profiling import span
 
 
 @dataclass
@@ -46,6 +48,28 @@ class Scenario:
     def num_children(self) -> int:
         return len(self.children)
 
+    @property
+    def income_band(self) -> str:
+        """Label of the INCOME_BANDS bracket containing total income."""
+        label = INCOME_BANDS[0][0]
+        for band, lower in INCOME_BANDS:
+            if self.total_income >= lower:
+                label = band
+        return label
+
+    def to_manifest_row(self) -> dict:
+        """Flat description of the scenario for slicing results."""
+        return {
+            "scenario_id": self.id,
+            "state": self.state,
+            "filing_status": self.filing_status,
+            "num_adults": len(self.adults),
+            "num_children": self.num_children,
+            "total_income": self.total_income,
+            "income_band": self.income_band,
+            "year": self.year,
+        }
+
     def to_pe_household(self) -> dict:
         """Convert to PolicyEngine-US household JSON format."""
         people = {}
@@ -86,6 +110,7 @@ class Scenario:
         }
 
 
+@span("scenarios.generate")
 def generate_scenarios(n: int = NUM_SCENARIOS, seed: int = SEED) -> list[Scenario]:
     """Generate n household scenarios with deterministic randomness."""
     rng = random.Random(seed)
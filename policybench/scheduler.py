@@ -0,0 +1,267 @@
+"""Interleaved scheduling of evaluation tasks across providers.
+
+Each (model, scenario, variable) task goes to its provider's queue, and
+every provider has its own in-flight limit. A dispatcher keeps each
+provider at its limit, taking tasks round-robin across that provider's
+models, so a slow or rate-limited provider only delays its own tasks.
+Wall time approaches the slowest provider's alone, rather than the sum.
+
+Limits adapt per provider (AIMD, as in TCP congestion control). Every
+uncached completion that returns at a healthy latency adds 1/limit to the
+limit, about one more request in flight per round of requests. A 429,
+overload or timeout multiplies the limit by BACKOFF, at most once per
+round trip. Latency above LATENCY_TOLERANCE times the best seen so far
+holds the limit where it is. The signals are the request events of
+policybench.events, so retries inside a task count too.
+"""
+
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from policybench.events import add_listener, emit, remove_listener
+from policybench.scenarios import Scenario
+
+# Requests in flight per provider at the start of a run
+PROVIDER_CONCURRENCY = 4
+
+# Bounds of the adaptive limit
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 64
+
+# Multiplier applied to the limit on a 429, overload or timeout
+BACKOFF = 0.5
+
+# Latency above this multiple of the best smoothed latency stops growth
+LATENCY_TOLERANCE = 2.0
+
+# Weight of the newest sample in the smoothed latency
+LATENCY_SMOOTHING = 0.2
+
+# HTTP statuses meaning "slow down": rate limited, overloaded, unavailable
+_OVERLOAD_STATUSES = {429, 503, 529}
+
+# Model id prefixes of providers LiteLLM routes without a "provider/" prefix
+_PROVIDER_PREFIXES = {
+    "claude": "anthropic",
+    "gpt": "openai",
+    "o1": "openai",
+    "o3": "openai",
+    "o4": "openai",
+}
+
+
+@dataclass(frozen=True)
+class Task:
+    """One prediction to make."""
+
+    model_name: str
+    model_id: str
+    scenario: Scenario
+    variable: str
+
+
+def provider_of(model_id: str) -> str:
+    """The provider serving a LiteLLM model id."""
+    if "/" in model_id:
+        return model_id.split("/", 1)[0]
+    for prefix, provider in _PROVIDER_PREFIXES.items():
+        if model_id.startswith(prefix):
+            return provider
+    return model_id
+
+
+def make_tasks(
+    models: dict[str, str],
+    scenarios: list[Scenario],
+    programs: list[str],
+) -> list[Task]:
+    """Every task, in model-major order."""
+    return [
+        Task(model_name, model_id, scenario, variable)
+        for model_name, model_id in models.items()
+        for scenario in scenarios
+        for variable in programs
+    ]
+
+
+def is_overload(record: dict) -> bool:
+    """Whether a request_error event means the provider wants less load."""
+    if record.get("status") in _OVERLOAD_STATUSES:
+        return True
+    error = record.get("error") or ""
+    return any(name in error for name in ("RateLimit", "Timeout", "Overloaded"))
+
+
+class AIMDLimit:
+    """Additive-increase, multiplicative-decrease in-flight limit."""
+
+    def __init__(
+        self,
+        initial: int = PROVIDER_CONCURRENCY,
+        minimum: int = MIN_CONCURRENCY,
+        maximum: int = MAX_CONCURRENCY,
+    ):
+        self.minimum = minimum
+        self.maximum = max(maximum, initial)
+        self.value = float(initial)
+        self.latency: float | None = None
+        self.best_latency: float | None = None
+        self._last_backoff = float("-inf")
+
+    @property
+    def limit(self) -> int:
+        return int(self.value)
+
+    def success(self, seconds: float):
+        """An uncached request finished in seconds."""
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += LATENCY_SMOOTHING * (seconds - self.latency)
+        if self.best_latency is None or self.latency < self.best_latency:
+            self.best_latency = self.latency
+        if self.latency <= LATENCY_TOLERANCE * self.best_latency:
+            self.value = min(self.maximum, self.value + 1 / self.value)
+
+    def overload(self, now: float):
+        """The provider rejected or timed out a request at time now."""
+        # Requests sent before the last backoff fail too; count them once
+        if now - self._last_backoff < (self.latency or 0.0):
+            return
+        self._last_backoff = now
+        self.value = max(self.minimum, self.value * BACKOFF)
+
+
+class _ProviderQueue:
+    """Pending tasks of one provider, one deque per model."""
+
+    def __init__(self):
+        self.models: dict[str, deque[Task]] = {}
+        self.in_flight = 0
+
+    def add(self, task: Task):
+        self.models.setdefault(task.model_name, deque()).append(task)
+
+    def pending(self) -> bool:
+        return any(self.models.values())
+
+    def pop(self) -> Task:
+        """Next task, rotating across models."""
+        model_name = next(name for name, queue in self.models.items() if queue)
+        queue = self.models.pop(model_name)
+        task = queue.popleft()
+        self.models[model_name] = queue  # Move to the back of the rotation
+        return task
+
+
+class Scheduler:
+    """Runs tasks with per-provider queues, fair dispatch and AIMD limits.
+
+    Args:
+        concurrency: Initial requests in flight per provider
+        adaptive: Adjust each provider's limit from request events; if
+            False the limit stays at concurrency
+        max_concurrency: Upper bound of an adaptive limit
+    """
+
+    def __init__(
+        self,
+        concurrency: int = PROVIDER_CONCURRENCY,
+        adaptive: bool = True,
+        max_concurrency: int = MAX_CONCURRENCY,
+    ):
+        self.concurrency = concurrency
+        self.adaptive = adaptive
+        self.max_concurrency = max(max_concurrency, concurrency)
+        self.limits: dict[str, AIMDLimit] = {}
+
+    def describe(self) -> str:
+        """Current limit per provider, e.g. "anthropic=6 openai=12"."""
+        return " ".join(f"{p}={limit.limit}" for p, limit in self.limits.items())
+
+    def _observe(self, record: dict):
+        if record["event"] not in ("request_end", "request_error"):
+            return
+        limit = self.limits.get(provider_of(str(record.get("model"))))
+        if limit is None:
+            return
+        before = limit.limit
+        if record["event"] == "request_end":
+            if record.get("cache_hit"):
+                return
+            limit.success(record.get("seconds", 0.0))
+            reason = "increase"
+        elif is_overload(record):
+            limit.overload(record["ts"])
+            reason = "backoff"
+        else:
+            return
+        if limit.limit != before:
+            provider = provider_of(str(record.get("model")))
+            emit("concurrency", provider=provider, limit=limit.limit, reason=reason)
+
+    def run(
+        self,
+        tasks: list[Task],
+        run: Callable[[Task], dict],
+    ) -> Iterator[tuple[Task, dict]]:
+        """Run tasks, interleaving providers.
+
+        Args:
+            tasks: Tasks to run, in any order
+            run: Function computing one task's result
+
+        Yields:
+            (task, result) as tasks finish. An exception from run
+            propagates after cancelling the tasks not yet started.
+        """
+        queues: dict[str, _ProviderQueue] = {}
+        for task in tasks:
+            queues.setdefault(provider_of(task.model_id), _ProviderQueue()).add(task)
+        if not queues:
+            return
+        for provider in queues:
+            self.limits[provider] = AIMDLimit(
+                self.concurrency, maximum=self.max_concurrency
+            )
+            emit(
+                "concurrency", provider=provider, limit=self.concurrency, reason="start"
+            )
+
+        workers = self.max_concurrency if self.adaptive else self.concurrency
+        executor = ThreadPoolExecutor(max_workers=workers * len(queues))
+        running = {}
+
+        def dispatch():
+            for provider, queue in queues.items():
+                while queue.in_flight < self.limits[provider].limit and queue.pending():
+                    task = queue.pop()
+                    queue.in_flight += 1
+                    running[executor.submit(run, task)] = (provider, task)
+
+        if self.adaptive:
+            add_listener(self._observe)
+        try:
+            dispatch()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    provider, task = running.pop(future)
+                    queues[provider].in_flight -= 1
+                    yield task, future.result()
+                dispatch()
+        finally:
+            if self.adaptive:
+                remove_listener(self._observe)
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def run_interleaved(
+    tasks: list[Task],
+    run: Callable[[Task], dict],
+    concurrency: int = PROVIDER_CONCURRENCY,
+) -> Iterator[tuple[Task, dict]]:
+    """Run tasks interleaved across providers at a fixed limit."""
+    return Scheduler(concurrency, adaptive=False).run(tasks, run)
@@ -0,0 +1,114 @@
+"""Answer tool calls on benchmark households from precomputed ground truth.
+
+Most ``calculate_policy`` calls in the with-tools condition send the
+scenario's own household, or omit it and fall back to
+``Scenario.to_pe_household()``, and ask for a variable already in the
+ground truth. ``GroundTruthIndex`` maps a canonical hash of each scenario
+household to its ground-truth values, so those calls are answered without
+a simulation. Any other household (a different income, an extra person, an
+extra input) misses the index and is simulated as before.
+
+Canonical form ignores what cannot change results: person and group
+names, member order, and int versus float numbers. Two people with
+identical inputs are interchangeable.
+"""
+
+import hashlib
+import json
+import threading
+from typing import TYPE_CHECKING
+
+from policybench.config import TAX_YEAR
+from policybench.scenarios import Scenario
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _normalize(value):
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def household_key(household: dict) -> str | None:
+    """Hash of the household's canonical form, or None if it is malformed."""
+    if not isinstance(household, dict) or not isinstance(household.get("people"), dict):
+        return None
+    people = {name: _normalize(person) for name, person in household["people"].items()}
+    order = sorted(people, key=lambda name: json.dumps(people[name], sort_keys=True))
+    ids = {name: f"person{i}" for i, name in enumerate(order)}
+
+    canonical = {"people": [people[name] for name in order]}
+    for group_key, groups in household.items():
+        if group_key == "people":
+            continue
+        if not isinstance(groups, dict):
+            return None
+        entries = []
+        for group in groups.values():
+            if not isinstance(group, dict):
+                return None
+            members = group.get("members", [])
+            if not isinstance(members, list) or any(
+                not isinstance(member, str) or member not in ids for member in members
+            ):
+                return None
+            entry = _normalize({k: v for k, v in group.items() if k != "members"})
+            entry["members"] = sorted(ids[member] for member in members)
+            entries.append(entry)
+        canonical[group_key] = sorted(
+            entries, key=lambda e: json.dumps(e, sort_keys=True)
+        )
+
+    payload = json.dumps(canonical, sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+class GroundTruthIndex:
+    """Ground-truth values by (household hash, year, variable).
+
+    ``lookup`` is thread-safe and counts hits and misses; ``rate`` is the
+    share of lookups answered from the index.
+    """
+
+    def __init__(
+        self,
+        scenarios: list[Scenario],
+        ground_truth: "pd.DataFrame",
+        year: int = TAX_YEAR,
+    ):
+        keys = {s.id: household_key(s.to_pe_household()) for s in scenarios}
+        self.values: dict[tuple[str, int, str], float] = {}
+        for scenario_id, variable, value in zip(
+            ground_truth["scenario_id"],
+            ground_truth["variable"],
+            ground_truth["value"],
+        ):
+            if scenario_id in keys:
+                self.values[(keys[scenario_id], year, variable)] = float(value)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, household: dict, variable: str, year) -> float | None:
+        """The precomputed value, or None if the call needs a simulation."""
+        key = household_key(household)
+        value = None
+        if key is not None and str(year).isdigit():
+            value = self.values.get((key, int(year), variable))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    @property
+    def rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,126 @@
+"""Import-time budgets for the CLI subcommands.
+
+The CLI imports each subcommand's modules only after parsing arguments, and
+those modules defer litellm and policyengine_us until a completion or
+simulation actually runs. ``bench_startup`` times each subcommand's imports
+in a fresh interpreter, so modules already loaded by this process do not
+hide their cost, and flags any subcommand over its budget.
+"""
+
+import json
+import subprocess
+import sys
+
+# Modules each subcommand imports before doing any work
+SUBCOMMAND_IMPORTS = {
+    "help": ["policybench.cli"],
+    "ground-truth": ["policybench.cli", "policybench.ground_truth"],
+    "run": ["policybench.cli", "policybench.pipeline"],
+    "eval-no-tools": ["policybench.cli", "policybench.eval_no_tools"],
+    "eval-with-tools": ["policybench.cli", "policybench.eval_with_tools"],
+    "plan": ["policybench.cli", "policybench.planner"],
+    "analyze": ["policybench.cli", "policybench.analysis"],
+    "export-app": ["policybench.cli", "policybench.export_app"],
+    "tensor": ["policybench.cli", "policybench.tensor"],
+    "diff": ["policybench.cli", "policybench.diff"],
+    "query": ["policybench.cli", "policybench.query"],
+    "store": ["policybench.cli", "policybench.store"],
+    "engine": ["policybench.cli", "policybench.engine"],
+    "batch-server": ["policybench.cli", "policybench.batch_server"],
+}
+
+# Import-time budget per subcommand, in seconds. Commands that only build
+# prompts or scenarios stay well under a tenth of a second; analysis
+# commands may load pandas and pyarrow.
+STARTUP_BUDGETS = {
+    "help": 0.1,
+    "ground-truth": 0.1,
+    "run": 0.1,
+    "eval-no-tools": 0.1,
+    "eval-with-tools": 0.1,
+    "plan": 1.5,
+    "analyze": 1.5,
+    "export-app": 1.5,
+    "tensor": 1.5,
+    "diff": 1.5,
+    "query": 1.5,
+    "store": 1.5,
+    "engine": 0.1,
+    "batch-server": 0.1,
+}
+
+# Dependencies worth naming when a subcommand loads them at import
+HEAVY_MODULES = ["litellm", "policyengine_us", "pandas", "pyarrow", "duckdb"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "modules": sorted(sys.modules)}))
+"""
+
+
+def measure_imports(modules: list[str], repeat: int = 3) -> tuple[float, list[str]]:
+    """Time importing modules in fresh interpreters.
+
+    Returns:
+        Best wall time over ``repeat`` runs, and the HEAVY_MODULES loaded
+    """
+    best = float("inf")
+    loaded = set()
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE, *modules],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        probe = json.loads(out.stdout.splitlines()[-1])
+        best = min(best, probe["seconds"])
+        loaded = {name.split(".")[0] for name in probe["modules"]}
+    return best, [name for name in HEAVY_MODULES if name in loaded]
+
+
+def bench_startup(
+    commands: list[str] | None = None,
+    budgets: dict[str, float] | None = None,
+    repeat: int = 3,
+) -> list[dict]:
+    """Measure import time per subcommand against its budget.
+
+    Returns:
+        One dict per command: command, seconds, budget, heavy, ok
+    """
+    if commands is None:
+        commands = list(SUBCOMMAND_IMPORTS)
+    if budgets is None:
+        budgets = STARTUP_BUDGETS
+
+    rows = []
+    for command in commands:
+        seconds, heavy = measure_imports(SUBCOMMAND_IMPORTS[command], repeat)
+        budget = budgets[command]
+        rows.append(
+            {
+                "command": command,
+                "seconds": seconds,
+                "budget": budget,
+                "heavy": heavy,
+                "ok": seconds <= budget,
+            }
+        )
+    return rows
+
+
+def format_report(rows: list[dict]) -> str:
+    """Plain-text table of bench_startup results."""
+    lines = [f"{'command':<16} {'import':>8} {'budget':>8}  status  loads"]
+    for row in rows:
+        status = "ok" if row["ok"] else "OVER"
+        lines.append(
+            f"{row['command']:<16} {row['seconds']:>7.3f}s {row['budget']:>7.2f}s"
+            f"  {status:<6}  {', '.join(row['heavy']) or '-'}"
+        )
+    return "\n".join(lines)
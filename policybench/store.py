@@ -0,0 +1,363 @@
+"""Partitioned Parquet store for PolicyBench predictions.
+
+Predictions live under ``<root>/predictions`` in hive-style partitions,
+one zstd-compressed Parquet file per (run, condition, model):
+
+    predictions/run=<run>/condition=<condition>/model=<model>/part-0.parquet
+
+Readers project only the columns they need and filter on partitions
+without opening files that cannot match.
+
+Raw model responses are kept out of the predictions table. Each distinct
+response is stored once in a content-addressed blob table under
+``<root>/blobs`` (zstd-compressed Parquet, keyed by a BLAKE2b hash of the
+text), and predictions hold only its ``response_hash``. Many responses are
+identical short strings such as ``0``, so this deduplicates most of them;
+analysis never reads the blobs, and tools that need the text stream it
+with ``iter_responses``.
+"""
+
+import hashlib
+import shutil
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+STORE_DIR = "results/store"
+
+CONDITIONS = ["no_tools", "with_tools"]
+
+PARTITION_SCHEMA = pa.schema(
+    [
+        pa.field("run", pa.string()),
+        pa.field("condition", pa.string()),
+        pa.field("model", pa.string()),
+    ]
+)
+
+PREDICTION_SCHEMA = pa.schema(
+    [
+        pa.field("scenario_id", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("variable", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("prediction", pa.float64()),
+        pa.field("response_hash", pa.string()),
+        pa.field("used_tool", pa.bool_()),
+        pa.field("tool_calls", pa.int32()),
+        pa.field("tool_rounds", pa.int32()),
+        pa.field("time_to_answer", pa.float64()),
+    ]
+)
+
+# Read schema, so files written before a column was added read it as null
+_DATASET_SCHEMA = pa.unify_schemas([PREDICTION_SCHEMA, PARTITION_SCHEMA])
+
+BLOB_SCHEMA = pa.schema(
+    [
+        pa.field("hash", pa.string()),
+        pa.field("text", pa.string()),
+    ]
+)
+
+# Rows per batch when streaming blobs
+BLOB_BATCH_SIZE = 10_000
+
+# Columns compute_metrics needs
+ANALYSIS_COLUMNS = ["model", "scenario_id", "variable", "prediction"]
+
+# Columns only some runs have (streamed no-tools runs time their answers);
+# exports leave them out when they are empty
+OPTIONAL_COLUMNS = ["time_to_answer"]
+
+# Column layout of the per-condition predictions CSVs
+CSV_COLUMNS = {
+    "no_tools": [
+        "model",
+        "scenario_id",
+        "variable",
+        "prediction",
+        "raw_response",
+        "time_to_answer",
+    ],
+    "with_tools": [
+        "model",
+        "scenario_id",
+        "variable",
+        "prediction",
+        "used_tool",
+        "tool_calls",
+        "tool_rounds",
+    ],
+}
+
+
+def _check_condition(condition: str):
+    if condition not in CONDITIONS:
+        raise ValueError(f"Unknown condition {condition!r}; expected {CONDITIONS}")
+
+
+def _condition_dir(root: str | Path, run: str, condition: str) -> Path:
+    return (
+        Path(root)
+        / "predictions"
+        / f"run={quote(run, safe='')}"
+        / f"condition={condition}"
+    )
+
+
+def _partition_dir(root: str | Path, run: str, condition: str, model: str) -> Path:
+    return _condition_dir(root, run, condition) / f"model={quote(model, safe='')}"
+
+
+def response_hash(text: str) -> str:
+    """Content address of a raw response."""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _blob_dataset(root: str | Path) -> ds.Dataset | None:
+    blob_dir = Path(root) / "blobs"
+    if not any(blob_dir.glob("*.parquet")):
+        return None
+    return ds.dataset(blob_dir, format="parquet", schema=BLOB_SCHEMA)
+
+
+def write_responses(
+    texts: Iterable[object],
+    root: str | Path = STORE_DIR,
+) -> list[str | None]:
+    """Store raw responses in the blob table, skipping ones already there.
+
+    Non-missing values that are not strings are stored as their str().
+
+    Returns:
+        The hash of each text, None for missing texts
+    """
+    # Responses read back from CSVs or JSON may be numbers; store their text
+    texts = [None if pd.isna(text) else str(text) for text in texts]
+    hashes = [None if pd.isna(text) else response_hash(text) for text in texts]
+    new = dict(zip(hashes, texts))
+    new.pop(None, None)
+    dataset = _blob_dataset(root)
+    if dataset is not None and new:
+        stored = dataset.to_table(
+            columns=["hash"], filter=ds.field("hash").isin(list(new))
+        )
+        for stored_hash in stored["hash"].to_pylist():
+            new.pop(stored_hash, None)
+    if new:
+        blob_dir = Path(root) / "blobs"
+        blob_dir.mkdir(parents=True, exist_ok=True)
+        keys = sorted(new)
+        table = pa.table(
+            {"hash": keys, "text": [new[key] for key in keys]}, schema=BLOB_SCHEMA
+        )
+        name = hashlib.blake2b("".join(keys).encode(), digest_size=8).hexdigest()
+        pq.write_table(table, blob_dir / f"part-{name}.parquet", compression="zstd")
+    return hashes
+
+
+def iter_responses(
+    hashes: Iterable[str] | None = None,
+    root: str | Path = STORE_DIR,
+    batch_size: int = BLOB_BATCH_SIZE,
+) -> Iterator[dict[str, str]]:
+    """Stream raw responses from the blob table in batches.
+
+    Args:
+        hashes: Response hashes to fetch (None streams every blob)
+
+    Yields:
+        Mappings of hash to response text, at most batch_size per batch
+    """
+    dataset = _blob_dataset(root)
+    if dataset is None:
+        return
+    expression = None
+    if hashes is not None:
+        wanted = list({h for h in hashes if isinstance(h, str)})
+        if not wanted:
+            return
+        expression = ds.field("hash").isin(wanted)
+    for batch in dataset.to_batches(filter=expression, batch_size=batch_size):
+        if batch.num_rows:
+            yield dict(
+                zip(batch.column("hash").to_pylist(), batch.column("text").to_pylist())
+            )
+
+
+def _to_table(predictions: pd.DataFrame) -> pa.Table:
+    """Convert predictions to PREDICTION_SCHEMA, filling absent columns."""
+    arrays = []
+    for field in PREDICTION_SCHEMA:
+        if field.name not in predictions:
+            arrays.append(pa.nulls(len(predictions), field.type))
+        elif pa.types.is_dictionary(field.type):
+            values = pa.array(predictions[field.name].astype(str), pa.string())
+            arrays.append(values.dictionary_encode().cast(field.type))
+        else:
+            arrays.append(
+                pa.array(predictions[field.name], field.type, from_pandas=True)
+            )
+    return pa.Table.from_arrays(arrays, schema=PREDICTION_SCHEMA)
+
+
+def write_predictions(
+    predictions: pd.DataFrame,
+    run: str,
+    condition: str,
+    root: str | Path = STORE_DIR,
+) -> list[Path]:
+    """Write one condition of a run, replacing everything stored for it.
+
+    Model partitions absent from predictions are removed too, so a rerun
+    with fewer models leaves no stale rows behind.
+
+    Args:
+        predictions: Predictions in either condition's CSV layout; any
+            raw_response text goes to the blob table
+        run: Run name, e.g. a date or model-version tag
+        condition: One of CONDITIONS
+
+    Returns:
+        Paths of the written Parquet files
+    """
+    _check_condition(condition)
+    if "raw_response" in predictions:
+        hashes = write_responses(predictions["raw_response"], root)
+        predictions = predictions.drop(columns="raw_response").assign(
+            response_hash=hashes
+        )
+    shutil.rmtree(_condition_dir(root, run, condition), ignore_errors=True)
+    paths = []
+    for model, group in predictions.groupby("model", sort=False, observed=True):
+        partition = _partition_dir(root, run, condition, str(model))
+        partition.mkdir(parents=True, exist_ok=True)
+        path = partition / "part-0.parquet"
+        pq.write_table(_to_table(group), path, compression="zstd")
+        paths.append(path)
+    return paths
+
+
+def _prediction_dataset(root: str | Path) -> ds.Dataset | None:
+    directory = Path(root) / "predictions"
+    if not directory.exists():
+        return None
+    return ds.dataset(
+        directory,
+        format="parquet",
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+        schema=_DATASET_SCHEMA,
+    )
+
+
+def read_predictions(
+    root: str | Path = STORE_DIR,
+    columns: list[str] | None = ANALYSIS_COLUMNS,
+    runs: list[str] | None = None,
+    conditions: list[str] | None = None,
+    models: list[str] | None = None,
+) -> pd.DataFrame:
+    """Read predictions, projecting columns and pruning partitions.
+
+    Args:
+        columns: Columns to load, including any of the partition keys
+            (run, condition, model); None loads every stored column.
+            Asking for raw_response fetches the text of just the selected
+            rows from the blob table.
+        runs, conditions, models: Partition values to keep (None keeps all)
+
+    Returns:
+        DataFrame with the requested columns; dictionary-encoded string
+        columns are returned as categoricals with sorted categories. An
+        empty store gives an empty DataFrame.
+    """
+    dataset = _prediction_dataset(root)
+    if dataset is None:
+        return pd.DataFrame(columns=columns or _DATASET_SCHEMA.names)
+    resolve = columns is not None and "raw_response" in columns
+    if resolve:
+        columns = [
+            "response_hash" if column == "raw_response" else column
+            for column in columns
+        ]
+    expression = None
+    for key, values in [("run", runs), ("condition", conditions), ("model", models)]:
+        if values is not None:
+            condition = ds.field(key).isin(list(values))
+            expression = condition if expression is None else expression & condition
+    df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+    for column in df.select_dtypes("category"):
+        df[column] = df[column].cat.reorder_categories(
+            sorted(df[column].cat.categories)
+        )
+    if resolve:
+        texts = {}
+        for batch in iter_responses(df["response_hash"], root):
+            texts.update(batch)
+        df["response_hash"] = df["response_hash"].map(texts)
+        df = df.rename(columns={"response_hash": "raw_response"})
+    return df
+
+
+def list_runs(root: str | Path = STORE_DIR) -> pd.DataFrame:
+    """Row counts per (run, condition, model) from Parquet metadata alone."""
+    dataset = _prediction_dataset(root)
+    rows = []
+    for fragment in dataset.get_fragments() if dataset is not None else []:
+        keys = ds.get_partition_keys(fragment.partition_expression)
+        rows.append({**keys, "rows": fragment.metadata.num_rows})
+    if not rows:
+        return pd.DataFrame(columns=[*PARTITION_SCHEMA.names, "rows"])
+    return (
+        pd.DataFrame(rows).groupby(PARTITION_SCHEMA.names, as_index=False)["rows"].sum()
+    )
+
+
+# CSV columns that hold text even when every value looks like a number
+_TEXT_COLUMNS = ["model", "scenario_id", "variable", "raw_response"]
+
+
+def import_csv(
+    path: str | Path,
+    run: str,
+    condition: str,
+    root: str | Path = STORE_DIR,
+) -> list[Path]:
+    """Load a predictions CSV into the store.
+
+    Key and response columns are read as text, so a column of all-numeric
+    responses stays a string; only empty cells are missing, as written by
+    ``to_csv``, so a response of "NA" or "None" is kept.
+    """
+    _check_condition(condition)
+    df = pd.read_csv(
+        path,
+        dtype={column: str for column in _TEXT_COLUMNS},
+        keep_default_na=False,
+        na_values=[""],
+    )
+    return write_predictions(df, run, condition, root=root)
+
+
+def export_csv(
+    path: str | Path,
+    run: str,
+    condition: str,
+    root: str | Path = STORE_DIR,
+) -> pd.DataFrame:
+    """Write one condition of a run in the predictions CSV layout."""
+    _check_condition(condition)
+    df = read_predictions(
+        root,
+        columns=CSV_COLUMNS[condition],
+        runs=[run],
+        conditions=[condition],
+    )
+    empty = [c for c in OPTIONAL_COLUMNS if c in df and df[c].isna().all()]
+    df = df.drop(columns=empty)
+    df.to_csv(path, index=False)
+    return df
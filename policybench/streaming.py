@@ -0,0 +1,112 @@
+"""Incremental metrics for predictions as they arrive during a run."""
+
+import math
+from dataclasses import dataclass
+
+import pandas as pd
+
+from policybench.analysis import METRICS
+from policybench.config import BINARY_PROGRAMS, RATE_PROGRAMS
+
+
+@dataclass
+class _Accumulator:
+    """Running sums behind one (model, variable) row of compute_metrics."""
+
+    n: int = 0
+    abs_error: float = 0.0
+    pct_error: float = 0.0
+    pct_n: int = 0
+    correct: int = 0
+    within: int = 0
+
+
+class StreamingMetrics:
+    """compute_metrics, updated in O(1) per prediction.
+
+    Ground truth is indexed by (scenario_id, variable) up front. Predictions
+    without ground truth or without a value are ignored, as in
+    compute_metrics, so ``to_frame()`` matches compute_metrics on the rows
+    seen so far.
+    """
+
+    def __init__(self, ground_truth: pd.DataFrame):
+        self.truth = dict(
+            zip(
+                zip(ground_truth["scenario_id"], ground_truth["variable"]),
+                ground_truth["value"].astype(float),
+            )
+        )
+        self.groups: dict[tuple[str, str], _Accumulator] = {}
+
+    def update(
+        self,
+        model: str,
+        scenario_id: str,
+        variable: str,
+        prediction: float | None,
+    ) -> bool:
+        """Add one prediction; returns whether it counted towards metrics."""
+        y_true = self.truth.get((scenario_id, variable))
+        if y_true is None or prediction is None or math.isnan(prediction):
+            return False
+
+        acc = self.groups.get((model, variable))
+        if acc is None:
+            acc = self.groups[(model, variable)] = _Accumulator()
+        acc.n += 1
+        acc.abs_error += abs(y_true - prediction)
+        if variable in BINARY_PROGRAMS:
+            acc.correct += round(y_true) == round(prediction)
+            return True
+        if y_true != 0:
+            rel_error = abs((y_true - prediction) / y_true)
+            acc.within += rel_error <= 0.10
+            if variable not in RATE_PROGRAMS:
+                acc.pct_error += rel_error
+                acc.pct_n += 1
+        else:
+            acc.within += abs(prediction) <= 1.0
+        return True
+
+    @property
+    def n(self) -> int:
+        return sum(acc.n for acc in self.groups.values())
+
+    def to_frame(self) -> pd.DataFrame:
+        """Current metrics in the compute_metrics layout."""
+        nan = float("nan")
+        rows = []
+        for (model, variable), acc in sorted(self.groups.items()):
+            binary = variable in BINARY_PROGRAMS
+            rows.append(
+                {
+                    "model": model,
+                    "variable": variable,
+                    "n": acc.n,
+                    "mae": acc.abs_error / acc.n,
+                    "mape": acc.pct_error / acc.pct_n if acc.pct_n else nan,
+                    "accuracy": acc.correct / acc.n if binary else nan,
+                    "within_10pct": nan if binary else acc.within / acc.n,
+                }
+            )
+        return pd.DataFrame(rows, columns=["model", "variable", "n", *METRICS])
+
+    def render(self) -> str:
+        """Per-model summary table for the live progress view."""
+        metrics = self.to_frame()
+        if metrics.empty:
+            return "  (no scored predictions yet)"
+        summary = (
+            metrics.groupby("model")
+            .agg(
+                n=("n", "sum"),
+                mae=("mae", "mean"),
+                mape=("mape", "mean"),
+                accuracy=("accuracy", "mean"),
+                within_10pct=("within_10pct", "mean"),
+            )
+            .reset_index()
+        )
+        table = summary.to_string(index=False, float_format=lambda x: f"{x:.3g}")
+        return "\n".join(f"  {line}" for line in table.splitlines())
@@ -0,0 +1,167 @@
+"""Dense prediction tensors, stored as memory-mapped .npy files.
+
+A condition's predictions become a float32 array indexed by [model,
+scenario, variable], with a boolean mask of the cells that have a
+prediction row (a row whose answer had no number is masked in but NaN),
+and the ground truth a float64 [scenario, variable] matrix, NaN where
+absent. Scenarios follow the ground truth's order and models and
+variables are sorted, as in ``analysis.score_predictions``, so metrics
+and bootstraps over a tensor equal those over the frames it came from,
+up to float32 rounding of the predictions (about seven significant
+digits).
+
+``save`` writes predictions.npy, mask.npy and ground_truth.npy next to an
+index.json sidecar naming the labels of each axis; ``load`` maps the
+arrays read-only, so analysis touches only the pages it reads and string
+keys are resolved once, when the tensor is built.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from policybench.analysis import ScoredPredictions, score_arrays, summarize_scores
+
+_ARRAYS = ["predictions", "mask", "ground_truth"]
+
+# Subdirectory of a tensor directory per condition
+CONDITIONS = ["no_tools", "with_tools"]
+
+
+def _codes(index: pd.Index, values: pd.Series) -> np.ndarray:
+    """Positions of values in index, -1 where absent.
+
+    Categorical columns, as read from the store, are looked up once per
+    category rather than once per row.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        lookup = index.get_indexer(values.cat.categories.astype(str))
+        return np.append(lookup, -1)[values.cat.codes.to_numpy()]
+    return index.get_indexer(values.astype(str))
+
+
+@dataclass
+class PredictionTensor:
+    """One condition's predictions and the ground truth, as dense arrays."""
+
+    models: pd.Index
+    scenarios: pd.Index
+    variables: pd.Index
+    predictions: np.ndarray
+    mask: np.ndarray
+    ground_truth: np.ndarray
+
+    @classmethod
+    def from_frames(
+        cls,
+        ground_truth: pd.DataFrame,
+        predictions: pd.DataFrame,
+        models: list[str] | None = None,
+    ) -> "PredictionTensor":
+        """Tensor of long-format predictions.
+
+        Args:
+            ground_truth: DataFrame with columns [scenario_id, variable, value]
+            predictions: DataFrame with columns [model, scenario_id,
+                variable, prediction]; rows outside the ground truth's
+                scenarios and variables are dropped, and of duplicate
+                rows the last is kept
+            models: Model axis, to share one between conditions (default:
+                the sorted models in predictions)
+        """
+        scenarios = pd.Index(ground_truth["scenario_id"].unique()).astype(str)
+        variables = pd.Index(ground_truth["variable"].unique()).astype(str)
+        variables = variables.sort_values()
+        if models is None:
+            models = sorted(pd.Index(predictions["model"].unique()).astype(str))
+        models = pd.Index(models)
+
+        truth = np.full((len(scenarios), len(variables)), np.nan)
+        truth[
+            _codes(scenarios, ground_truth["scenario_id"]),
+            _codes(variables, ground_truth["variable"]),
+        ] = ground_truth["value"].to_numpy(dtype=float)
+
+        m = _codes(models, predictions["model"])
+        s = _codes(scenarios, predictions["scenario_id"])
+        v = _codes(variables, predictions["variable"])
+        keep = (m >= 0) & (s >= 0) & (v >= 0)
+        shape = (len(models), len(scenarios), len(variables))
+        values = np.full(shape, np.nan, dtype=np.float32)
+        mask = np.zeros(shape, dtype=bool)
+        values[m[keep], s[keep], v[keep]] = predictions["prediction"].to_numpy(
+            dtype=float
+        )[keep]
+        mask[m[keep], s[keep], v[keep]] = True
+        return cls(models, scenarios, variables, values, mask, truth)
+
+    def save(self, directory: str | Path):
+        """Write the arrays and the index sidecar to directory."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        index = {
+            "models": list(self.models),
+            "scenarios": list(self.scenarios),
+            "variables": list(self.variables),
+        }
+        (directory / "index.json").write_text(json.dumps(index))
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap_mode: str | None = "r"):
+        """Tensor saved in directory, memory-mapped unless mmap_mode is None."""
+        directory = Path(directory)
+        index = json.loads((directory / "index.json").read_text())
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in _ARRAYS
+        }
+        return cls(
+            models=pd.Index(index["models"]),
+            scenarios=pd.Index(index["scenarios"]),
+            variables=pd.Index(index["variables"]),
+            **arrays,
+        )
+
+    def score(self) -> ScoredPredictions:
+        """Per-row metric terms, as score_predictions gives for the frames."""
+        valid = self.mask & ~np.isnan(self.predictions)
+        valid &= ~np.isnan(self.ground_truth)[None]
+        m, s, v = np.nonzero(valid)
+        return score_arrays(
+            models=self.models,
+            variables=self.variables,
+            scenarios=self.scenarios,
+            model_codes=m,
+            scenario_codes=s,
+            variable_codes=v,
+            y_pred=self.predictions[m, s, v].astype(float),
+            y_true=self.ground_truth[s, v],
+        )
+
+    def metrics(self) -> pd.DataFrame:
+        """compute_metrics output for this tensor."""
+        return summarize_scores(self.score())
+
+    def select_models(self, models: list[str]) -> "PredictionTensor":
+        """The tensor on another model axis; absent models are masked out."""
+        models = pd.Index(models)
+        codes = self.models.get_indexer(models)
+        present = codes >= 0
+        shape = (len(models), *self.predictions.shape[1:])
+        values = np.full(shape, np.nan, dtype=np.float32)
+        mask = np.zeros(shape, dtype=bool)
+        values[present] = self.predictions[codes[present]]
+        mask[present] = self.mask[codes[present]]
+        return PredictionTensor(
+            models, self.scenarios, self.variables, values, mask, self.ground_truth
+        )
+
+
+def load_conditions(directory: str | Path) -> dict[str, PredictionTensor]:
+    """The no-tools and with-tools tensors saved under directory."""
+    return {name: PredictionTensor.load(Path(directory) / name) for name in CONDITIONS}
@@ -132,6 +132,58 @@ class TestComputeMetrics:
         expected_mae = (500 + 1000 + 100) / 3
         assert abs(income_tax_row["mae"].iloc[0] - expected_mae) < 0.01
 
+    def test_compute_metrics_matches_per_group_functions(self):
+        rng = np.random.default_rng(0)
+        variables = ["income_tax", "eitc", "is_medicaid_eligible", "marginal_tax_rate"]
+        ground_truth = pd.DataFrame(
+            {
+                "scenario_id": np.repeat([f"s{i}" for i in range(40)], 4),
+                "variable": variables * 40,
+                "value": rng.choice([0.0, 1.0, 0.3, 2500.0], size=160),
+            }
+        )
+        predictions = pd.concat(
+            [ground_truth.assign(model=m) for m in ["b", "a"]], ignore_index=True
+        )
+        predictions["prediction"] = predictions["value"] * rng.normal(1, 0.2, 320)
+        predictions.loc[::17, "prediction"] = np.nan
+        predictions.loc[5, "scenario_id"] = "unmatched"
+        predictions = predictions.drop(columns="value")
+
+        metrics = compute_metrics(ground_truth, predictions)
+        assert list(metrics["model"]) == ["a"] * 4 + ["b"] * 4
+        assert list(metrics.columns) == [
+            "model",
+            "variable",
+            "n",
+            "mae",
+            "mape",
+            "accuracy",
+            "within_10pct",
+        ]
+
+        merged = predictions.merge(ground_truth).dropna(subset=["prediction"])
+        for row in metrics.itertuples():
+            group = merged[
+                (merged["model"] == row.model) & (merged["variable"] == row.variable)
+            ]
+            y_true = group["value"].values
+            y_pred = group["prediction"].values
+            assert row.n == len(group)
+            assert row.mae == pytest.approx(mean_absolute_error(y_true, y_pred))
+            if row.variable == "is_medicaid_eligible":
+                assert row.accuracy == accuracy(y_true, y_pred)
+                assert np.isnan(row.within_10pct)
+            else:
+                assert np.isnan(row.accuracy)
+                assert row.within_10pct == within_tolerance(y_true, y_pred)
+            if row.variable in ("income_tax", "eitc"):
+                assert row.mape == pytest.approx(
+                    mean_absolute_percentage_error(y_true, y_pred)
+                )
+            else:
+                assert np.isnan(row.mape)
+
 
 class TestSummaries:
     @pytest.fixture
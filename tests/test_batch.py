@@ -0,0 +1,180 @@
+"""Tests for batch-API evaluation against the local stand-in server."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from policybench.batch import (
+    MAX_TOKENS,
+    AnthropicBatches,
+    OpenAIBatches,
+    _Job,
+    run_batch_eval,
+)
+from policybench.batch_server import BatchServer
+
+MODELS = {"gpt": "gpt-x", "claude": "claude-x", "gemini": "gemini/g"}
+
+
+def _answer(model, messages):
+    return "$1,234" if model == "gpt-x" else "About 56 dollars."
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with BatchServer(_answer, polls=2) as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", f"{server.url}/openai/v1")
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", f"{server.url}/anthropic")
+        yield server
+
+
+@pytest.fixture
+def direct():
+    """Completions of models without a batch API."""
+    response = MagicMock()
+    response.choices[0].message.content = "7"
+    with patch("policybench.eval_no_tools.completion", return_value=response) as m:
+        yield m
+
+
+def test_batch_eval_end_to_end(server, direct, sample_scenarios, tmp_path):
+    df = run_batch_eval(
+        sample_scenarios,
+        MODELS,
+        ["eitc", "snap"],
+        output_path=tmp_path / "predictions.csv",
+        batch_dir=tmp_path / "batches",
+        poll_interval=0,
+    )
+
+    assert list(df.columns) == [
+        "model",
+        "scenario_id",
+        "variable",
+        "prediction",
+        "raw_response",
+    ]
+    assert list(df["model"]) == ["gpt"] * 6 + ["claude"] * 6 + ["gemini"] * 6
+    predictions = df.groupby("model")["prediction"].unique()
+    assert list(predictions["gpt"]) == [1234.0]
+    assert list(predictions["claude"]) == [56.0]
+    assert list(predictions["gemini"]) == [7.0]
+    assert direct.call_count == 6
+    assert (tmp_path / "predictions.csv").exists()
+
+    openai_job, anthropic_job = server.submitted
+    assert openai_job[0]["url"] == "/v1/chat/completions"
+    assert openai_job[0]["body"]["model"] == "gpt-x"
+    assert anthropic_job[0]["params"]["max_tokens"] == MAX_TOKENS
+    assert len(openai_job) == len(anthropic_job) == 6
+
+
+def test_rerun_reuses_finished_jobs(server, sample_scenarios, tmp_path):
+    models = {"gpt": "gpt-x"}
+    kwargs = dict(batch_dir=tmp_path, poll_interval=0)
+    first = run_batch_eval(sample_scenarios, models, ["eitc"], **kwargs)
+    second = run_batch_eval(sample_scenarios, models, ["eitc"], **kwargs)
+    assert len(server.submitted) == 1
+    assert first.equals(second)
+
+    run_batch_eval(sample_scenarios, models, ["snap"], **kwargs)
+    assert len(server.submitted) == 2  # Different requests, new job
+
+
+def test_rerun_resubmits_failed_requests(sample_scenarios, tmp_path):
+    failing = {"on": True}
+
+    def flaky(model, messages):
+        if failing["on"] and "snap" in messages[0]["content"].lower():
+            return None
+        return "12"
+
+    models = {"gpt": "gpt-x", "claude": "claude-x"}
+    kwargs = dict(batch_dir=tmp_path, poll_interval=0)
+    with BatchServer(flaky) as server, pytest.MonkeyPatch.context() as mp:
+        mp.setenv("OPENAI_BASE_URL", f"{server.url}/openai/v1")
+        mp.setenv("ANTHROPIC_BASE_URL", f"{server.url}/anthropic")
+        first = run_batch_eval(sample_scenarios, models, ["eitc", "snap"], **kwargs)
+        assert first["prediction"].isna().sum() == 6
+
+        failing["on"] = False
+        second = run_batch_eval(sample_scenarios, models, ["eitc", "snap"], **kwargs)
+        assert second["prediction"].notna().all()
+        third = run_batch_eval(sample_scenarios, models, ["eitc", "snap"], **kwargs)
+
+    # Only the three failed requests of each job are sent again, once
+    assert [len(job) for job in server.submitted] == [6, 6, 3, 3]
+    assert third.equals(second)
+
+
+def test_openai_jobs_have_one_model(server, sample_scenarios, tmp_path):
+    models = {"gpt": "gpt-x", "mini": "gpt-x-mini", "claude": "claude-x"}
+    run_batch_eval(
+        sample_scenarios, models, ["eitc"], batch_dir=tmp_path, poll_interval=0
+    )
+    models_per_job = [
+        {r["body"]["model"] if "body" in r else r["params"]["model"] for r in job}
+        for job in server.submitted
+    ]
+    assert models_per_job == [{"gpt-x"}, {"gpt-x-mini"}, {"claude-x"}]
+
+
+def test_resumes_submitted_job(server, sample_scenarios, tmp_path):
+    client = AnthropicBatches()
+    request = client.request("r1", "claude-x", [{"role": "user", "content": "?"}])
+    _Job(client, [request], tmp_path).submit()  # Interrupted before polling
+
+    job = _Job(AnthropicBatches(), [request], tmp_path)
+    job.submit()
+    (line,) = job.results(poll_interval=0)
+    assert len(server.submitted) == 1
+    assert client.parse(line) == ("r1", "About 56 dollars.", None)
+
+
+def test_resumed_resubmission_keeps_its_requests(server, tmp_path):
+    client = AnthropicBatches()
+    requests = [
+        client.request(f"r{i}", "claude-x", [{"role": "user", "content": str(i)}])
+        for i in range(3)
+    ]
+    job = _Job(client, requests, tmp_path)
+    # r0 was answered by an earlier job; resubmit r1 and r2, then stop
+    job.results_path.write_text(
+        json.dumps(
+            {
+                "custom_id": "r0",
+                "result": {
+                    "type": "succeeded",
+                    "message": {"content": [{"type": "text", "text": "1"}]},
+                },
+            }
+        )
+        + "\n"
+    )
+    job.submit()
+
+    resumed = _Job(AnthropicBatches(), requests, tmp_path)
+    resumed.submit()
+    assert [r["custom_id"] for r in resumed.pending] == ["r1", "r2"]
+    lines = resumed.results(poll_interval=0)
+    assert sorted(line["custom_id"] for line in lines) == ["r0", "r1", "r2"]
+    assert len(server.submitted) == 1
+
+
+def test_parse_failed_requests():
+    custom_id, text, error = OpenAIBatches().parse(
+        {
+            "custom_id": "a",
+            "response": {"status_code": 429, "body": {"error": {"code": "rate"}}},
+            "error": None,
+        }
+    )
+    assert (custom_id, text) == ("a", None)
+    assert "rate" in error
+
+    custom_id, text, error = AnthropicBatches().parse(
+        {"custom_id": "b", "result": {"type": "expired"}}
+    )
+    assert (custom_id, text) == ("b", None)
+    assert "expired" in error
@@ -0,0 +1,109 @@
+"""Tests for paired bootstrap confidence intervals."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from policybench.analysis import METRICS, compute_metrics
+from policybench.bootstrap import (
+    bootstrap_conditions,
+    bootstrap_metrics,
+    compare_conditions_intervals,
+    metric_intervals,
+    summary_intervals,
+)
+
+
+@pytest.fixture
+def ground_truth():
+    rng = np.random.default_rng(1)
+    n = 30
+    return pd.DataFrame(
+        {
+            "scenario_id": np.repeat([f"s{i}" for i in range(n)], 2),
+            "variable": ["income_tax", "is_medicaid_eligible"] * n,
+            "value": np.column_stack(
+                [rng.choice([0.0, 5000.0, 12000.0], n), rng.integers(0, 2, n)]
+            ).ravel(),
+        }
+    )
+
+
+def make_predictions(ground_truth, models, noise, seed):
+    rng = np.random.default_rng(seed)
+    predictions = pd.concat(
+        [ground_truth.assign(model=m) for m in models], ignore_index=True
+    )
+    predictions["prediction"] = predictions["value"] * rng.normal(
+        1, noise, len(predictions)
+    )
+    return predictions.drop(columns="value")
+
+
+@pytest.fixture
+def no_tools(ground_truth):
+    return make_predictions(ground_truth, ["a", "b"], noise=0.3, seed=2)
+
+
+@pytest.fixture
+def with_tools(ground_truth):
+    return make_predictions(ground_truth, ["a", "b"], noise=0.01, seed=3)
+
+
+def test_replicates_align_with_metrics(ground_truth, no_tools):
+    result = bootstrap_metrics(ground_truth, no_tools, n_replicates=200, n_jobs=1)
+    pd.testing.assert_frame_equal(
+        result.metrics, compute_metrics(ground_truth, no_tools)
+    )
+    assert result.replicates.shape == (200, len(result.metrics), len(METRICS))
+
+
+def test_results_independent_of_worker_count(ground_truth, no_tools):
+    inline = bootstrap_metrics(ground_truth, no_tools, n_replicates=1200, n_jobs=1)
+    pooled = bootstrap_metrics(ground_truth, no_tools, n_replicates=1200, n_jobs=2)
+    np.testing.assert_array_equal(inline.replicates, pooled.replicates)
+
+
+def test_metric_intervals_bracket_point_estimates(ground_truth, no_tools):
+    result = bootstrap_metrics(ground_truth, no_tools, n_replicates=500, n_jobs=1)
+    intervals = metric_intervals(result)
+    assert (intervals["mae_low"] <= intervals["mae"]).all()
+    assert (intervals["mae"] <= intervals["mae_high"]).all()
+    binary = intervals[intervals["variable"] == "is_medicaid_eligible"]
+    assert binary["accuracy_low"].notna().all()
+    assert binary["mape_low"].isna().all()
+
+
+def test_summary_intervals(ground_truth, no_tools):
+    result = bootstrap_metrics(ground_truth, no_tools, n_replicates=300, n_jobs=1)
+    summary = summary_intervals(result, by="model")
+    assert list(summary["model"]) == ["a", "b"]
+    assert (summary["mean_mae_low"] <= summary["mean_mae_high"]).all()
+    by_variable = summary_intervals(result, by="variable")
+    assert set(by_variable["variable"]) == {"income_tax", "is_medicaid_eligible"}
+
+
+def test_paired_comparison(ground_truth, no_tools, with_tools):
+    results = bootstrap_conditions(
+        ground_truth,
+        {"no_tools": no_tools, "with_tools": with_tools},
+        n_replicates=500,
+        n_jobs=1,
+    )
+    comparison = compare_conditions_intervals(
+        results["no_tools"], results["with_tools"]
+    )
+    assert (comparison["mae_reduction_low"] > 0).all()
+    assert (
+        comparison["accuracy_improvement_low"]
+        <= comparison["accuracy_improvement_high"]
+    ).all()
+
+
+def test_identical_conditions_have_zero_width_difference(ground_truth, no_tools):
+    results = bootstrap_conditions(
+        ground_truth, {"x": no_tools, "y": no_tools}, n_replicates=300, n_jobs=1
+    )
+    comparison = compare_conditions_intervals(results["x"], results["y"])
+    assert (comparison["accuracy_improvement_low"] == 0).all()
+    assert (comparison["accuracy_improvement_high"] == 0).all()
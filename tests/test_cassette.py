@@ -0,0 +1,130 @@
+"""Tests for recording LLM traffic to a cassette and replaying it."""
+
+import json
+import sys
+import types
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from policybench.cassette import (
+    Cassette,
+    CassetteMiss,
+    Replayed,
+    disable_cassette,
+    enable_cassette,
+)
+
+
+def _response(content=None, tool_calls=None) -> Replayed:
+    """A response object shaped like litellm's ModelResponse."""
+    message = {"role": "assistant", "content": content, "tool_calls": tool_calls}
+    return Replayed({"id": "r", "choices": [{"index": 0, "message": message}]})
+
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    yield tmp_path / "cassette.jsonl.gz"
+    disable_cassette()
+
+
+def _fake_litellm(*responses):
+    return types.SimpleNamespace(completion=MagicMock(side_effect=list(responses)))
+
+
+def test_replayed_attribute_access():
+    tool_call = {"id": "c1", "function": {"name": "calculate_policy"}}
+    response = _response("42", [tool_call])
+    message = response.choices[0].message
+    assert message.content == "42"
+    assert message.tool_calls[0].function.name == "calculate_policy"
+    assert message.model_dump()["tool_calls"] == [tool_call]
+    with pytest.raises(AttributeError):
+        response.usage
+
+
+def test_record_then_replay_without_litellm(cassette_path, simple_single_scenario):
+    from policybench.eval_no_tools import run_single_no_tools
+
+    enable_cassette(cassette_path, "record")
+    fake = _fake_litellm(_response("The EITC is $1,234."))
+    with patch.dict(sys.modules, {"litellm": fake}):
+        recorded = run_single_no_tools(simple_single_scenario, "eitc", "gpt-x")
+    disable_cassette()
+
+    enable_cassette(cassette_path, "replay")
+    with patch.dict(sys.modules, {"litellm": None}):  # Importing it would fail
+        replayed = run_single_no_tools(simple_single_scenario, "eitc", "gpt-x")
+    assert (
+        replayed
+        == recorded
+        == {
+            "prediction": 1234.0,
+            "raw_response": "The EITC is $1,234.",
+        }
+    )
+
+
+def test_replays_tool_call_turns(cassette_path, simple_single_scenario):
+    from policybench.eval_with_tools import run_single_with_tools
+
+    arguments = {"household": simple_single_scenario.to_pe_household()}
+    tool_call = {
+        "id": "c1",
+        "type": "function",
+        "function": {
+            "name": "calculate_policy",
+            "arguments": json.dumps({**arguments, "variable": "eitc"}),
+        },
+    }
+    fake = _fake_litellm(_response(None, [tool_call]), _response("Done."))
+
+    enable_cassette(cassette_path, "record")
+    with (
+        patch.dict(sys.modules, {"litellm": fake}),
+        patch("policybench.eval_with_tools.calculate", return_value={"eitc": 321.0}),
+    ):
+        recorded = run_single_with_tools(simple_single_scenario, "eitc", "gpt-x")
+    disable_cassette()
+    assert len(Cassette(cassette_path, "replay").responses) == 2
+
+    enable_cassette(cassette_path, "replay")
+    with (
+        patch.dict(sys.modules, {"litellm": None}),
+        patch("policybench.eval_with_tools.calculate", return_value={"eitc": 321.0}),
+    ):
+        replayed = run_single_with_tools(simple_single_scenario, "eitc", "gpt-x")
+    assert replayed == recorded
+    assert replayed["prediction"] == 321.0
+
+
+def test_miss_fails_without_retrying(cassette_path, sample_scenarios):
+    from policybench.eval_with_tools import run_with_tools_eval
+
+    enable_cassette(cassette_path, "record")
+    disable_cassette()  # Nothing recorded: no file
+    with pytest.raises(FileNotFoundError):
+        enable_cassette(cassette_path, "replay")
+
+    cassette_path.write_bytes(b"")
+    enable_cassette(cassette_path, "replay")
+    with (
+        patch("policybench.eval_with_tools.time.sleep") as sleep,
+        pytest.raises(CassetteMiss, match="gpt-x"),
+    ):
+        run_with_tools_eval(sample_scenarios, {"m": "gpt-x"}, ["eitc"])
+    sleep.assert_not_called()
+
+
+def test_recording_appends_to_existing_cassette(cassette_path):
+    first = Cassette(cassette_path, "record")
+    first.record("a", {"model": "m"}, _response("1"))
+    first.record("a", {"model": "m"}, _response("1"))
+    first.close()
+    second = Cassette(cassette_path, "record")
+    second.record("b", {"model": "m"}, _response("2"))
+    second.close()
+
+    replay = Cassette(cassette_path, "replay")
+    assert (first.recorded, second.recorded) == (1, 1)
+    assert replay.replay("b", {}).choices[0].message.content == "2"
@@ -0,0 +1,121 @@
+"""Tests for run-over-run diffs."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from policybench.analysis import compute_metrics
+from policybench.diff import diff_runs
+from policybench.scenarios import generate_scenarios
+
+
+@pytest.fixture
+def scenarios():
+    return generate_scenarios(n=60, seed=0)
+
+
+@pytest.fixture
+def ground_truth(scenarios):
+    rng = np.random.default_rng(0)
+    ids = [s.id for s in scenarios]
+    return pd.DataFrame(
+        {
+            "scenario_id": ids * 2,
+            "variable": ["eitc"] * len(ids) + ["is_medicaid_eligible"] * len(ids),
+            "value": np.concatenate(
+                [
+                    rng.choice([0.0, 800.0, 2500.0], len(ids)),
+                    rng.integers(0, 2, len(ids)),
+                ]
+            ),
+        }
+    )
+
+
+def _run(ground_truth, noise, seed, condition="no_tools"):
+    rng = np.random.default_rng(seed)
+    predictions = pd.concat(
+        [ground_truth.assign(model=m) for m in ["a", "b"]], ignore_index=True
+    )
+    predictions["prediction"] = np.round(
+        predictions["value"] * rng.normal(1, noise, len(predictions)), 2
+    )
+    return predictions.drop(columns="value").assign(condition=condition)
+
+
+def test_regression_in_one_state_is_the_top_mover(ground_truth, scenarios):
+    run_a = _run(ground_truth, noise=0.0, seed=1)
+    state = max(
+        {s.state for s in scenarios},
+        key=lambda st: sum(s.state == st for s in scenarios),
+    )
+    in_state = {s.id for s in scenarios if s.state == state}
+    run_b = run_a.copy()
+    worse = run_b["scenario_id"].isin(in_state) & (run_b["variable"] == "eitc")
+    run_b.loc[worse, "prediction"] += 1000.0
+
+    diff = diff_runs(ground_truth, run_a, run_b, scenarios, names=("old", "new"))
+
+    top = diff.top_movers("mae", "state", n=3)
+    assert top.iloc[0]["group"] == state
+    assert top.iloc[0]["delta"] == pytest.approx(
+        1000.0 * worse.sum() / top.iloc[0]["n"]
+    )
+    assert top.iloc[0]["significant"]
+    unchanged = top[top["group"] != state]
+    assert (unchanged["delta"] == 0).all()
+    assert (unchanged["p_value"] == 1).all()
+
+    program = diff.top_movers("mae", "program")
+    assert program.set_index("group").loc["is_medicaid_eligible", "delta"] == 0
+
+
+def test_cells_align_on_keys_in_both_runs(ground_truth, scenarios):
+    run_a = _run(ground_truth, noise=0.2, seed=1)
+    run_b = _run(ground_truth, noise=0.2, seed=2)
+    run_b = run_b.drop(index=[0, 5]).sample(frac=1, random_state=0)
+    run_b = pd.concat([run_b, run_b.assign(condition="with_tools")])
+
+    diff = diff_runs(ground_truth, run_a, run_b, scenarios)
+
+    # Only no_tools is in both runs, and two of its cells are only in run A
+    assert set(diff.cells["condition"]) == {"no_tools"}
+    assert len(diff.cells) == len(run_a) - 2
+    cell = diff.cells.set_index(["model", "scenario_id", "variable"])
+    key = tuple(run_b.iloc[0][["model", "scenario_id", "variable"]])
+    assert cell.loc[key, "prediction_b"] == pytest.approx(run_b.iloc[0]["prediction"])
+
+    # Each run's side of the diff is its metrics over the paired cells
+    paired = run_a.drop(index=[0, 5])
+    expected = compute_metrics(ground_truth, paired)
+    by_program = diff.movers[
+        (diff.movers["dimension"] == "program") & (diff.movers["metric"] == "mae")
+    ]
+    expected_mae = expected.groupby("variable")["mae"].apply(
+        lambda mae: np.average(mae, weights=expected.loc[mae.index, "n"])
+    )
+    np.testing.assert_allclose(
+        by_program.set_index("group")["a"], expected_mae, rtol=1e-6
+    )
+
+
+def test_one_cell_per_scenario_gives_the_paired_standard_error(ground_truth):
+    dollar = ground_truth[ground_truth["variable"] == "eitc"]
+    run_a = _run(dollar, noise=0.3, seed=1).query("model == 'a'")
+    run_b = _run(dollar, noise=0.3, seed=2).query("model == 'a'")
+
+    diff = diff_runs(dollar, run_a, run_b)
+
+    overall = diff.movers.query("dimension == 'overall' and metric == 'mae'").iloc[0]
+    errors = [
+        (
+            run.set_index("scenario_id")["prediction"]
+            - dollar.set_index("scenario_id")["value"]
+        ).abs()
+        for run in (run_a, run_b)
+    ]
+    delta = errors[1] - errors[0]
+    assert overall["delta"] == pytest.approx(delta.mean(), rel=1e-5)
+    assert overall["se"] == pytest.approx(
+        delta.std(ddof=1) / np.sqrt(len(delta)), rel=1e-5
+    )
@@ -0,0 +1,78 @@
+"""Tests for the PolicyEngine access layer and warm daemon (mocked PE)."""
+
+import socket
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from policybench.engine import calculate, daemon_pid, make_server
+
+
+def _mock_simulation(value):
+    result = MagicMock()
+    result.sum.return_value = value
+    sim = MagicMock()
+    sim.return_value.calculate.return_value = result
+    return sim
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """A daemon serving on a temporary socket, in a background thread."""
+    socket_path = tmp_path / "engine.sock"
+    server = make_server(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+
+
+def test_calculate_without_daemon_runs_locally(tmp_path):
+    with patch("policybench.engine.Simulation", _mock_simulation(42.0)) as sim:
+        values = calculate({}, ["eitc", "snap"], socket_path=tmp_path / "none.sock")
+    assert values == {"eitc": 42.0, "snap": 42.0}
+    assert sim.call_count == 1
+
+
+def test_calculate_uses_running_daemon(daemon):
+    assert daemon_pid(daemon) is not None
+    with patch("policybench.engine.Simulation", _mock_simulation(7.5)):
+        values = calculate({"people": {}}, ["income_tax"], socket_path=daemon)
+    assert values == {"income_tax": 7.5}
+
+
+def test_daemon_errors_are_raised(daemon):
+    failing = MagicMock(side_effect=ValueError("Unknown variable"))
+    with patch("policybench.engine.Simulation", failing):
+        with pytest.raises(RuntimeError, match="Unknown variable"):
+            calculate({}, ["bogus"], socket_path=daemon)
+
+
+def test_stale_socket_falls_back_to_local(tmp_path):
+    stale = tmp_path / "stale.sock"
+    stale.touch()
+    assert daemon_pid(stale) is None
+    with patch("policybench.engine.Simulation", _mock_simulation(1.0)):
+        assert calculate({}, ["snap"], socket_path=stale) == {"snap": 1.0}
+
+
+def test_unresponsive_daemon_falls_back_to_local(tmp_path):
+    path = tmp_path / "hung.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as hung:
+        hung.bind(str(path))
+        hung.listen()  # Accepts connections but never answers
+        with patch("policybench.engine.Simulation", _mock_simulation(3.0)):
+            values = calculate({}, ["snap"], socket_path=path, timeout=0.1)
+    assert values == {"snap": 3.0}
+
+
+def test_socket_from_environment(daemon, monkeypatch):
+    monkeypatch.setenv("POLICYBENCH_ENGINE_SOCKET", str(daemon))
+    assert daemon_pid() is not None
+    # Errors come back as RuntimeError only from the daemon
+    failing = MagicMock(side_effect=ValueError("Unknown variable"))
+    with patch("policybench.engine.Simulation", failing):
+        with pytest.raises(RuntimeError, match="Unknown variable"):
+            calculate({}, ["bogus"])
@@ -2,11 +2,19 @@
 
 from unittest.mock import MagicMock, patch
 
+import pandas as pd
 import pytest
 
-from policybench.eval_no_tools import extract_number, run_single_no_tools
+from policybench.eval_no_tools import (
+    answer_complete,
+    extract_number,
+    run_no_tools_eval,
+    run_single_no_tools,
+    stream_answer,
+)
 from policybench.prompts import make_no_tools_prompt
 from policybench.scenarios import Person, Scenario
+from policybench.streaming import StreamingMetrics
 
 
 @pytest.fixture
@@ -80,3 +88,173 @@ def test_run_single_no_tools(mock_completion, mini_scenario):
     assert result["prediction"] == 3500.0
     assert result["raw_response"] == "3500"
     mock_completion.assert_called_once()
+
+
+def _stream(deltas, read):
+    """A stream_completion stand-in recording the deltas read."""
+
+    def generate():
+        for delta in deltas:
+            read.append(delta)
+            yield delta
+
+    return generate()
+
+
+@pytest.mark.parametrize(
+    "text, complete",
+    [
+        ("3500", False),  # More digits may follow
+        ("3500\n", True),
+        ("1,2", False),
+        ("$1,234.", False),
+        ("$1,234.\n\nBecause", True),
+        ("1. First", False),  # A list marker
+        ("2025 EITC", False),  # A year opening a sentence
+        ("0.25 (25%)\n", False),
+        ("25%\n", True),
+        ("**4200**\n", True),
+        ("-$300 \n", True),
+        ("To compute this, ", False),
+        ("The credit phases in.\n**3,500**\n", True),  # After a preamble
+        ("Income is 50,000, so\n", False),
+        ("Steps:\n1. First", False),
+    ],
+)
+def test_answer_complete(text, complete):
+    assert answer_complete(text) is complete
+
+
+def test_stream_answer_stops_at_the_answer():
+    read = []
+    deltas = ["1,2", "34", "\n\n", "Because", " the", " EITC"]
+    with patch(
+        "policybench.eval_no_tools.stream_completion",
+        return_value=_stream(deltas, read),
+    ):
+        text, seconds, truncated = stream_answer("gpt-5.2", [])
+    assert text == "1,234\n\n"
+    assert read == ["1,2", "34", "\n\n"]
+    assert seconds >= 0
+    assert not truncated
+
+
+def test_stream_answer_stops_after_a_preamble():
+    read = []
+    deltas = ["Working", " it", " out:\n", "$3,", "500", "\n", "Since", " the"]
+    with patch(
+        "policybench.eval_no_tools.stream_completion",
+        return_value=_stream(deltas, read),
+    ):
+        text, _, truncated = stream_answer("gpt-5.2", [])
+    assert read == deltas[:6]
+    assert extract_number(text) == 3500.0
+    assert not truncated
+
+
+@pytest.mark.parametrize(
+    "deltas",
+    [
+        ["1", ".", " First", ",", " the", " credit", ":", " 3,200"],
+        ["2025", " EITC", " is", " 3,200"],
+    ],
+)
+def test_stream_answer_reads_verbose_answers_to_the_end(deltas):
+    with patch(
+        "policybench.eval_no_tools.stream_completion", return_value=_stream(deltas, [])
+    ):
+        text, _, truncated = stream_answer("gpt-5.2", [])
+    assert text == "".join(deltas)
+    assert not truncated
+    assert extract_number(text) == 3200.0
+
+
+def test_stream_answer_token_budget():
+    read = []
+    preamble = ["Let", " me", " think", " about", " 2025", " rules"]
+    with patch(
+        "policybench.eval_no_tools.stream_completion",
+        return_value=_stream(preamble, read),
+    ):
+        text, _, truncated = stream_answer("gpt-5.2", [], token_budget=4)
+    assert text == "Let me think about"
+    assert truncated
+
+    # A response ending exactly at the budget is whole
+    with patch(
+        "policybench.eval_no_tools.stream_completion",
+        return_value=_stream(preamble[:4], []),
+    ):
+        _, _, truncated = stream_answer("gpt-5.2", [], token_budget=4)
+    assert not truncated
+
+
+def test_run_single_no_tools_streaming(mini_scenario):
+    with patch(
+        "policybench.eval_no_tools.stream_completion",
+        return_value=_stream(["3500", " dollars", " because"], []),
+    ):
+        result = run_single_no_tools(mini_scenario, "income_tax", "m", stream=True)
+    assert result["prediction"] == 3500.0
+    assert result["raw_response"] == "3500 dollars because"
+    assert result["time_to_answer"] >= 0
+
+
+def test_run_single_no_tools_truncated_has_no_prediction(mini_scenario):
+    deltas = ["In", " 2025", " the", " phase-in", " is", " 7,830", " and"]
+    with patch(
+        "policybench.eval_no_tools.stream_completion", return_value=_stream(deltas, [])
+    ):
+        result = run_single_no_tools(
+            mini_scenario, "income_tax", "m", stream=True, token_budget=6
+        )
+    assert result["prediction"] is None
+    assert result["raw_response"] == "In 2025 the phase-in is 7,830"
+
+
+@patch("policybench.eval_no_tools.completion")
+def test_run_no_tools_eval_updates_live_metrics(mock_completion, mini_scenario):
+    """Live metrics see every prediction as it is made."""
+    message = MagicMock()
+    message.content = "4000"
+    response = MagicMock()
+    response.choices = [MagicMock(message=message)]
+    mock_completion.return_value = response
+
+    ground_truth = pd.DataFrame(
+        {"scenario_id": ["mini"], "variable": ["income_tax"], "value": [5000.0]}
+    )
+    live = StreamingMetrics(ground_truth)
+    run_no_tools_eval(
+        [mini_scenario],
+        models={"m": "model-id"},
+        programs=["income_tax", "eitc"],
+        live=live,
+    )
+
+    metrics = live.to_frame()
+    assert list(metrics["variable"]) == ["income_tax"]
+    assert metrics["mae"].iloc[0] == 1000.0
+
+
+@patch("policybench.eval_no_tools.completion")
+def test_run_no_tools_eval_keeps_row_order(mock_completion, sample_scenarios):
+    """Interleaved tasks still come back in model, scenario, variable order."""
+    message = MagicMock()
+    message.content = "1"
+    response = MagicMock()
+    response.choices = [MagicMock(message=message)]
+    mock_completion.return_value = response
+
+    df = run_no_tools_eval(
+        sample_scenarios,
+        models={"a": "claude-x", "b": "gpt-x"},
+        programs=["eitc", "snap"],
+    )
+    expected = [
+        (model, scenario.id, variable)
+        for model in ["a", "b"]
+        for scenario in sample_scenarios
+        for variable in ["eitc", "snap"]
+    ]
+    assert list(zip(df["model"], df["scenario_id"], df["variable"])) == expected
@@ -100,7 +100,7 @@ def test_run_single_with_tools_uses_tool(mock_completion, mini_scenario):
 
     mock_completion.side_effect = [first_response, second_response]
 
-    with patch("policybench.eval_with_tools.Simulation") as mock_sim:
+    with patch("policybench.engine.Simulation") as mock_sim:
         mock_calc = MagicMock()
         mock_calc.sum.return_value = 3500.50
         mock_sim.return_value.calculate.return_value = mock_calc
@@ -110,6 +110,31 @@ def test_run_single_with_tools_uses_tool(mock_completion, mini_scenario):
     assert result["used_tool"] is True
     assert result["prediction"] == 3500.50
     assert result["tool_calls"] == 1
+    assert result["tool_rounds"] == 1
+
+
+@patch("policybench.eval_with_tools.completion")
+def test_parallel_tool_calls_are_one_round(mock_completion, mini_scenario):
+    """A turn making several tool calls counts as one round."""
+    from policybench.eval_with_tools import run_single_with_tools
+
+    turn = MagicMock()
+    turn.tool_calls = [_tool_call("a", {"variable": "eitc"})] * 3
+    turn.model_dump.return_value = {"role": "assistant", "content": None}
+    answer = MagicMock()
+    answer.tool_calls = None
+    answer.content = "10"
+    mock_completion.side_effect = [
+        MagicMock(choices=[MagicMock(message=message)]) for message in (turn, answer)
+    ]
+
+    with patch(
+        "policybench.eval_with_tools.handle_tool_calls",
+        return_value=[json.dumps({"result": 10.0})] * 3,
+    ):
+        result = run_single_with_tools(mini_scenario, "eitc", "gpt-4o")
+
+    assert (result["tool_calls"], result["tool_rounds"]) == (3, 1)
 
 
 @patch("policybench.eval_with_tools.completion")
@@ -131,3 +156,123 @@ def test_run_single_no_tool_call(mock_completion, mini_scenario):
     assert result["used_tool"] is False
     assert result["prediction"] == 5000.0
     assert result["tool_calls"] == 0
+    assert result["tool_rounds"] == 0
+
+
+def _tool_call(call_id: str, arguments: dict):
+    tool_call = MagicMock()
+    tool_call.id = call_id
+    tool_call.function.arguments = json.dumps(arguments)
+    return tool_call
+
+
+def test_tool_calls_on_one_household_share_a_simulation(mini_scenario):
+    """Calls on the same household are merged; results keep call order."""
+    from policybench.eval_with_tools import handle_tool_calls
+
+    household = mini_scenario.to_pe_household()
+    other = json.loads(json.dumps(household).replace("50000.0", "60000.0"))
+    calls = [
+        _tool_call("a", {"variable": "eitc"}),
+        _tool_call("b", {"household": other, "variable": "eitc"}),
+        _tool_call("c", {"variable": "snap"}),
+        _tool_call("d", {"variable": "eitc"}),
+    ]
+
+    def fake_calculate(situation, variables, year):
+        income = situation["people"]["adult1"]["employment_income"]["2025"]
+        return {v: income / 1000 + len(v) for v in variables}
+
+    # Threads (as with the daemon), so the mock sees every call
+    with (
+        patch("policybench.eval_with_tools.daemon_pid", return_value=1),
+        patch(
+            "policybench.eval_with_tools.calculate", side_effect=fake_calculate
+        ) as mock_calc,
+    ):
+        results = handle_tool_calls(calls, fallback_household=household)
+
+    assert [json.loads(r)["result"] for r in results] == [54.0, 64.0, 54.0, 54.0]
+    assert mock_calc.call_count == 2
+    merged = next(c for c in mock_calc.call_args_list if len(c.args[1]) > 1)
+    assert merged.args[1] == ["eitc", "snap"]
+
+
+def test_tool_call_groups_run_concurrently(mini_scenario):
+    """With the daemon running, households are simulated at the same time.
+
+    The mocked calls only show that the threads overlap; the speedup also
+    needs the daemon, which simulates each request in its own process.
+    """
+    import threading
+
+    from policybench.eval_with_tools import handle_tool_calls
+
+    household = mini_scenario.to_pe_household()
+    other = json.loads(json.dumps(household).replace("CA", "NY"))
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_calculate(situation, variables, year):
+        barrier.wait()  # Raises BrokenBarrierError if run one at a time
+        return {v: 1.0 for v in variables}
+
+    calls = [
+        _tool_call("a", {"variable": "eitc"}),
+        _tool_call("b", {"household": other, "variable": "eitc"}),
+    ]
+    with (
+        patch("policybench.eval_with_tools.daemon_pid", return_value=1),
+        patch("policybench.eval_with_tools.calculate", side_effect=fake_calculate),
+    ):
+        results = handle_tool_calls(calls, fallback_household=household)
+    assert [json.loads(r) for r in results] == [{"result": 1.0}] * 2
+
+
+def test_tool_call_groups_without_daemon_use_processes(mini_scenario):
+    """Without the daemon, households are simulated in parallel processes."""
+    import multiprocessing
+    import os
+
+    from policybench.eval_with_tools import handle_tool_calls
+
+    household = mini_scenario.to_pe_household()
+    other = json.loads(json.dumps(household).replace("CA", "NY"))
+    barrier = multiprocessing.get_context("fork").Barrier(2, timeout=5)
+
+    def fake_calculate(situation, variables, year):
+        barrier.wait()  # Raises BrokenBarrierError unless both run at once
+        return {v: float(os.getpid()) for v in variables}
+
+    calls = [
+        _tool_call("a", {"variable": "eitc"}),
+        _tool_call("b", {"household": other, "variable": "eitc"}),
+    ]
+    with (
+        patch("policybench.eval_with_tools.daemon_pid", return_value=None),
+        patch("policybench.eval_with_tools.calculate", side_effect=fake_calculate),
+    ):
+        results = handle_tool_calls(calls, fallback_household=household)
+    pids = {json.loads(r)["result"] for r in results}
+    assert len(pids) == 2
+    assert os.getpid() not in pids
+
+
+def test_failed_merged_simulation_reports_each_call(mini_scenario):
+    """One invalid variable does not fail the other calls in its group."""
+    from policybench.eval_with_tools import handle_tool_calls
+
+    def fake_calculate(situation, variables, year):
+        if "not_a_variable" in variables:
+            raise ValueError("Unknown variable not_a_variable")
+        return {v: 1.0 for v in variables}
+
+    calls = [
+        _tool_call("a", {"variable": "not_a_variable"}),
+        _tool_call("b", {"variable": "eitc"}),
+    ]
+    with patch("policybench.eval_with_tools.calculate", side_effect=fake_calculate):
+        results = handle_tool_calls(
+            calls, fallback_household=mini_scenario.to_pe_household()
+        )
+    assert "Unknown variable" in json.loads(results[0])["error"]
+    assert json.loads(results[1]) == {"result": 1.0}
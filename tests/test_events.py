@@ -0,0 +1,87 @@
+"""Tests for the event log and Prometheus metrics."""
+
+import json
+import sys
+import types
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from policybench import events, llm
+from policybench.events import RunMetrics, disable_event_log, emit, enable_event_log
+
+
+@pytest.fixture
+def event_log(tmp_path):
+    enable_event_log(tmp_path / "events.jsonl", tmp_path / "policybench.prom")
+    yield tmp_path
+    disable_event_log()
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_emit_is_a_noop_when_disabled(tmp_path):
+    emit("run_start", total=1)
+    assert events._log is None
+
+
+def test_completion_emits_request_events(event_log):
+    response = MagicMock()
+    response.usage.prompt_tokens = 120
+    response.usage.completion_tokens = 3
+    response._hidden_params = {"cache_hit": True}
+    fake_litellm = types.SimpleNamespace(completion=MagicMock(return_value=response))
+
+    with patch.dict(sys.modules, {"litellm": fake_litellm}):
+        llm.completion(model="gpt-5.2", messages=[])
+        fake_litellm.completion.side_effect = RuntimeError("rate limited")
+        with pytest.raises(RuntimeError):
+            llm.completion(model="gpt-5.2", messages=[])
+
+    start, end, _, error = _records(event_log / "events.jsonl")
+    assert start["event"] == "request_start"
+    assert end["event"] == "request_end"
+    assert end["cache_hit"] is True
+    assert end["prompt_tokens"] == 120
+    assert end["tools"] is False
+    assert error["event"] == "request_error"
+    assert "rate limited" in error["error"]
+
+
+def test_metrics_file(event_log):
+    emit("run_start", condition="no_tools", total=4)
+    emit("request_start", model="m")
+    emit("request_end", model="m")
+    emit("request_start", model="m")
+    emit("request_error", model="m")
+    emit("request_start", model="m")
+    emit("task_end", model="m", ok=True)
+    emit("coalesced", model="m")
+    emit("hedge", model="m", after=3.2)
+    emit("concurrency", provider="openai", limit=6, reason="increase")
+    emit("checkpoint", path="x.csv", rows=1)
+
+    text = (event_log / "policybench.prom").read_text()
+    assert "# TYPE policybench_requests_total counter" in text
+    assert 'policybench_requests_total{model="m"} 2' in text
+    assert 'policybench_request_errors_total{model="m"} 1' in text
+    assert 'policybench_coalesced_requests_total{model="m"} 1' in text
+    assert 'policybench_hedges_total{model="m"} 1' in text
+    assert "policybench_requests_in_flight 1" in text
+    assert "policybench_error_rate 0.5" in text
+    assert "policybench_tasks_done 1" in text
+    assert "policybench_tasks_total 4" in text
+    assert 'policybench_concurrency_limit{provider="openai"} 6' in text
+    assert not (event_log / "policybench.prom.tmp").exists()
+
+
+def test_eta_from_throughput(tmp_path):
+    metrics = RunMetrics(tmp_path / "m.prom")
+    metrics.update({"event": "run_start", "ts": 100.0, "total": 10})
+    assert "policybench_eta_seconds NaN" in metrics.render(100.0)
+    for _ in range(2):
+        metrics.update({"event": "task_end", "ts": 101.0})
+    assert metrics.throughput(104.0) == 0.5
+    assert "policybench_eta_seconds 16\n" in metrics.render(104.0)
@@ -0,0 +1,56 @@
+"""Tests for the web app data export."""
+
+import json
+
+import pandas as pd
+
+from policybench.export_app import EXAMPLE_CHUNK_SIZE, export_app_data
+from policybench.scenarios import generate_scenarios
+
+
+def _load(path):
+    return json.loads(path.read_text())
+
+
+def test_export_app_data(tmp_path):
+    scenarios = generate_scenarios(n=6, seed=0)
+    ids = [s.id for s in scenarios]
+    ground_truth = pd.DataFrame(
+        {
+            "scenario_id": ids * 2,
+            "variable": ["eitc"] * 6 + ["is_medicaid_eligible"] * 6,
+            "value": [1000.0] * 6 + [1.0] * 6,
+        }
+    )
+    no_tools = ground_truth.assign(
+        model="m",
+        prediction=[100.0 * (i + 1) for i in range(6)] + [0.0] * 6,
+    ).drop(columns="value")
+    with_tools = ground_truth.rename(columns={"value": "prediction"}).assign(model="m")
+
+    # Stale chunks from an earlier, larger export are removed
+    (tmp_path / "examples").mkdir()
+    (tmp_path / "examples" / "099.json").write_text("[]")
+
+    export_app_data(ground_truth, no_tools, with_tools, scenarios, tmp_path)
+
+    manifest = _load(tmp_path / "manifest.json")
+    assert manifest["models"] == ["m"]
+    assert manifest["programs"] == ["eitc", "is_medicaid_eligible"]
+    assert manifest["observations"] == {"no_tools": 12, "with_tools": 12}
+
+    chunks = sorted((tmp_path / "examples").glob("*.json"))
+    assert len(chunks) == manifest["example_chunks"] == 2
+    examples = [e for chunk in chunks for e in _load(chunk)]
+    assert len(_load(chunks[0])) == EXAMPLE_CHUNK_SIZE
+    assert len(examples) == 6
+    # Largest miss without tools comes first
+    assert examples[0]["no_tools_prediction"] == 100
+    assert examples[0]["with_tools_prediction"] == 1000
+
+    summary = _load(tmp_path / "summary.json")
+    assert summary["overall"]["pct_within_10_with_tools"] == 100.0
+
+    programs = {p["program"]: p for p in _load(tmp_path / "programs.json")}
+    assert programs["is_medicaid_eligible"]["pct_within_10_no_tools"] is None
+    assert programs["eitc"]["mae_with_tools"] == 0.0
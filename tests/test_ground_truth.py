@@ -3,7 +3,12 @@
 import pandas as pd
 import pytest
 
-from policybench.ground_truth import calculate_ground_truth, calculate_single
+from policybench.ground_truth import (
+    _combined_situation,
+    calculate_ground_truth,
+    calculate_marginal_tax_rates,
+    calculate_single,
+)
 from policybench.scenarios import Person, Scenario
 
 
@@ -33,6 +38,29 @@ def family_low_income():
     )
 
 
+@pytest.fixture
+def couple_one_earner():
+    return Scenario(
+        id="gt_couple",
+        state="TX",
+        filing_status="married_filing_jointly",
+        adults=[
+            Person(name="adult1", age=52, employment_income=0.0),
+            Person(name="adult2", age=42, employment_income=75_000.0),
+        ],
+        year=2025,
+    )
+
+
+def test_combined_situation(single_50k, family_low_income):
+    situation, person_scenario = _combined_situation([single_50k, family_low_income])
+    assert person_scenario == [0, 1, 1, 1]
+    assert list(situation["people"])[1] == "gt_family_low/adult1"
+    household = situation["households"]["gt_family_low/household"]
+    assert household["state_code"] == {"2025": "NY"}
+    assert len(household["members"]) == 3
+
+
 @pytest.mark.slow
 class TestGroundTruth:
     """Tests that require PolicyEngine-US (slow)."""
@@ -88,3 +116,24 @@ class TestGroundTruth:
         )
         assert len(df) == 2
         assert set(df["scenario_id"]) == {"gt_single_50k", "gt_family_low"}
+
+    def test_batched_marginal_tax_rates(
+        self, single_50k, family_low_income, couple_one_earner
+    ):
+        """The batched pass matches PolicyEngine-US household by household."""
+        two_earners = Scenario(
+            id="gt_two_earners",
+            state="GA",
+            filing_status="married_filing_jointly",
+            adults=[
+                Person(name="adult1", age=38, employment_income=40_000.0),
+                Person(name="adult2", age=36, employment_income=25_000.0),
+            ],
+            children=[Person(name="child1", age=6, employment_income=0.0)],
+            year=2025,
+        )
+        scenarios = [single_50k, family_low_income, couple_one_earner, two_earners]
+        rates = calculate_marginal_tax_rates(scenarios)
+        for scenario in scenarios:
+            expected = calculate_single(scenario, "marginal_tax_rate")
+            assert rates[scenario.id] == pytest.approx(expected, abs=1e-4)
@@ -0,0 +1,121 @@
+"""Tests for hedged LLM requests."""
+
+import threading
+import time
+
+import pytest
+
+from policybench.events import emit
+from policybench.hedge import MIN_SAMPLES, Hedger, disable_hedging, enable_hedging
+
+
+def _warm(hedger: Hedger, model: str = "m", seconds: float = 0.01):
+    for _ in range(MIN_SAMPLES):
+        hedger.observe({"event": "request_end", "model": model, "seconds": seconds})
+
+
+def _slow_then_fast(release: threading.Event):
+    """fn whose first call hangs until released and later calls return."""
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)
+            return "slow"
+        return "fast"
+
+    return fn, calls
+
+
+def test_threshold_needs_samples():
+    hedger = Hedger(percentile=0.5)
+    hedger.observe({"event": "request_end", "model": "m", "seconds": 9.0})
+    hedger.observe({"event": "request_end", "model": "m", "cache_hit": True})
+    assert hedger.threshold("m") is None
+    for seconds in range(MIN_SAMPLES):
+        hedger.observe({"event": "request_end", "model": "m", "seconds": seconds})
+    assert hedger.threshold("m") == 9.0  # Median of 0..19 and 9
+    assert hedger.threshold("other") is None
+
+
+@pytest.mark.parametrize(
+    "percentile, budget", [(95, 0.05), (0, 0.05), (1, 0.05), (0.95, -0.1), (0.95, 2)]
+)
+def test_rejects_out_of_range_settings(percentile, budget):
+    with pytest.raises(ValueError):
+        Hedger(percentile, budget)
+
+
+def test_slow_request_is_hedged():
+    hedger = Hedger(budget=1.0)
+    _warm(hedger)
+    release = threading.Event()
+    fn, calls = _slow_then_fast(release)
+    try:
+        start = time.perf_counter()
+        assert hedger.call("m", fn) == "fast"
+        assert time.perf_counter() - start < 1
+    finally:
+        release.set()
+        hedger.close()
+    assert len(calls) == 2
+    assert (hedger.hedges, hedger.wins) == (1, 1)
+
+
+def test_fast_request_is_not_hedged():
+    hedger = Hedger(budget=1.0)
+    _warm(hedger, seconds=1.0)
+    assert hedger.call("m", lambda: "answer") == "answer"
+    assert hedger.hedges == 0
+    hedger.close()
+
+
+def test_budget_caps_hedges():
+    hedger = Hedger(budget=0.0)
+    _warm(hedger, seconds=0.001)
+    release = threading.Event()
+    fn, calls = _slow_then_fast(release)
+    threading.Timer(0.05, release.set).start()
+    assert hedger.call("m", fn) == "slow"
+    assert len(calls) == 1
+    assert hedger.hedges == 0
+    hedger.close()
+
+
+def test_failed_request_falls_back_to_the_other():
+    hedger = Hedger(budget=1.0)
+    _warm(hedger, seconds=0.001)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.05)
+            raise RuntimeError("overloaded")
+        time.sleep(0.1)
+        return "backup"
+
+    assert hedger.call("m", fn) == "backup"
+    hedger.close()
+
+
+def test_error_without_hedge_propagates():
+    def fn():
+        raise RuntimeError("overloaded")
+
+    hedger = Hedger(budget=0.0)
+    _warm(hedger, seconds=0.001)
+    with pytest.raises(RuntimeError, match="overloaded"):
+        hedger.call("m", fn)
+    hedger.close()
+
+
+def test_enable_hedging_listens_to_request_events():
+    hedger = enable_hedging()
+    try:
+        for _ in range(MIN_SAMPLES):
+            emit("request_end", model="m", seconds=2.0, cache_hit=False)
+    finally:
+        disable_hedging()
+    assert hedger.threshold("m") == 2.0
@@ -0,0 +1,166 @@
+"""Tests for LiteLLM access: coalescing, hedging and streaming."""
+
+import json
+import sys
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from policybench import llm
+from policybench.llm import SingleFlight, request_key
+
+
+def _gated(result=None, error=None):
+    """A function that blocks until released, counting its calls."""
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        if error is not None:
+            raise error
+        return result
+
+    return fn, release, calls
+
+
+def _wait_for(flight: SingleFlight, coalesced: int):
+    for _ in range(500):
+        if flight.coalesced == coalesced:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f"{flight.coalesced} calls coalesced, not {coalesced}")
+
+
+def test_identical_calls_in_flight_share_one_call():
+    flight = SingleFlight()
+    fn, release, calls = _gated(result="answer")
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(flight.do, "k", fn) for _ in range(4)]
+        _wait_for(flight, 3)
+        release.set()
+        outcomes = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert sorted(outcomes) == [("answer", False)] + [("answer", True)] * 3
+
+
+def test_error_fans_out_to_waiting_calls():
+    flight = SingleFlight()
+    fn, release, calls = _gated(error=RuntimeError("overloaded"))
+    with ThreadPoolExecutor(2) as pool:
+        futures = [pool.submit(flight.do, "k", fn) for _ in range(2)]
+        _wait_for(flight, 1)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="overloaded"):
+                future.result()
+    assert len(calls) == 1
+
+
+def test_finished_calls_are_not_reused():
+    flight = SingleFlight()
+    assert flight.do("k", lambda: 1) == (1, False)
+    assert flight.do("k", lambda: 2) == (2, False)
+    assert flight.coalesced == 0
+
+
+def test_request_key():
+    messages = [{"role": "user", "content": "EITC?"}]
+    key = request_key({"model": "m", "messages": messages, "caching": True})
+    assert key == request_key({"caching": True, "messages": messages, "model": "m"})
+    assert key != request_key({"model": "other", "messages": messages})
+
+
+def test_completion_coalesces_identical_requests():
+    release = threading.Event()
+    response = MagicMock(_hidden_params={})
+
+    def upstream(**kwargs):
+        release.wait(5)
+        return response
+
+    fake_litellm = types.SimpleNamespace(completion=MagicMock(side_effect=upstream))
+    flight = SingleFlight()
+    with (
+        patch.dict(sys.modules, {"litellm": fake_litellm}),
+        patch.object(llm, "single_flight", flight),
+        ThreadPoolExecutor(3) as pool,
+    ):
+        futures = [
+            pool.submit(llm.completion, model="m", messages=[{"content": "q"}])
+            for _ in range(3)
+        ]
+        _wait_for(flight, 2)
+        release.set()
+        assert all(future.result() is response for future in futures)
+    assert fake_litellm.completion.call_count == 1
+
+
+def _chunk(text):
+    return types.SimpleNamespace(
+        choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=text))]
+    )
+
+
+def test_stream_completion_closes_early(tmp_path):
+    from policybench.cassette import disable_cassette, enable_cassette
+    from policybench.events import disable_event_log, enable_event_log
+
+    upstream = MagicMock()
+    upstream.__iter__.return_value = iter([_chunk("42"), _chunk("\n"), _chunk("x")])
+    fake_litellm = types.SimpleNamespace(completion=MagicMock(return_value=upstream))
+    cassette = tmp_path / "cassette.jsonl.gz"
+    enable_event_log(tmp_path / "events.jsonl")
+    enable_cassette(cassette, "record")
+    try:
+        with patch.dict(sys.modules, {"litellm": fake_litellm}):
+            stream = llm.stream_completion(model="m", messages=[])
+            assert next(stream) == "42"
+            stream.close()
+        disable_cassette()
+        enable_cassette(cassette, "replay")
+        replayed = list(llm.stream_completion(model="m", messages=[]))
+    finally:
+        disable_cassette()
+        disable_event_log()
+
+    upstream.completion_stream.close.assert_called_once()
+    assert fake_litellm.completion.call_args.kwargs["stream"] is True
+    records = [json.loads(line) for line in open(tmp_path / "events.jsonl")]
+    end = records[-1]
+    assert end["event"] == "request_end"
+    assert end["stopped_early"] is True
+    assert end["completion_tokens"] == 1
+    assert replayed == ["42"]
+
+
+def test_hedged_duplicate_is_not_coalesced():
+    from policybench.hedge import MIN_SAMPLES, disable_hedging, enable_hedging
+
+    release = threading.Event()
+    responses = [MagicMock(_hidden_params={}), MagicMock(_hidden_params={})]
+
+    def upstream(**kwargs):
+        if upstream.calls == 0:
+            upstream.calls += 1
+            release.wait(5)
+            return responses[0]
+        return responses[1]
+
+    upstream.calls = 0
+    fake_litellm = types.SimpleNamespace(completion=upstream)
+    hedger = enable_hedging(budget=1.0)
+    for _ in range(MIN_SAMPLES):
+        hedger.observe({"event": "request_end", "model": "m", "seconds": 0.01})
+    try:
+        with patch.dict(sys.modules, {"litellm": fake_litellm}):
+            assert llm.completion(model="m", messages=[]) is responses[1]
+    finally:
+        release.set()
+        disable_hedging()
+    assert hedger.wins == 1
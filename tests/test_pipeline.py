@@ -0,0 +1,103 @@
+"""Tests for the stage-aware pipeline."""
+
+import threading
+
+import pytest
+
+from policybench.pipeline import Stage, benchmark_stages, plan, run_pipeline
+
+
+def _stages(tmp_path, calls, inputs=None, barrier=None):
+    """a and b are independent; c depends on both."""
+
+    def work(name):
+        def run():
+            if barrier is not None and name in ("a", "b"):
+                barrier.wait(timeout=5)
+            calls.append(name)
+            (tmp_path / f"{name}.out").write_text(name)
+
+        return run
+
+    inputs = inputs or {}
+    return [
+        Stage(name, [str(tmp_path / f"{name}.out")], work(name), inputs.get(name, {}))
+        for name in ("a", "b")
+    ] + [
+        Stage(
+            "c",
+            [str(tmp_path / "c.out")],
+            work("c"),
+            inputs.get("c", {}),
+            deps=["a", "b"],
+        )
+    ]
+
+
+def test_second_run_skips_up_to_date_stages(tmp_path):
+    calls = []
+    state = tmp_path / "state.json"
+    status = run_pipeline(_stages(tmp_path, calls), state)
+    assert status == {"a": "ran", "b": "ran", "c": "ran"}
+    assert calls[-1] == "c"
+
+    calls.clear()
+    status = run_pipeline(_stages(tmp_path, calls), state)
+    assert set(status.values()) == {"skipped"}
+    assert calls == []
+
+
+def test_changed_input_reruns_stage_and_dependents(tmp_path):
+    calls = []
+    state = tmp_path / "state.json"
+    run_pipeline(_stages(tmp_path, calls), state)
+
+    calls.clear()
+    stages = _stages(tmp_path, calls, inputs={"a": {"models": ["new"]}})
+    assert plan(stages, state) == {"a": "run", "b": "skip", "c": "run"}
+    run_pipeline(stages, state)
+    assert sorted(calls) == ["a", "c"]
+
+
+def test_missing_output_reruns_stage(tmp_path):
+    calls = []
+    state = tmp_path / "state.json"
+    run_pipeline(_stages(tmp_path, calls), state)
+    (tmp_path / "b.out").unlink()
+    assert plan(_stages(tmp_path, calls), state)["b"] == "run"
+
+
+def test_independent_stages_run_concurrently(tmp_path):
+    # a and b each wait for the other; run serially, the barrier times out
+    calls = []
+    barrier = threading.Barrier(2)
+    status = run_pipeline(
+        _stages(tmp_path, calls, barrier=barrier), tmp_path / "state.json"
+    )
+    assert status["c"] == "ran"
+
+
+def test_failed_stage_blocks_dependents(tmp_path):
+    def fail():
+        raise RuntimeError("boom")
+
+    stages = _stages(tmp_path, [])
+    stages[0].run = fail
+    status = run_pipeline(stages, tmp_path / "state.json")
+    assert status == {"a": "failed", "b": "ran", "c": "blocked"}
+
+
+def test_unknown_dependency(tmp_path):
+    stage = Stage("x", [], lambda: None, deps=["missing"])
+    with pytest.raises(ValueError):
+        plan([stage], tmp_path / "state.json")
+
+
+def test_benchmark_stage_graph(sample_scenarios):
+    stages = {stage.name: stage for stage in benchmark_stages(sample_scenarios)}
+    assert list(stages) == ["ground_truth", "no_tools", "with_tools", "analyze"]
+    assert stages["analyze"].deps == ["ground_truth", "no_tools", "with_tools"]
+    assert (
+        stages["no_tools"].inputs["scenarios"]
+        == stages["ground_truth"].inputs["scenarios"]
+    )
@@ -0,0 +1,96 @@
+"""Tests for the cost and wall-time planner."""
+
+import json
+import math
+import os
+
+import pandas as pd
+
+from policybench.planner import (
+    count_tokens,
+    load_history,
+    model_prices,
+    plan_costs,
+    tiktoken_cache_dir,
+)
+
+MODELS = {"m": "gpt-5.2"}
+
+
+def test_count_tokens(monkeypatch):
+    monkeypatch.setenv("TIKTOKEN_CACHE_DIR", str(tiktoken_cache_dir()))
+    counts = count_tokens(["", "What is the EITC for this household?"])
+    assert counts[0] == 0
+    assert 5 <= counts[1] <= 15
+
+
+def test_count_tokens_leaves_environment_alone(monkeypatch):
+    monkeypatch.delenv("TIKTOKEN_CACHE_DIR", raising=False)
+    count_tokens(["x"])
+    assert "TIKTOKEN_CACHE_DIR" not in os.environ
+
+
+def test_model_prices():
+    prices = model_prices(["gemini/gemini-3-pro-preview", "no-such-model"])
+    assert prices["gemini/gemini-3-pro-preview"] == (2.00 / 1e6, 12.00 / 1e6)
+    assert all(math.isnan(p) for p in prices["no-such-model"])
+
+
+def test_plan_costs_uses_history(sample_scenarios):
+    history = {
+        ("m", False): {"latency": 2.0, "output_tokens": 5, "cache_hit_rate": 0.5},
+        ("m", True): {"latency": 4.0, "tool_rounds": 1.0},
+    }
+    df = plan_costs(sample_scenarios, MODELS, ["eitc", "snap"], 2, history)
+    rows = df.set_index("condition")
+    n_tasks = len(sample_scenarios) * 2
+
+    assert rows.loc["no_tools", "requests"] == n_tasks
+    assert rows.loc["no_tools", "output_tokens"] == n_tasks * 5
+    assert rows.loc["no_tools", "hours"] == n_tasks * 0.5 * 2.0 / 2 / 3600
+    assert rows.loc["with_tools", "requests"] == 2 * n_tasks
+    assert rows.loc["with_tools", "simulations"] == n_tasks
+    assert rows.loc["with_tools", "cost_usd"] > rows.loc["no_tools", "cost_usd"] > 0
+    assert rows.loc["ground_truth", "simulations"] == len(sample_scenarios)
+
+
+def test_fully_cached_run_is_free(sample_scenarios):
+    history = {("m", False): {"cache_hit_rate": 1.0}}
+    df = plan_costs(sample_scenarios, MODELS, ["eitc"], 1, history)
+    no_tools = df[df["condition"] == "no_tools"].iloc[0]
+    assert no_tools["cost_usd"] == 0
+    assert no_tools["hours"] == 0
+
+
+def test_load_history(tmp_path):
+    pd.DataFrame(
+        {"model": ["m", "m"], "raw_response": ["100", "The answer is 100"]}
+    ).to_csv(tmp_path / "no_tools.csv", index=False)
+    pd.DataFrame(
+        {
+            "model": ["m", "m"],
+            "used_tool": [True, False],
+            "tool_calls": [3, 0],
+            "tool_rounds": [2, 0],
+        }
+    ).to_csv(tmp_path / "with_tools.csv", index=False)
+    end = {"event": "request_end", "model": "gpt-5.2", "tools": False}
+    events = [
+        {"event": "run_start", "condition": "no_tools", "total": 3},
+        {"event": "request_start", "model": "gpt-5.2", "tools": False},
+        {**end, "seconds": 1.0, "cache_hit": False},
+        {**end, "seconds": 3.0, "cache_hit": False},
+        {**end, "seconds": 0.0, "cache_hit": True},
+    ]
+    (tmp_path / "events.jsonl").write_text("\n".join(map(json.dumps, events)))
+
+    history = load_history(
+        MODELS,
+        tmp_path / "events.jsonl",
+        tmp_path / "no_tools.csv",
+        tmp_path / "with_tools.csv",
+    )
+    assert history[("m", False)]["latency"] == 2.0
+    assert history[("m", False)]["cache_hit_rate"] == 1 / 3
+    assert history[("m", False)]["output_tokens"] > 1
+    assert history[("m", True)]["tool_rounds"] == 1.0
@@ -0,0 +1,45 @@
+"""Tests for spans and the sampling profiler."""
+
+import time
+
+from policybench import profiling
+from policybench.profiling import Profiler, span
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_spans_are_free_when_disabled():
+    profiling._totals.clear()
+    with span("ignored"):
+        pass
+    assert profiling._totals == {}
+
+
+def test_profiler_writes_spans_and_folded_stacks(tmp_path):
+    @span("eval.completion")
+    def complete():
+        _busy(0.01)
+
+    with Profiler(tmp_path, name="test", interval=0.001):
+        with span("ground_truth.simulation"):
+            _busy(0.05)
+        for _ in range(3):
+            complete()
+
+    spans = (tmp_path / "test.spans.tsv").read_text().splitlines()
+    assert spans[0] == "span\tcount\ttotal_seconds\tmean_ms"
+    rows = {line.split("\t")[0]: line.split("\t") for line in spans[1:]}
+    assert rows["eval.completion"][1] == "3"
+    assert float(rows["ground_truth.simulation"][2]) >= 0.05
+
+    folded = (tmp_path / "test.folded").read_text().splitlines()
+    assert any(line.startswith("ground_truth.simulation;") for line in folded)
+    # Stacks end in a sample count
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded)
+
+    # Profiling is off again afterwards
+    assert not profiling._enabled
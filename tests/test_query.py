@@ -0,0 +1,164 @@
+"""Tests for the DuckDB query layer over stored runs."""
+
+import pandas as pd
+import pytest
+
+from policybench.analysis import compute_metrics
+from policybench.scenarios import Person, Scenario
+from policybench.store import write_predictions
+
+pytest.importorskip("duckdb")
+
+from policybench.query import connect, query  # noqa: E402
+
+
+@pytest.fixture
+def scenarios():
+    return [
+        Scenario(
+            id="s1",
+            state="CA",
+            filing_status="single",
+            adults=[Person(name="adult1", age=35, employment_income=20_000.0)],
+        ),
+        Scenario(
+            id="s2",
+            state="TX",
+            filing_status="joint",
+            adults=[
+                Person(name="adult1", age=40, employment_income=70_000.0),
+                Person(name="adult2", age=38, employment_income=60_000.0),
+            ],
+            children=[Person(name="child1", age=4, employment_income=0.0)],
+        ),
+    ]
+
+
+@pytest.fixture
+def ground_truth():
+    return pd.DataFrame(
+        {
+            "scenario_id": ["s1", "s2", "s1", "s2"],
+            "variable": ["income_tax"] * 2 + ["is_medicaid_eligible"] * 2,
+            "value": [800.0, 0.0, 1.0, 0.0],
+        }
+    )
+
+
+@pytest.fixture
+def store(tmp_path, ground_truth):
+    for run, scale in [("r1", 1.0), ("r2", 1.5)]:
+        predictions = pd.DataFrame(
+            {
+                "model": ["m"] * 4,
+                "scenario_id": ground_truth["scenario_id"],
+                "variable": ground_truth["variable"],
+                "prediction": [800.0 * scale, 0.0, 1.0, 1.0],
+                "raw_response": ["x"] * 4,
+            }
+        )
+        write_predictions(predictions, run, "no_tools", tmp_path / "store")
+    ground_truth.to_csv(tmp_path / "ground_truth.csv", index=False)
+    return tmp_path
+
+
+def test_views(store, scenarios):
+    con = connect(store / "store", store / "ground_truth.csv", scenarios=scenarios)
+    tables = set(con.execute("SHOW TABLES").df()["name"])
+    assert {"predictions", "ground_truth", "scenarios", "results"} <= tables
+    assert con.execute("SELECT count(*) FROM results").fetchone()[0] == 8
+
+
+def test_slice_by_manifest(store, scenarios):
+    df = query(
+        """
+        SELECT run, income_band, avg(within_10pct) AS within_10pct
+        FROM results
+        WHERE variable = 'income_tax'
+        GROUP BY ALL ORDER BY ALL
+        """,
+        store_root=store / "store",
+        ground_truth_path=store / "ground_truth.csv",
+        scenarios=scenarios,
+    )
+    assert list(df["income_band"]) == ["100k_200k", "under_25k"] * 2
+    assert list(df["within_10pct"]) == [1.0, 1.0, 1.0, 0.0]
+
+
+def test_results_match_compute_metrics(store, scenarios, ground_truth):
+    df = query(
+        """
+        SELECT model, variable, count(*) AS n, avg(abs_error) AS mae,
+            avg(rel_error) AS mape, avg(correct) AS accuracy,
+            avg(within_10pct) AS within_10pct
+        FROM results WHERE run = 'r2'
+        GROUP BY ALL ORDER BY ALL
+        """,
+        store_root=store / "store",
+        ground_truth_path=store / "ground_truth.csv",
+        scenarios=scenarios,
+    )
+    predictions = pd.DataFrame(
+        {
+            "model": ["m"] * 4,
+            "scenario_id": ground_truth["scenario_id"],
+            "variable": ground_truth["variable"],
+            "prediction": [1200.0, 0.0, 1.0, 1.0],
+        }
+    )
+    pd.testing.assert_frame_equal(
+        df, compute_metrics(ground_truth, predictions), check_dtype=False
+    )
+
+
+def test_results_skip_missing_predictions(tmp_path, scenarios, ground_truth):
+    predictions = pd.DataFrame(
+        {
+            "model": ["m"] * 4,
+            "scenario_id": ground_truth["scenario_id"],
+            "variable": ground_truth["variable"],
+            "prediction": [900.0, None, 1.0, None],
+        }
+    )
+    write_predictions(predictions, "r1", "no_tools", tmp_path / "store")
+    ground_truth.to_csv(tmp_path / "ground_truth.csv", index=False)
+
+    df = query(
+        """
+        SELECT model, variable, count(*) AS n, avg(abs_error) AS mae,
+            avg(rel_error) AS mape, avg(correct) AS accuracy,
+            avg(within_10pct) AS within_10pct
+        FROM results
+        GROUP BY ALL ORDER BY ALL
+        """,
+        store_root=tmp_path / "store",
+        ground_truth_path=tmp_path / "ground_truth.csv",
+        scenarios=scenarios,
+    )
+    pd.testing.assert_frame_equal(
+        df, compute_metrics(ground_truth, predictions), check_dtype=False
+    )
+
+
+def test_responses_view(store, scenarios):
+    df = query(
+        """
+        SELECT DISTINCT r.text
+        FROM predictions AS p JOIN responses AS r ON p.response_hash = r.hash
+        """,
+        store_root=store / "store",
+        ground_truth_path=store / "ground_truth.csv",
+        scenarios=scenarios,
+    )
+    assert list(df["text"]) == ["x"]
+
+
+def test_empty_store(tmp_path, ground_truth, scenarios):
+    ground_truth.to_csv(tmp_path / "ground_truth.csv", index=False)
+    df = query(
+        "SELECT count(*) AS n FROM results",
+        store_root=tmp_path / "missing",
+        ground_truth_path=tmp_path / "ground_truth.csv",
+        scenarios=scenarios,
+    )
+    assert df["n"].iloc[0] == 0
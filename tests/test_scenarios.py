@@ -138,3 +138,18 @@ def test_scenario_covers_variety():
     assert len(states) >= 5
     assert len(statuses) >= 2
     assert len(incomes) >= 5
+
+
+def test_income_band(simple_single_scenario, family_scenario):
+    """Income bands bracket total household income."""
+    assert simple_single_scenario.income_band == "50k_100k"
+    assert family_scenario.income_band == "100k_200k"
+
+
+def test_manifest_row(family_scenario):
+    """Manifest rows flatten the household for slicing results."""
+    row = family_scenario.to_manifest_row()
+    assert row["scenario_id"] == "test_family"
+    assert row["num_adults"] == 2
+    assert row["num_children"] == 2
+    assert row["total_income"] == 100_000.0
@@ -0,0 +1,134 @@
+"""Tests for interleaved cross-provider scheduling."""
+
+import threading
+import time
+
+import pytest
+
+from policybench.events import add_listener, emit, remove_listener
+from policybench.scheduler import (
+    LATENCY_TOLERANCE,
+    AIMDLimit,
+    Scheduler,
+    is_overload,
+    make_tasks,
+    provider_of,
+    run_interleaved,
+)
+
+
+def test_provider_of():
+    assert provider_of("claude-opus-4-6") == "anthropic"
+    assert provider_of("gpt-5.2") == "openai"
+    assert provider_of("gemini/gemini-3-pro-preview") == "gemini"
+    assert provider_of("local-model") == "local-model"
+
+
+def test_models_of_a_provider_alternate(sample_scenarios):
+    models = {"a": "claude-a", "b": "claude-b"}
+    tasks = make_tasks(models, sample_scenarios[:2], ["eitc"])
+    order = [task.model_name for task, _ in run_interleaved(tasks, lambda task: {}, 1)]
+    assert order == ["a", "b", "a", "b"]
+
+
+def test_providers_run_side_by_side(sample_scenarios):
+    models = {"slow": "claude-x", "fast": "gpt-x"}
+    tasks = make_tasks(models, sample_scenarios[:3], ["eitc", "snap"])
+    lock = threading.Lock()
+    in_flight = {"anthropic": 0, "openai": 0}
+    peak = dict(in_flight)
+
+    def run(task):
+        provider = provider_of(task.model_id)
+        with lock:
+            in_flight[provider] += 1
+            peak[provider] = max(peak[provider], in_flight[provider])
+        time.sleep(0.1 if provider == "anthropic" else 0.01)
+        with lock:
+            in_flight[provider] -= 1
+        return {"prediction": 1.0}
+
+    start = time.perf_counter()
+    finished = [task.model_name for task, _ in run_interleaved(tasks, run, 2)]
+    elapsed = time.perf_counter() - start
+
+    assert sorted(finished) == sorted(task.model_name for task in tasks)
+    assert peak == {"anthropic": 2, "openai": 2}
+    # The fast provider finishes first instead of waiting behind the slow one
+    assert finished[: finished.count("fast")] == ["fast"] * finished.count("fast")
+    # Roughly the slow provider's own time: 3 rounds of 0.1s
+    assert elapsed < 0.3 + 0.15
+
+
+def test_errors_propagate(sample_scenarios):
+    tasks = make_tasks({"m": "gpt-x"}, sample_scenarios[:3], ["eitc"])
+
+    def run(task):
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        list(run_interleaved(tasks, run))
+
+
+def test_aimd_grows_additively_and_backs_off():
+    limit = AIMDLimit(4, maximum=6)
+    for _ in range(4):
+        limit.success(1.0)
+    assert limit.limit == 4  # 4 + 1/4 + 1/4.25 + ...
+    for _ in range(20):
+        limit.success(1.0)
+    assert limit.limit == 6  # Capped at the maximum
+
+    limit.overload(now=100.0)
+    assert limit.limit == 3
+    limit.overload(now=100.5)  # Same round trip: not counted again
+    assert limit.limit == 3
+    limit.overload(now=102.0)
+    assert limit.limit == 1
+    limit.overload(now=104.0)
+    assert limit.limit == 1  # Never below the minimum
+
+
+def test_aimd_holds_when_latency_degrades():
+    limit = AIMDLimit(4)
+    limit.success(1.0)
+    value = limit.value
+    for _ in range(20):
+        limit.success(10.0)
+    assert limit.latency > LATENCY_TOLERANCE * limit.best_latency
+    assert limit.value < value + 3
+
+
+def test_is_overload():
+    assert is_overload({"status": 429})
+    assert is_overload({"error": "Timeout('request timed out')"})
+    assert not is_overload({"status": 400, "error": "BadRequestError('no')"})
+
+
+def test_scheduler_adapts_to_request_events(sample_scenarios):
+    tasks = make_tasks({"m": "gpt-x"}, sample_scenarios * 4, ["eitc"])
+    changes = []
+
+    def listener(record):
+        if record["event"] == "concurrency":
+            changes.append((record["limit"], record["reason"]))
+
+    def run(task):
+        emit("request_start", model=task.model_id)
+        if task.scenario.id == sample_scenarios[0].id:
+            emit("request_error", model=task.model_id, status=429, seconds=0.01)
+        else:
+            emit("request_end", model=task.model_id, seconds=0.01, cache_hit=False)
+        return {}
+
+    scheduler = Scheduler(concurrency=4)
+    add_listener(listener)
+    try:
+        results = list(scheduler.run(tasks, run))
+    finally:
+        remove_listener(listener)
+
+    assert len(results) == len(tasks)
+    assert changes[0] == (4, "start")
+    assert any(reason == "backoff" for _, reason in changes)
+    assert scheduler.describe().startswith("openai=")
@@ -0,0 +1,102 @@
+"""Tests for the ground-truth shortcut for tool calls."""
+
+import copy
+import json
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from policybench.eval_with_tools import handle_tool_call
+from policybench.scenarios import Person, Scenario
+from policybench.shortcut import GroundTruthIndex, household_key
+
+
+@pytest.fixture
+def family():
+    return Scenario(
+        id="family",
+        state="NY",
+        filing_status="head_of_household",
+        adults=[Person(name="adult1", age=30, employment_income=15_000.0)],
+        children=[Person(name="child1", age=8, employment_income=0.0)],
+        year=2025,
+    )
+
+
+@pytest.fixture
+def index(family):
+    ground_truth = pd.DataFrame(
+        {
+            "scenario_id": ["family", "family"],
+            "variable": ["eitc", "marginal_tax_rate"],
+            "value": [4000.0, 0.3],
+        }
+    )
+    return GroundTruthIndex([family], ground_truth)
+
+
+def _tool_call(arguments: dict):
+    tool_call = MagicMock()
+    tool_call.function.arguments = json.dumps(arguments)
+    return tool_call
+
+
+def test_household_key_ignores_names_and_number_types(family):
+    household = family.to_pe_household()
+    renamed = json.loads(
+        json.dumps(household)
+        .replace("adult1", "parent")
+        .replace("child1", "kid")
+        .replace('"household"', '"home"')
+        .replace("15000.0", "15000")
+    )
+    renamed["households"]["home"]["members"].reverse()
+    assert household_key(renamed) == household_key(household)
+
+
+def test_household_key_changes_with_inputs(family):
+    household = family.to_pe_household()
+    raised = copy.deepcopy(household)
+    raised["people"]["adult1"]["employment_income"]["2025"] += 1_000
+    assert household_key(raised) != household_key(household)
+    assert household_key({"people": []}) is None
+    assert (
+        household_key({"people": {}, "households": {"h": {"members": ["x"]}}}) is None
+    )
+
+
+def test_lookup_counts_hits(family, index):
+    household = family.to_pe_household()
+    assert index.lookup(household, "eitc", 2025) == 4000.0
+    assert index.lookup(household, "eitc", "2025") == 4000.0
+    assert index.lookup(household, "snap", 2025) is None
+    assert index.lookup(household, "eitc", 2024) is None
+    # Batched ground-truth rates equal per-household ones, so they are served
+    assert index.lookup(household, "marginal_tax_rate", 2025) == 0.3
+    assert (index.hits, index.misses) == (3, 2)
+    assert index.rate == 0.6
+
+
+def test_tool_call_answered_without_simulation(family, index):
+    with patch("policybench.engine.Simulation") as mock_sim:
+        result = handle_tool_call(
+            _tool_call({"variable": "eitc"}),
+            fallback_household=family.to_pe_household(),
+            shortcut=index,
+        )
+    mock_sim.assert_not_called()
+    assert json.loads(result) == {"result": 4000.0}
+
+
+def test_modified_household_is_simulated(family, index):
+    household = family.to_pe_household()
+    household["people"]["adult1"]["age"]["2025"] = 31
+    with patch("policybench.engine.Simulation") as mock_sim:
+        mock_sim.return_value.calculate.return_value.sum.return_value = 3900.0
+        result = handle_tool_call(
+            _tool_call({"household": household, "variable": "eitc"}), shortcut=index
+        )
+    mock_sim.assert_called_once()
+    assert json.loads(result) == {"result": 3900.0}
+    assert index.misses == 1
@@ -0,0 +1,34 @@
+"""Tests for lazy imports and the startup benchmark."""
+
+from policybench.startup import (
+    STARTUP_BUDGETS,
+    SUBCOMMAND_IMPORTS,
+    bench_startup,
+    format_report,
+    measure_imports,
+)
+
+
+def test_eval_modules_defer_heavy_imports():
+    """Importing the runners loads neither litellm, policyengine_us nor pandas."""
+    _, heavy = measure_imports(
+        [
+            "policybench.cli",
+            "policybench.eval_no_tools",
+            "policybench.eval_with_tools",
+            "policybench.ground_truth",
+        ],
+        repeat=1,
+    )
+    assert heavy == []
+
+
+def test_bench_startup_flags_exceeded_budget():
+    rows = bench_startup(["help"], budgets={"help": 0.0}, repeat=1)
+    assert rows[0]["command"] == "help"
+    assert not rows[0]["ok"]
+    assert "OVER" in format_report(rows)
+
+
+def test_every_subcommand_has_a_budget():
+    assert set(STARTUP_BUDGETS) == set(SUBCOMMAND_IMPORTS)
@@ -0,0 +1,178 @@
+"""Tests for the partitioned Parquet results store."""
+
+import pandas as pd
+import pytest
+
+from policybench.store import (
+    ANALYSIS_COLUMNS,
+    export_csv,
+    import_csv,
+    iter_responses,
+    list_runs,
+    read_predictions,
+    write_predictions,
+)
+
+
+@pytest.fixture
+def no_tools_predictions():
+    return pd.DataFrame(
+        {
+            "model": ["a", "a", "b", "b"],
+            "scenario_id": ["s1", "s2", "s1", "s2"],
+            "variable": ["eitc"] * 4,
+            "prediction": [100.0, None, 300.0, 400.0],
+            "raw_response": ["100", "I cannot say", "300", "400"],
+        }
+    )
+
+
+@pytest.fixture
+def with_tools_predictions():
+    return pd.DataFrame(
+        {
+            "model": ["a", "a"],
+            "scenario_id": ["s1", "s2"],
+            "variable": ["eitc", "eitc"],
+            "prediction": [120.0, 220.0],
+            "used_tool": [True, False],
+            "tool_calls": [1, 0],
+            "tool_rounds": [1, 0],
+        }
+    )
+
+
+def test_partition_layout(tmp_path, no_tools_predictions):
+    paths = write_predictions(no_tools_predictions, "2026-02", "no_tools", tmp_path)
+    assert [p.parent.name for p in paths] == ["model=a", "model=b"]
+    assert paths[0].parent.parent.name == "condition=no_tools"
+    assert paths[0].parent.parent.parent.name == "run=2026-02"
+
+
+def test_read_projects_analysis_columns(tmp_path, no_tools_predictions):
+    write_predictions(no_tools_predictions, "r1", "no_tools", tmp_path)
+    df = read_predictions(tmp_path)
+    assert list(df.columns) == ANALYSIS_COLUMNS
+    assert len(df) == 4
+    assert df["prediction"].isna().sum() == 1
+
+
+def test_read_filters_partitions(
+    tmp_path, no_tools_predictions, with_tools_predictions
+):
+    write_predictions(no_tools_predictions, "r1", "no_tools", tmp_path)
+    write_predictions(no_tools_predictions, "r2", "no_tools", tmp_path)
+    write_predictions(with_tools_predictions, "r2", "with_tools", tmp_path)
+
+    df = read_predictions(
+        tmp_path,
+        columns=["run", "model", "prediction"],
+        runs=["r2"],
+        conditions=["no_tools"],
+        models=["b"],
+    )
+    assert set(df["run"]) == {"r2"}
+    assert list(df["prediction"]) == [300.0, 400.0]
+
+    runs = list_runs(tmp_path)
+    assert len(runs) == 5
+    assert runs["rows"].sum() == 10
+
+
+def test_rewrite_replaces_partition(tmp_path, no_tools_predictions):
+    write_predictions(no_tools_predictions, "r1", "no_tools", tmp_path)
+    write_predictions(no_tools_predictions.iloc[:1], "r1", "no_tools", tmp_path)
+    df = read_predictions(tmp_path, models=["a"])
+    assert len(df) == 1
+
+
+def test_rewrite_drops_models_no_longer_written(tmp_path, no_tools_predictions):
+    write_predictions(no_tools_predictions, "r1", "no_tools", tmp_path)
+    write_predictions(no_tools_predictions.iloc[:2], "r1", "no_tools", tmp_path)
+    df = read_predictions(tmp_path, runs=["r1"])
+    assert set(df["model"]) == {"a"}
+
+
+def test_csv_round_trip(tmp_path, with_tools_predictions):
+    source = tmp_path / "source.csv"
+    exported = tmp_path / "exported.csv"
+    with_tools_predictions.to_csv(source, index=False)
+
+    import_csv(source, "r1", "with_tools", tmp_path / "store")
+    export_csv(exported, "r1", "with_tools", tmp_path / "store")
+
+    pd.testing.assert_frame_equal(pd.read_csv(exported), pd.read_csv(source))
+
+
+def test_import_numeric_responses_as_text(tmp_path, no_tools_predictions):
+    source = tmp_path / "source.csv"
+    numeric = no_tools_predictions.assign(
+        scenario_id=["1", "2", "1", "2"], raw_response=["100", None, "300", "NA"]
+    )
+    numeric.to_csv(source, index=False)
+
+    import_csv(source, "r1", "no_tools", tmp_path / "store")
+
+    df = read_predictions(
+        tmp_path / "store", columns=["scenario_id", "raw_response"], models=["a", "b"]
+    )
+    assert list(df["scenario_id"]) == ["1", "2", "1", "2"]
+    assert list(df["raw_response"].fillna("<missing>")) == [
+        "100",
+        "<missing>",
+        "300",
+        "NA",
+    ]
+
+
+def test_time_to_answer_is_stored(tmp_path, no_tools_predictions):
+    streamed = no_tools_predictions.assign(time_to_answer=[0.5, 1.0, 0.25, 2.0])
+    write_predictions(streamed, "r1", "no_tools", tmp_path / "store")
+    df = export_csv(tmp_path / "out.csv", "r1", "no_tools", tmp_path / "store")
+    assert list(df["time_to_answer"]) == [0.5, 1.0, 0.25, 2.0]
+
+    # Runs that were not streamed export without the column
+    write_predictions(no_tools_predictions, "r2", "no_tools", tmp_path / "store")
+    df = export_csv(tmp_path / "out.csv", "r2", "no_tools", tmp_path / "store")
+    assert "time_to_answer" not in df
+
+
+def test_empty_store(tmp_path):
+    assert read_predictions(tmp_path / "missing").empty
+    assert list(read_predictions(tmp_path / "missing").columns) == ANALYSIS_COLUMNS
+    assert list_runs(tmp_path / "missing").empty
+
+
+def test_responses_are_deduplicated_blobs(tmp_path, no_tools_predictions):
+    repeated = no_tools_predictions.assign(raw_response=["0", "0", None, "0"])
+    write_predictions(repeated, "r1", "no_tools", tmp_path)
+    write_predictions(repeated, "r2", "no_tools", tmp_path)
+
+    blobs = list(iter_responses(root=tmp_path))
+    assert len(blobs) == 1
+    assert list(blobs[0].values()) == ["0"]
+
+    df = read_predictions(tmp_path, columns=None)
+    assert "raw_response" not in df
+    assert df["response_hash"].nunique() == 1
+
+
+def test_numeric_responses_are_stored_as_text(tmp_path, no_tools_predictions):
+    responses = pd.Series([100, None, 300, 400], dtype=object)
+    numeric = no_tools_predictions.assign(raw_response=responses)
+    write_predictions(numeric, "r1", "no_tools", tmp_path)
+    df = read_predictions(tmp_path, columns=["raw_response"], models=["a"])
+    assert list(df["raw_response"].fillna("<missing>")) == ["100", "<missing>"]
+
+
+def test_read_resolves_raw_response(tmp_path, no_tools_predictions):
+    write_predictions(no_tools_predictions, "r1", "no_tools", tmp_path)
+    df = read_predictions(
+        tmp_path, columns=["scenario_id", "raw_response"], models=["a"]
+    )
+    assert list(df["raw_response"]) == ["100", "I cannot say"]
+
+
+def test_unknown_condition(tmp_path, no_tools_predictions):
+    with pytest.raises(ValueError):
+        write_predictions(no_tools_predictions, "r1", "tools", tmp_path)
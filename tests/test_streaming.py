@@ -0,0 +1,82 @@
+"""Tests for incremental streaming metrics."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from policybench.analysis import compute_metrics
+from policybench.streaming import StreamingMetrics
+
+RESULTS_DIR = Path(__file__).parent.parent / "results"
+
+
+@pytest.fixture
+def ground_truth():
+    return pd.DataFrame(
+        {
+            "scenario_id": ["s1", "s2", "s3"] * 3,
+            "variable": ["income_tax"] * 3
+            + ["is_medicaid_eligible"] * 3
+            + ["marginal_tax_rate"] * 3,
+            "value": [5000.0, 0.0, 12000.0, 1.0, 0.0, 1.0, 0.22, 0.0, 0.3],
+        }
+    )
+
+
+@pytest.fixture
+def predictions():
+    rng = np.random.default_rng(4)
+    rows = []
+    for model in ["b", "a"]:
+        for scenario in ["s1", "s2", "s3", "unknown"]:
+            for variable in ["income_tax", "is_medicaid_eligible", "marginal_tax_rate"]:
+                rows.append(
+                    {
+                        "model": model,
+                        "scenario_id": scenario,
+                        "variable": variable,
+                        "prediction": float(rng.choice([0.0, 0.25, 1.0, 4800.0])),
+                    }
+                )
+    rows[1]["prediction"] = None
+    return pd.DataFrame(rows)
+
+
+def test_matches_compute_metrics(ground_truth, predictions):
+    live = StreamingMetrics(ground_truth)
+    for row in predictions.itertuples():
+        live.update(row.model, row.scenario_id, row.variable, row.prediction)
+    pd.testing.assert_frame_equal(
+        live.to_frame(), compute_metrics(ground_truth, predictions)
+    )
+
+
+def test_update_skips_unscorable(ground_truth):
+    live = StreamingMetrics(ground_truth)
+    assert not live.update("a", "unknown", "income_tax", 100.0)
+    assert not live.update("a", "s1", "income_tax", None)
+    assert not live.update("a", "s1", "income_tax", float("nan"))
+    assert live.update("a", "s1", "income_tax", 5500.0)
+    assert live.n == 1
+
+
+def test_render(ground_truth):
+    live = StreamingMetrics(ground_truth)
+    assert "no scored predictions" in live.render()
+    live.update("gpt", "s1", "income_tax", 5500.0)
+    rendered = live.render()
+    assert "gpt" in rendered
+    assert "500" in rendered
+
+
+def test_matches_compute_metrics_on_results():
+    ground_truth = pd.read_csv(RESULTS_DIR / "ground_truth.csv")
+    predictions = pd.read_csv(RESULTS_DIR / "no_tools" / "predictions.csv")
+    live = StreamingMetrics(ground_truth)
+    for row in predictions.itertuples():
+        live.update(row.model, row.scenario_id, row.variable, row.prediction)
+    pd.testing.assert_frame_equal(
+        live.to_frame(), compute_metrics(ground_truth, predictions)
+    )
@@ -0,0 +1,89 @@
+"""Tests for dense, memory-mapped prediction tensors."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from policybench.analysis import compute_metrics
+from policybench.bootstrap import bootstrap_conditions, bootstrap_scores
+from policybench.tensor import PredictionTensor, load_conditions
+
+
+@pytest.fixture
+def ground_truth():
+    rng = np.random.default_rng(0)
+    n = 20
+    return pd.DataFrame(
+        {
+            "scenario_id": np.repeat([f"s{i:02d}" for i in range(n)], 3),
+            "variable": ["snap", "is_medicaid_eligible", "eitc"] * n,
+            "value": np.column_stack(
+                [
+                    rng.choice([0.0, 1200.0, 3400.0], n),
+                    rng.integers(0, 2, n),
+                    rng.choice([0.0, 500.0], n),
+                ]
+            ).ravel(),
+        }
+    )
+
+
+@pytest.fixture
+def predictions(ground_truth):
+    rng = np.random.default_rng(1)
+    df = pd.concat(
+        [ground_truth.assign(model=m) for m in ["b", "a"]], ignore_index=True
+    )
+    df["prediction"] = np.round(df["value"] * rng.normal(1, 0.2, len(df)), 2)
+    df.loc[3, "prediction"] = np.nan  # An answer without a number
+    return df.drop(columns="value").drop(index=[7, 40])
+
+
+def test_metrics_match_compute_metrics(ground_truth, predictions):
+    tensor = PredictionTensor.from_frames(ground_truth, predictions)
+    pd.testing.assert_frame_equal(
+        tensor.metrics(),
+        compute_metrics(ground_truth, predictions),
+        check_dtype=False,
+        check_exact=False,
+        rtol=1e-6,
+    )
+
+
+def test_mask_marks_prediction_rows(ground_truth, predictions):
+    tensor = PredictionTensor.from_frames(ground_truth, predictions)
+    assert tensor.predictions.dtype == np.float32
+    assert list(tensor.models) == ["a", "b"]
+    assert list(tensor.variables) == ["eitc", "is_medicaid_eligible", "snap"]
+    assert tensor.predictions.shape == (2, 20, 3)
+    assert tensor.mask.sum() == len(predictions)
+    # A row without a number is present but NaN; a dropped row is absent
+    assert tensor.mask[1, 1, 2] and np.isnan(tensor.predictions[1, 1, 2])
+    assert not tensor.mask[1, 2, 1]
+
+
+def test_save_load_round_trip(ground_truth, predictions, tmp_path):
+    conditions = {"no_tools": predictions, "with_tools": predictions.iloc[::2]}
+    for name, df in conditions.items():
+        PredictionTensor.from_frames(ground_truth, df, ["a", "b"]).save(tmp_path / name)
+
+    tensors = load_conditions(tmp_path)
+    assert isinstance(tensors["no_tools"].predictions, np.memmap)
+    pd.testing.assert_frame_equal(
+        tensors["with_tools"].metrics(),
+        PredictionTensor.from_frames(ground_truth, predictions.iloc[::2]).metrics(),
+    )
+
+    from_tensors = bootstrap_scores(
+        {name: tensor.score() for name, tensor in tensors.items()},
+        n_replicates=50,
+        n_jobs=1,
+    )
+    from_frames = bootstrap_conditions(
+        ground_truth, conditions, n_replicates=50, n_jobs=1
+    )
+    np.testing.assert_allclose(
+        from_tensors["with_tools"].replicates,
+        from_frames["with_tools"].replicates,
+        rtol=1e-5,
+    )